@@ -179,7 +179,14 @@ def initialize_chatbot() -> bool:
             print("DEBUG: chat_app_st.py - BEFORE Vector search check", file=sys.stderr, flush=True)
             # 2. Vector Search (Embedding Model + FAISS)
             if hasattr(st.session_state.bot, 'vector_search_available'):
-                if st.session_state.bot.vector_search_available:
+                readiness = "ready"
+                if hasattr(st.session_state.bot, 'get_vector_search_readiness') and callable(
+                    st.session_state.bot.get_vector_search_readiness
+                ):
+                    readiness = st.session_state.bot.get_vector_search_readiness()
+                if st.session_state.bot.vector_search_available and readiness in ("pending", "loading"):
+                    st.session_state["initialization_steps"].append(str("✓ Vector search available (embedding model loading in the background)."))
+                elif st.session_state.bot.vector_search_available:
                     st.session_state["initialization_steps"].append(str("✓ Vector search loaded and available."))
                 else:
                     error_detail = "Vector search component reported as unavailable."
@@ -98,6 +98,7 @@ from collections.abc import MutableMapping
 from gmail_chatbot.email_config import (
     DEFAULT_SYSTEM_MESSAGE,
     CLAUDE_API_KEY_ENV,
+    VECTOR_WARMUP_ON_START,
     load_env,
 )
 from gmail_chatbot.email_claude_api import ClaudeAPIClient
@@ -312,9 +313,12 @@ class GmailChatbotApp:
             self.vector_search_available = getattr(
                 self.memory_store, "vector_search_available", False
             )
-            self.vector_search_error_message = getattr(
-                self.memory_store, "initialization_error_message", None
+            self.vector_search_error_message = (
+                self.memory_store.get_vector_search_error_message()
             )
+            if self.vector_search_available and VECTOR_WARMUP_ON_START:
+                # Load the embedding model off the request path
+                self.memory_store.warm_up_vector_search()
             if self.vector_search_available:
                 self.initialization_diagnostics.append(
                     "✓ Vector-based email memory store (EmailVectorMemoryStore) initialized."
@@ -367,7 +371,9 @@ class GmailChatbotApp:
             file=sys.stderr,
             flush=True,
         )
-        self.enhanced_memory_store = EnhancedMemoryStore()
+        self.enhanced_memory_store = EnhancedMemoryStore(
+            journal_stores=("interaction", "preferences", "memory_entries")
+        )
         print(
             "DEBUG: GmailChatbotApp.__init__ - AFTER EnhancedMemoryStore initialization",
             file=sys.stderr,
@@ -546,8 +552,29 @@ class GmailChatbotApp:
 
     def get_vector_search_error_message(self) -> Optional[str]:
         """Returns the stored error message from vector search initialization, if any."""
+        if self.memory_store is not None:
+            return self.memory_store.get_vector_search_error_message()
         return self.vector_search_error_message
 
+    def get_vector_search_readiness(self) -> str:
+        """Return the embedding model's loading state without waiting for it.
+
+        One of ``"pending"``, ``"loading"``, ``"ready"``, ``"failed"`` or
+        ``"unavailable"`` (see ``EmailVectorDB.readiness``).
+        """
+        if self.memory_store is None:
+            return "unavailable"
+        return getattr(self.memory_store, "vector_search_readiness", "unavailable")
+
+    def get_gmail_client_status(self) -> Dict[str, Any]:
+        """Return the Gmail client's message cache and fetch pool status.
+
+        Empty if the Gmail client failed to initialize.
+        """
+        if self.gmail_client is None:
+            return {}
+        return self.gmail_client.get_status()
+
     def get_last_assistant_reply(self) -> Optional[str]:
         """Return the most recent assistant message from ``chat_history``."""
         for message in reversed(self.chat_history):
@@ -1001,8 +1028,8 @@ class GmailChatbotApp:
             )
             min_score = THRESHOLDS["VECTOR_SEARCH"]["MIN_RELEVANCE"]
 
-            vector_results = self.memory_actions_handler.query_memory(
-                search_query, request_id=request_id
+            vector_results = self.memory_store.find_related_emails(
+                search_query, limit=limit, min_relevance=min_score
             )
 
             if vector_results:
@@ -1061,9 +1088,7 @@ class GmailChatbotApp:
         )
         response = ""
         if self.memory_store.vector_search_available:
-            vector_results = self.memory_actions_handler.query_memory(
-                message, request_id=request_id
-            )
+            vector_results = self.memory_store.find_related_emails(message, 5)
             if vector_results:
                 raw_response = self.claude_client.evaluate_vector_match(
                     user_query=message,
@@ -2148,5 +2173,11 @@ class GmailChatbotApp:
                         f"[ERROR] Error during GUI cleanup: {str(cleanup_error)}"
                     )
 
+            if self.gmail_client is not None:
+                try:
+                    self.gmail_client.close()
+                except Exception as cleanup_error:
+                    print(f"[ERROR] Error closing Gmail client: {cleanup_error}")
+
             # Give background threads a chance to complete
             wait_for_threads(timeout=2)
@@ -7,7 +7,7 @@ import os
 import time
 import random
 from pathlib import Path
-from typing import Any, TypeVar, Generic
+from typing import Any, Dict, List, Optional, TypeVar, Generic
 
 # We'll use portalocker for cross-platform file locking. If it's not available,
 # fall back to a very small stub so tests can run without the dependency.
@@ -62,6 +62,10 @@ class MemoryWriteError(DiskStoreError):
     pass
 
 
+# Default size of the write-ahead log before it is folded into the snapshot
+DEFAULT_COMPACT_THRESHOLD = 1024 * 1024  # 1 MiB
+
+
 class DiskStore(Generic[T]):
     """Thread-safe disk storage for JSON serializable data.
     
@@ -73,18 +77,35 @@ class DiskStore(Generic[T]):
     - Exponential backoff for retries
     - Type annotations for better IDE support
     - Custom exceptions for clear error handling
+    - Optional journal (write-ahead log) mode for O(1) appends
+    
+    In journal mode ``append`` and ``update`` write a single JSON line to
+    ``<path>.wal`` instead of rewriting the whole file. ``load`` replays the
+    log on top of the JSON snapshot at ``path``, and the log is folded into
+    the snapshot once it grows past ``compact_threshold`` bytes.
     """
     
-    def __init__(self, path: Path, schema_version: int = 1):
+    def __init__(self, path: Path, schema_version: int = 1, journal: bool = False,
+                 compact_threshold: int = DEFAULT_COMPACT_THRESHOLD):
         """Initialize a disk store for a specific file.
         
         Args:
             path: Path to the JSON file for storage
             schema_version: Version number for the data schema
+            journal: Store appends/updates in a write-ahead log
+            compact_threshold: Log size in bytes that triggers compaction
         """
         self.path = path
         self.schema_version = schema_version
         self.lock_file = str(path) + '.lock'
+        self.journal = journal
+        self.log_path = Path(str(path) + '.wal')
+        self.compact_threshold = compact_threshold
+        
+        # Cached snapshot + replayed log for incremental journal loads
+        self._cache: Optional[Any] = None
+        self._cache_key: Optional[tuple] = None
+        self._log_offset = 0
         
         # Initialize lock
         self._lock = portalocker.Lock(self.lock_file, timeout=10)
@@ -131,9 +152,15 @@ class DiskStore(Generic[T]):
         Raises:
             DiskStoreError: If file exists but can't be parsed as JSON
         """
+        if self.journal:
+            try:
+                self._acquire_lock()
+                return self._copy(self._read_unlocked())
+            finally:
+                self._release_lock()
+        
         if not self.path.exists():
-            # Determine if we're storing a list or dict based on file suffix
-            return [] if self.path.name.startswith(('interaction', 'preferences')) else {}
+            return self._empty()
         
         try:
             self._acquire_lock()
@@ -175,6 +202,9 @@ class DiskStore(Generic[T]):
         while retry_count < max_retries:
             try:
                 self._acquire_lock()
+                if self.journal:
+                    self._write_unlocked(data)
+                    return
                 with open(self.path, 'w', encoding='utf-8') as f:
                     json.dump(data, f, indent=2)
                 return
@@ -202,6 +232,10 @@ class DiskStore(Generic[T]):
             DiskStoreError: If the store doesn't contain a list
             MemoryWriteError: If write operation fails after retries
         """
+        if self.journal:
+            self._journal_write({"op": "append", "entry": entry}, list)
+            return
+        
         max_retries = 10  # Increased retries for append operations
         retry_count = 0
         backoff_time = 0.05  # Shorter initial backoff
@@ -339,6 +373,10 @@ class DiskStore(Generic[T]):
             DiskStoreError: If the store doesn't contain a dict
             MemoryWriteError: If write operation fails after retries
         """
+        if self.journal:
+            self._journal_write({"op": "set", "key": key, "value": value}, dict)
+            return
+        
         max_retries = 5  # More retries for update operations
         retry_count = 0
         backoff_time = 0.05  # Shorter initial backoff
@@ -389,3 +427,241 @@ class DiskStore(Generic[T]):
                 # Always release lock
                 self._release_lock()
                 raise e
+
+    def update_many(self, values: Dict[str, Any]) -> None:
+        """Update several keys of a dict-based store in a single write.
+
+        In journal mode all keys go into one log record, so a batch of
+        updates costs one fsync instead of one per key.
+
+        Args:
+            values: Mapping of keys to their new values
+
+        Raises:
+            DiskStoreError: If the store doesn't contain a dict
+            MemoryWriteError: If write operation fails after retries
+        """
+        if not values:
+            return
+        if self.journal:
+            self._journal_write({"op": "set_many", "values": values}, dict)
+            return
+
+        try:
+            self._acquire_lock()
+            data = self._read_unlocked() if self.path.exists() else {}
+            if not isinstance(data, dict):
+                raise DiskStoreError(f"Cannot update keys in {self.path} - not a dict-based store")
+            data = dict(data)
+            data.update(values)
+            self._write_unlocked(data)
+        except (IOError, OSError) as e:
+            raise MemoryWriteError(f"Failed to update {len(values)} keys in {self.path}: {e}") from e
+        finally:
+            self._release_lock()
+
+    def delete_many(self, keys: List[str]) -> None:
+        """Remove several keys from a dict-based store in a single write.
+
+        Args:
+            keys: Keys to remove; missing keys are ignored
+
+        Raises:
+            DiskStoreError: If the store doesn't contain a dict
+            MemoryWriteError: If write operation fails after retries
+        """
+        if not keys:
+            return
+        if self.journal:
+            self._journal_write({"op": "delete_many", "keys": list(keys)}, dict)
+            return
+
+        try:
+            self._acquire_lock()
+            data = self._read_unlocked() if self.path.exists() else {}
+            if not isinstance(data, dict):
+                raise DiskStoreError(f"Cannot delete keys in {self.path} - not a dict-based store")
+            removed = set(keys)
+            data = {key: value for key, value in data.items() if key not in removed}
+            self._write_unlocked(data)
+        except (IOError, OSError) as e:
+            raise MemoryWriteError(f"Failed to delete {len(keys)} keys in {self.path}: {e}") from e
+        finally:
+            self._release_lock()
+
+    def compact(self) -> None:
+        """Fold the write-ahead log into the JSON snapshot.
+        
+        A no-op for stores that are not in journal mode.
+        
+        Raises:
+            MemoryWriteError: If the snapshot cannot be written
+        """
+        if not self.journal:
+            return
+        try:
+            self._acquire_lock()
+            self._write_unlocked(self._read_unlocked())
+        except (IOError, OSError) as e:
+            raise MemoryWriteError(f"Failed to compact {self.path}: {e}") from e
+        finally:
+            self._release_lock()
+    
+    def _empty(self) -> Any:
+        """Return the empty container used for a missing file."""
+        # Determine if we're storing a list or dict based on file name
+        return [] if self.path.name.startswith(('interaction', 'preferences')) else {}
+    
+    @staticmethod
+    def _copy(data: Any) -> Any:
+        """Return a shallow copy so callers can't mutate the journal cache."""
+        if isinstance(data, list):
+            return list(data)
+        if isinstance(data, dict):
+            return dict(data)
+        return data
+    
+    def _container_type(self) -> Optional[type]:
+        """Determine whether the store holds a list or a dict without parsing it.
+        
+        Returns ``None`` when nothing has been written yet, in which case the
+        first record decides the container type.
+        """
+        if self._cache is not None:
+            return type(self._cache)
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                head = f.read(64).lstrip()
+            if head.startswith('['):
+                return list
+            if head.startswith('{'):
+                return dict
+        elif self.log_path.exists():
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                first = f.readline()
+            try:
+                return list if json.loads(first).get("op") == "append" else dict
+            except (json.JSONDecodeError, AttributeError):
+                return None
+        return None
+    
+    def _stat_key(self, path: Path) -> Optional[tuple]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    def _read_unlocked(self) -> Any:
+        """Return snapshot plus replayed log. Caller must hold the lock.
+        
+        The parsed snapshot is cached and only log records written since the
+        previous call are replayed, so repeated loads cost O(new records).
+        """
+        snapshot_key = self._stat_key(self.path)
+        log_size = self.log_path.stat().st_size if self.log_path.exists() else 0
+        
+        if (self._cache is None or snapshot_key != self._cache_key
+                or log_size < self._log_offset):
+            if self.path.exists():
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except json.JSONDecodeError as e:
+                    error_msg = f"Error decoding {self.path}. File may be corrupted."
+                    logger.error(error_msg)
+                    raise DiskStoreError(error_msg) from e
+            else:
+                # The first log record decides the container type
+                data = None
+            if isinstance(data, dict) and 'schema_version' not in data:
+                data['schema_version'] = self.schema_version
+            self._cache = data
+            self._cache_key = snapshot_key
+            self._log_offset = 0
+        
+        if log_size > self._log_offset:
+            with open(self.log_path, 'rb') as f:
+                f.seek(self._log_offset)
+                for raw_line in f:
+                    if not raw_line.endswith(b'\n'):
+                        # Torn write from a crashed process; ignore the tail
+                        break
+                    self._log_offset += len(raw_line)
+                    try:
+                        record = json.loads(raw_line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping corrupt record in {self.log_path}")
+                        continue
+                    if self._cache is None:
+                        self._cache = [] if record.get("op") == "append" else {}
+                    self._apply(self._cache, record)
+        return self._cache if self._cache is not None else self._empty()
+    
+    @staticmethod
+    def _apply(data: Any, record: dict) -> None:
+        """Apply a single log record to the in-memory container."""
+        op = record.get("op")
+        if op == "append" and isinstance(data, list):
+            data.append(record.get("entry"))
+        elif op == "set" and isinstance(data, dict):
+            data[record.get("key")] = record.get("value")
+        elif op == "set_many" and isinstance(data, dict):
+            data.update(record.get("values") or {})
+        elif op == "delete_many" and isinstance(data, dict):
+            for key in record.get("keys") or []:
+                data.pop(key, None)
+    
+    def _write_unlocked(self, data: Any) -> None:
+        """Atomically replace the snapshot and reset the log. Caller must hold the lock."""
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        temp_path = self.path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        if self.log_path.exists():
+            self.log_path.unlink()
+        if self.journal:
+            self._cache = self._copy(data)
+            self._cache_key = self._stat_key(self.path)
+            self._log_offset = 0
+    
+    def _journal_write(self, record: dict, expected: type) -> None:
+        """Append one record to the write-ahead log, compacting if it grew too large."""
+        line = json.dumps(record) + '\n'
+        max_retries = 5
+        retry_count = 0
+        backoff_time = 0.05
+        
+        while True:
+            try:
+                self._acquire_lock()
+                try:
+                    container = self._container_type()
+                    if container is not None and container is not expected:
+                        kind = "append to" if expected is list else "update key in"
+                        raise DiskStoreError(
+                            f"Cannot {kind} {self.path} - not a {expected.__name__}-based store")
+                    self.log_path.parent.mkdir(exist_ok=True, parents=True)
+                    with open(self.log_path, 'a', encoding='utf-8') as f:
+                        f.write(line)
+                        f.flush()
+                        os.fsync(f.fileno())
+                        log_size = f.tell()
+                    if log_size >= self.compact_threshold:
+                        self._write_unlocked(self._read_unlocked())
+                        logger.info(f"Compacted write-ahead log into {self.path}")
+                    return
+                finally:
+                    self._release_lock()
+            except (IOError, OSError) as e:
+                retry_count += 1
+                if retry_count >= max_retries:
+                    error_msg = f"Failed to write log record for {self.path} after {max_retries} retries: {e}"
+                    logger.error(error_msg)
+                    raise MemoryWriteError(error_msg) from e
+                sleep_time = backoff_time * (2 ** (retry_count - 1)) * (0.5 + 0.5 * random.random())
+                logger.warning(f"Log write failed, retrying in {sleep_time:.2f}s (attempt {retry_count}/{max_retries})")
+                time.sleep(sleep_time)
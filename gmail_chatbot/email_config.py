@@ -69,6 +69,75 @@ UI_THEME_COLOR = "#4285F4"  # Google blue
 
 # Email processing configuration
 MAX_EMAILS_PER_SEARCH = 10
+# Concurrent messages().get requests issued per search
+GMAIL_FETCH_WORKERS = int(os.getenv("GMAIL_FETCH_WORKERS", "8"))
+
+# Parsed message cache shared by search_emails and get_email_by_id
+MESSAGE_CACHE_DIR = DATA_DIR / "message_cache"
+MESSAGE_CACHE_MAX_ENTRIES = int(os.getenv("MESSAGE_CACHE_MAX_ENTRIES", "512"))
+MESSAGE_CACHE_TTL_SECONDS = int(os.getenv("MESSAGE_CACHE_TTL_SECONDS", str(24 * 3600)))
+# Most message files kept on disk; the oldest are pruned beyond this
+MESSAGE_CACHE_MAX_FILES = int(os.getenv("MESSAGE_CACHE_MAX_FILES", "5000"))
+
+# Incremental inbox sync (Gmail history API)
+INBOX_SYNC_STATE_FILE = DATA_DIR / "inbox_sync_state.json"
+INBOX_SYNC_BOOTSTRAP_QUERY = "newer_than:7d"  # Seed query when no historyId is stored
+INBOX_SYNC_BOOTSTRAP_MAX = 100
+
+# Chunk size and overlap in embedding-model tokens; 240 leaves all-MiniLM-L6-v2's
+# 256-token window room for its [CLS]/[SEP] tokens
+VECTOR_CHUNK_TOKENS = int(os.getenv("VECTOR_CHUNK_TOKENS", "240"))
+VECTOR_CHUNK_OVERLAP_TOKENS = int(os.getenv("VECTOR_CHUNK_OVERLAP_TOKENS", "40"))
+
+# Number of chunks sent to the embedding model per call when bulk indexing
+VECTOR_EMBED_BATCH_SIZE = int(os.getenv("VECTOR_EMBED_BATCH_SIZE", "64"))
+
+# Embeddings kept in the on-disk cache (about 1.5 KB each for all-MiniLM-L6-v2); 0 disables it
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000"))
+
+# Embedding model runtime: torch (sentence-transformers), onnx or onnx-int8 (ONNX Runtime, no torch)
+VECTOR_EMBEDDING_BACKEND = os.getenv("VECTOR_EMBEDDING_BACKEND", "torch").lower()
+
+# Rebuild the FAISS index and chunk store once this share of chunks belongs to removed or replaced emails
+VECTOR_COMPACT_DEAD_FRACTION = float(os.getenv("VECTOR_COMPACT_DEAD_FRACTION", "0.25"))
+
+# FAISS index type: flat, hnsw, ivfpq, or auto to promote by chunk count
+VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "auto").lower()
+VECTOR_HNSW_MIN_CHUNKS = int(os.getenv("VECTOR_HNSW_MIN_CHUNKS", "50000"))
+VECTOR_IVFPQ_MIN_CHUNKS = int(os.getenv("VECTOR_IVFPQ_MIN_CHUNKS", "500000"))
+# Query-time recall/latency knobs for HNSW and IVF-PQ
+VECTOR_HNSW_EF_SEARCH = int(os.getenv("VECTOR_HNSW_EF_SEARCH", "64"))
+VECTOR_IVF_NPROBE = int(os.getenv("VECTOR_IVF_NPROBE", "16"))
+# Auto promotion keeps the current index unless the new one reaches this recall@10
+VECTOR_MIN_INDEX_RECALL = float(os.getenv("VECTOR_MIN_INDEX_RECALL", "0.9"))
+# Calendar unit the date_range filter partitions chunks by: month or quarter
+VECTOR_SHARD_BY = os.getenv("VECTOR_SHARD_BY", "month").lower()
+
+# Retrieval used by find_related_emails: vector (keyword fallback only when empty) or hybrid
+VECTOR_SEARCH_MODE = os.getenv("VECTOR_SEARCH_MODE", "hybrid").lower()
+# Hybrid fusion: rrf (reciprocal rank) or weighted, and the dense retriever's share
+HYBRID_FUSION = os.getenv("HYBRID_FUSION", "rrf").lower()
+HYBRID_DENSE_WEIGHT = float(os.getenv("HYBRID_DENSE_WEIGHT", "0.5"))
+# Email-grouped search ranks an email by its best chunk (max) or its best three (sum_top)
+VECTOR_EMAIL_SCORING = os.getenv("VECTOR_EMAIL_SCORING", "max").lower()
+# Search results kept in the in-process LRU cache until the next add or delete; 0 disables it
+VECTOR_QUERY_CACHE_SIZE = int(os.getenv("VECTOR_QUERY_CACHE_SIZE", "256"))
+
+# Open the FAISS index read-only through mmap so processes share its pages
+VECTOR_MMAP_INDEX = os.getenv("VECTOR_MMAP_INDEX", "true").lower() in ("1", "true", "yes")
+
+# Index stored emails on a background worker instead of in the chat turn
+VECTOR_ASYNC_INDEXING = os.getenv("VECTOR_ASYNC_INDEXING", "true").lower() in ("1", "true", "yes")
+# Emails per background indexing batch, and seconds to wait for a batch to fill
+VECTOR_INDEX_QUEUE_BATCH = int(os.getenv("VECTOR_INDEX_QUEUE_BATCH", "32"))
+VECTOR_INDEX_QUEUE_DELAY = float(os.getenv("VECTOR_INDEX_QUEUE_DELAY", "0.5"))
+# Emails indexed between checkpoints during a full reindex
+VECTOR_REINDEX_BATCH_SIZE = int(os.getenv("VECTOR_REINDEX_BATCH_SIZE", "500"))
+
+# Load the shared embedding model and FAISS index on first use rather than at import
+VECTOR_LAZY_INIT = os.getenv("VECTOR_LAZY_INIT", "true").lower() in ("1", "true", "yes")
+# Start loading them on a background thread when the app starts
+VECTOR_WARMUP_ON_START = os.getenv("VECTOR_WARMUP_ON_START", "true").lower() in ("1", "true", "yes")
 EMAIL_DISPLAY_FORMAT = "simple"  # Options: "simple", "detailed", "raw"
 
 # Token optimization settings
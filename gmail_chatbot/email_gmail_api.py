@@ -3,12 +3,18 @@
 
 
 import os
+import json
+import time
 import base64
 import pickle
 import logging
 import ssl
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from pathlib import Path
 from email.mime.text import MIMEText
 
 import google.auth.exceptions
@@ -18,29 +24,248 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from gmail_chatbot.email_config import GMAIL_SCOPES, GMAIL_CLIENT_SECRET_FILE, GMAIL_TOKEN_FILE, \
-    DATA_DIR, MAX_EMAILS_PER_SEARCH, MAX_EMAIL_BODY_CHARS
+    DATA_DIR, MAX_EMAILS_PER_SEARCH, MAX_EMAIL_BODY_CHARS, GMAIL_FETCH_WORKERS, \
+    MESSAGE_CACHE_DIR, MESSAGE_CACHE_MAX_ENTRIES, MESSAGE_CACHE_MAX_FILES, \
+    MESSAGE_CACHE_TTL_SECONDS
 from gmail_chatbot.email_claude_api import ClaudeAPIClient
 from gmail_chatbot.api_logging import log_gmail_request, log_gmail_response
+from gmail_chatbot.inbox_sync import HistoryExpiredError
 
 # Configure logging
 logger = logging.getLogger(__name__)
 logger.debug("email_gmail_api module loaded")
 
+
+def _history_older(cached: Any, current: Any) -> bool:
+    """True if historyId ``cached`` predates ``current``.
+    
+    historyIds are increasing integers; anything unparsable counts as older
+    unless the two are equal.
+    """
+    try:
+        return int(cached) < int(current)
+    except (TypeError, ValueError):
+        return str(cached) != str(current)
+
+
+class MessageCache:
+    """Two-level cache of parsed Gmail messages keyed by message ID.
+    
+    Entries live in an in-memory LRU and are written through to one JSON file
+    per message under ``directory``, so they survive restarts. An entry is
+    treated as a miss when it is older than ``ttl_seconds`` or when the caller
+    knows a newer ``historyId`` for the message (e.g. after label changes).
+    The directory is created on the first write and pruned on construction
+    and every ``prune_every`` writes: expired files are removed, then the
+    oldest beyond ``max_files``.
+    """
+    
+    def __init__(self, directory: Optional[Path] = None,
+                 max_entries: int = MESSAGE_CACHE_MAX_ENTRIES,
+                 ttl_seconds: int = MESSAGE_CACHE_TTL_SECONDS,
+                 max_files: int = MESSAGE_CACHE_MAX_FILES,
+                 prune_every: int = 100) -> None:
+        """Initialize the cache.
+        
+        Args:
+            directory: Directory for the on-disk layer, or None for memory only
+            max_entries: Maximum number of entries kept in memory
+            ttl_seconds: Age after which an entry is refetched
+            max_files: Maximum number of entries kept on disk
+            prune_every: Writes between prunes of the on-disk layer
+        """
+        self.directory = Path(directory) if directory is not None else None
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_files = max_files
+        self.prune_every = max(1, prune_every)
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts_since_prune = 0
+        self.prune()
+    
+    def _path(self, msg_id: str) -> Optional[Path]:
+        if self.directory is None:
+            return None
+        # Gmail IDs are hex strings; guard against anything path-like anyway
+        return self.directory / f"{os.path.basename(msg_id)}.json"
+    
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry.get('cached_at', 0) > self.ttl_seconds
+    
+    def _remember(self, msg_id: str, entry: Dict[str, Any]) -> None:
+        """Insert into the in-memory LRU. Caller must hold the lock."""
+        self._entries[msg_id] = entry
+        self._entries.move_to_end(msg_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def get(self, msg_id: str, history_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the cached message, or None on a miss.
+        
+        Args:
+            msg_id: Gmail message ID
+            history_id: Current historyId of the message, if known; an entry
+                cached at an older historyId is a miss
+            
+        Returns:
+            Parsed message dict or None
+        """
+        with self._lock:
+            entry = self._entries.get(msg_id)
+            if entry is not None:
+                self._entries.move_to_end(msg_id)
+        
+        if entry is None:
+            path = self._path(msg_id)
+            if path is not None and path.exists():
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        entry = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+                    entry = None
+        
+        stale = entry is not None and (
+            self._expired(entry)
+            or (history_id is not None and _history_older(entry.get('historyId'), history_id))
+        )
+        with self._lock:
+            if entry is None or stale:
+                self.misses += 1
+                self._entries.pop(msg_id, None)
+            else:
+                self.hits += 1
+                self._remember(msg_id, entry)
+                return entry
+        if stale:
+            # Drop the on-disk copy too so later lookups can't resurrect it
+            self.invalidate(msg_id)
+        return None
+    
+    def put(self, entry: Dict[str, Any]) -> None:
+        """Store a parsed message (must contain ``id``)."""
+        entry = dict(entry, cached_at=time.time())
+        msg_id = entry['id']
+        with self._lock:
+            self._remember(msg_id, entry)
+        
+        path = self._path(msg_id)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write message cache entry for {msg_id}: {e}")
+        
+        with self._lock:
+            self._puts_since_prune += 1
+            due = self._puts_since_prune >= self.prune_every
+            if due:
+                self._puts_since_prune = 0
+        if due:
+            self.prune()
+    
+    def prune(self) -> int:
+        """Remove expired on-disk entries, then the oldest beyond ``max_files``.
+        
+        File modification times stand in for ``cached_at``, so no file
+        needs to be read.
+        
+        Returns:
+            Number of files removed
+        """
+        if self.directory is None or not self.directory.is_dir():
+            return 0
+        files = []
+        try:
+            for path in self.directory.glob('*.json'):
+                try:
+                    files.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    pass  # Removed concurrently
+        except OSError as e:
+            logger.warning(f"Could not list message cache {self.directory}: {e}")
+            return 0
+        files.sort()
+        cutoff = time.time() - self.ttl_seconds
+        excess = len(files) - self.max_files
+        removed = 0
+        for index, (mtime, path) in enumerate(files):
+            if mtime >= cutoff and index >= excess:
+                break  # Sorted oldest first, so the rest are fresh and within the limit
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not prune message cache entry {path}: {e}")
+        if removed:
+            logger.info(f"Pruned {removed} message cache entries from {self.directory}")
+        return removed
+    
+    def invalidate(self, msg_id: str) -> None:
+        """Drop a message from both cache levels."""
+        with self._lock:
+            self._entries.pop(msg_id, None)
+        path = self._path(msg_id)
+        if path is not None:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current in-memory size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+            }
+
+
 class GmailAPIClient:
     """Client for interacting with Gmail API with Claude assistance."""
     
-    def __init__(self, claude_client: ClaudeAPIClient, system_message: str) -> None:
+    def __init__(self, claude_client: ClaudeAPIClient, system_message: str,
+                 message_cache_dir: Optional[Path] = MESSAGE_CACHE_DIR) -> None:
         """Initialize the Gmail API client with Claude assistance.
         
         Args:
             claude_client: Instance of ClaudeAPIClient for processing
             system_message: System message for Claude API
+            message_cache_dir: Directory for cached messages, or None to keep
+                them in memory only
         """
         self.claude = claude_client
         self.system_message = system_message
+        self._credentials = None  # Set by _authenticate for per-thread services
         self.service = self._authenticate()
         self.user_id = 'me'  # Default Gmail API user ID for authenticated user
         
+        # Worker pool for concurrent message fetches; created on first use
+        self.fetch_workers = GMAIL_FETCH_WORKERS
+        self._fetch_pool: Optional[ThreadPoolExecutor] = None
+        self._fetch_pool_lock = threading.Lock()
+        self._thread_local = threading.local()
+        
+        # Parsed messages reused across searches and get_email_by_id; None disables
+        self.message_cache: Optional[MessageCache] = MessageCache(message_cache_dir)
+        # Latest historyId seen per message in history responses, checked
+        # against the cached copy on its next lookup
+        self._known_history_ids: "OrderedDict[str, str]" = OrderedDict()
+        self._known_history_lock = threading.Lock()
+        
     def test_connection(self) -> Dict[str, Any]:
         """Test connection to Gmail API with a lightweight API call.
         
@@ -155,6 +380,7 @@ class GmailAPIClient:
         
         try:
             # Build the Gmail API service
+            self._credentials = creds
             service = build('gmail', 'v1', credentials=creds)
             logger.info("Successfully authenticated with Gmail API")
             return service
@@ -293,49 +519,13 @@ class GmailAPIClient:
                 
             logger.info(f"Found {len(messages)} emails matching the query")
             
-            # Get full message details for each message
-            email_data = []
-            
             # Anti-hallucination safeguard: Ensure Gmail API actually returned real messages
             if not isinstance(messages, list) or len(messages) == 0 or not all(isinstance(m, dict) and 'id' in m for m in messages):
                 logger.warning(f"Invalid or empty message format returned by Gmail API: {messages}")
                 return [], "No valid emails found matching your query. The search returned an invalid format."
 
-            for message in messages:
-                msg_id = message['id']
-                
-                # Get the full message
-                try:
-                    msg = self.service.users().messages().get(userId='me', id=msg_id).execute()
-                except ssl.SSLError as e_ssl:
-                    logger.error(f"[{request_id if request_id else 'NO_ID'}] SSL Error fetching details for email ID {msg_id}: {e_ssl}. Skipping this email.")
-                    continue
-                except HttpError as error_get:
-                    logger.error(f"[{request_id if request_id else 'NO_ID'}] Gmail API HTTP error for email ID {msg_id}: {error_get}. Skipping this email.")
-                    continue
-                except Exception as e_get:
-                    logger.error(f"[{request_id if request_id else 'NO_ID'}] Unexpected error fetching details for email ID {msg_id}: {e_get}. Skipping this email.")
-                    continue
-                
-                # Extract relevant message data
-                headers = {header['name']: header['value'] for header in msg['payload']['headers']}
-                body_info = self._get_email_body(msg, truncate=True)
-                
-                email_info = {
-                    'id': msg['id'],
-                    'threadId': msg['threadId'],
-                    'labelIds': msg.get('labelIds', []),
-                    'snippet': msg.get('snippet', ''),
-                    'subject': headers.get('Subject', 'No Subject'),
-                    'from': headers.get('From', 'Unknown Sender'),
-                    'to': headers.get('To', 'Unknown Recipient'),
-                    'date': headers.get('Date', 'Unknown Date'),
-                    'body': body_info['body'],
-                    'truncated': body_info['truncated'],
-                    'full_length': body_info['full_length']
-                }
-                
-                email_data.append(email_info)
+            # Serve cached messages and fetch the rest concurrently
+            email_data = self.get_emails_by_ids([message['id'] for message in messages], request_id)
             
             # Log the Gmail API response
             log_gmail_response(
@@ -367,6 +557,259 @@ class GmailAPIClient:
             logger.error(f"[{request_id if request_id else 'NO_ID'}] Error searching emails: {e}")
             return [], f"Error searching your emails: {str(e)}"
     
+    def _worker_service(self) -> Any:
+        """Return a Gmail service object owned by the calling thread.
+        
+        googleapiclient service objects share an httplib2 connection that is
+        not thread-safe, so each pool worker builds its own from the stored
+        credentials. Without credentials (e.g. an injected service) the main
+        service object is shared.
+        """
+        service = getattr(self._thread_local, 'service', None)
+        if service is None:
+            if self._credentials is not None:
+                service = build('gmail', 'v1', credentials=self._credentials)
+            else:
+                service = self.service
+            self._thread_local.service = service
+        return service
+    
+    def _fetch_message(self, msg_id: str, request_id: Optional[str] = None, service: Any = None) -> Optional[Dict[str, Any]]:
+        """Fetch a single message, returning None if it should be skipped.
+        
+        Args:
+            msg_id: Gmail message ID
+            request_id: Optional unique ID to trace this request through the chain
+            service: Gmail service to use; defaults to the calling thread's own
+            
+        Returns:
+            Raw Gmail message resource, or None on error
+        """
+        try:
+            service = service if service is not None else self._worker_service()
+            return service.users().messages().get(userId='me', id=msg_id).execute()
+        except ssl.SSLError as e_ssl:
+            logger.error(f"[{request_id if request_id else 'NO_ID'}] SSL Error fetching details for email ID {msg_id}: {e_ssl}. Skipping this email.")
+        except HttpError as error_get:
+            logger.error(f"[{request_id if request_id else 'NO_ID'}] Gmail API HTTP error for email ID {msg_id}: {error_get}. Skipping this email.")
+        except Exception as e_get:
+            logger.error(f"[{request_id if request_id else 'NO_ID'}] Unexpected error fetching details for email ID {msg_id}: {e_get}. Skipping this email.")
+        return None
+    
+    def _fetch_messages(self, msg_ids: List[str], request_id: Optional[str] = None) -> List[Optional[Dict[str, Any]]]:
+        """Fetch several messages concurrently on a bounded worker pool.
+        
+        Args:
+            msg_ids: Gmail message IDs
+            request_id: Optional unique ID to trace this request through the chain
+            
+        Returns:
+            One entry per ID in the same order; None for messages that failed
+        """
+        if self.fetch_workers <= 1 or len(msg_ids) <= 1:
+            # Sequential fetches run on the calling thread with the main service
+            return [self._fetch_message(msg_id, request_id, self.service) for msg_id in msg_ids]
+        
+        with self._fetch_pool_lock:
+            if self._fetch_pool is None:
+                self._fetch_pool = ThreadPoolExecutor(
+                    max_workers=self.fetch_workers, thread_name_prefix="gmail-fetch"
+                )
+        return list(self._fetch_pool.map(lambda msg_id: self._fetch_message(msg_id, request_id), msg_ids))
+    
+    def close(self) -> None:
+        """Shut down the fetch worker pool without waiting for running fetches."""
+        with self._fetch_pool_lock:
+            pool, self._fetch_pool = self._fetch_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Return message cache counters and fetch pool settings."""
+        return {
+            'message_cache': self.message_cache.stats() if self.message_cache else None,
+            'fetch_workers': self.fetch_workers,
+            'fetch_pool_started': self._fetch_pool is not None,
+        }
+    
+    def _note_history_id(self, msg_id: str, history_id: Any) -> None:
+        """Remember the newest historyId seen for a message."""
+        if history_id is None:
+            return
+        history_id = str(history_id)
+        with self._known_history_lock:
+            known = self._known_history_ids.get(msg_id)
+            if known is None or _history_older(known, history_id):
+                self._known_history_ids[msg_id] = history_id
+                self._known_history_ids.move_to_end(msg_id)
+            limit = self.message_cache.max_entries if self.message_cache else MESSAGE_CACHE_MAX_ENTRIES
+            while len(self._known_history_ids) > limit:
+                self._known_history_ids.popitem(last=False)
+    
+    def _cached_message(self, msg_id: str) -> Optional[Dict[str, Any]]:
+        """Look a message up in the cache, passing its known historyId."""
+        if not self.message_cache:
+            return None
+        with self._known_history_lock:
+            history_id = self._known_history_ids.pop(msg_id, None)
+        return self.message_cache.get(msg_id, history_id=history_id)
+    
+    def _get_parsed_messages(self, msg_ids: List[str], request_id: Optional[str] = None) -> List[Optional[Dict[str, Any]]]:
+        """Return parsed messages in order, fetching only cache misses.
+        
+        Args:
+            msg_ids: Gmail message IDs
+            request_id: Optional unique ID to trace this request through the chain
+            
+        Returns:
+            One parsed message per ID; None for messages that failed to fetch
+        """
+        cache = self.message_cache
+        parsed = [self._cached_message(msg_id) for msg_id in msg_ids]
+        missing = [i for i, entry in enumerate(parsed) if entry is None]
+        if missing:
+            fetched = self._fetch_messages([msg_ids[i] for i in missing], request_id)
+            for i, msg in zip(missing, fetched):
+                if msg is None:
+                    continue
+                parsed[i] = self._parse_message(msg)
+                if cache:
+                    cache.put(parsed[i])
+        if cache:
+            logger.info(f"[{request_id if request_id else 'NO_ID'}] Message cache: {len(msg_ids) - len(missing)} hits, {len(missing)} fetched")
+        return parsed
+    
+    def _parse_message(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a raw Gmail message resource to the fields we use.
+        
+        Args:
+            msg: Message resource from ``messages().get``
+            
+        Returns:
+            Dict with id, threadId, historyId, labelIds, snippet, headers and
+            the full decoded body
+        """
+        headers = {header['name']: header['value'] for header in msg['payload']['headers']}
+        return {
+            'id': msg['id'],
+            'threadId': msg['threadId'],
+            'historyId': msg.get('historyId'),
+            'labelIds': msg.get('labelIds', []),
+            'snippet': msg.get('snippet', ''),
+            'headers': {
+                name: headers[name] for name in ('Subject', 'From', 'To', 'Date') if name in headers
+            },
+            'body': self._decode_body(msg),
+        }
+    
+    def _email_info(self, parsed: Dict[str, Any], truncate: bool = True) -> Dict[str, Any]:
+        """Build the email dict returned to callers from a parsed message."""
+        headers = parsed['headers']
+        body_info = self._truncate_body(parsed['body'], truncate)
+        return {
+            'id': parsed['id'],
+            'threadId': parsed['threadId'],
+            'labelIds': parsed.get('labelIds', []),
+            'snippet': parsed.get('snippet', ''),
+            'subject': headers.get('Subject', 'No Subject'),
+            'from': headers.get('From', 'Unknown Sender'),
+            'to': headers.get('To', 'Unknown Recipient'),
+            'date': headers.get('Date', 'Unknown Date'),
+            'body': body_info['body'],
+            'truncated': body_info['truncated'],
+            'full_length': body_info['full_length']
+        }
+    
+    def get_current_history_id(self) -> str:
+        """Return the mailbox's current historyId from the profile."""
+        profile = self.service.users().getProfile(userId=self.user_id).execute()
+        return str(profile['historyId'])
+    
+    def list_message_ids(self, query: str, max_results: int = MAX_EMAILS_PER_SEARCH) -> List[str]:
+        """Return IDs of messages matching a raw Gmail query, newest first."""
+        results = self.service.users().messages().list(
+            userId=self.user_id, q=query, maxResults=max_results
+        ).execute()
+        return [message['id'] for message in results.get('messages', [])]
+    
+    def list_history(self, start_history_id: str) -> Tuple[List[str], str]:
+        """Return messages added since ``start_history_id`` via the history API.
+        
+        Messages whose labels changed or that were deleted are dropped from
+        the message cache. Drafts and messages deleted again within the same
+        window are not reported.
+        
+        Args:
+            start_history_id: historyId recorded by the previous sync
+            
+        Returns:
+            Tuple of (added message IDs in history order, latest historyId)
+            
+        Raises:
+            HistoryExpiredError: If Gmail no longer has history that far back
+        """
+        added: List[str] = []
+        deleted = set()
+        latest_history_id = str(start_history_id)
+        page_token = None
+        
+        while True:
+            try:
+                response = self.service.users().history().list(
+                    userId=self.user_id,
+                    startHistoryId=start_history_id,
+                    historyTypes=['messageAdded', 'messageDeleted', 'labelAdded', 'labelRemoved'],
+                    pageToken=page_token
+                ).execute()
+            except HttpError as error:
+                if getattr(getattr(error, 'resp', None), 'status', None) == 404:
+                    raise HistoryExpiredError(
+                        f"History ID {start_history_id} is no longer available"
+                    ) from error
+                raise
+            
+            for record in response.get('history', []):
+                for item in record.get('messagesAdded', []):
+                    message = item.get('message', {})
+                    if message.get('id') and 'DRAFT' not in message.get('labelIds', []):
+                        added.append(message['id'])
+                        # The message is at least as new as the record that added it
+                        self._note_history_id(message['id'], record.get('id'))
+                for key in ('messagesDeleted', 'labelsAdded', 'labelsRemoved'):
+                    for item in record.get(key, []):
+                        msg_id = item.get('message', {}).get('id')
+                        if not msg_id:
+                            continue
+                        if key == 'messagesDeleted':
+                            deleted.add(msg_id)
+                        if self.message_cache:
+                            self.message_cache.invalidate(msg_id)
+            
+            latest_history_id = str(response.get('historyId', latest_history_id))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+        
+        # dict.fromkeys keeps first-seen order while dropping repeats
+        new_ids = [msg_id for msg_id in dict.fromkeys(added) if msg_id not in deleted]
+        return new_ids, latest_history_id
+    
+    def get_emails_by_ids(self, msg_ids: List[str], request_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return email dicts for the given IDs, skipping messages that fail.
+        
+        Args:
+            msg_ids: Gmail message IDs
+            request_id: Optional unique ID to trace this request through the chain
+            
+        Returns:
+            Email dicts in the same shape as ``search_emails``
+        """
+        return [
+            self._email_info(parsed)
+            for parsed in self._get_parsed_messages(msg_ids, request_id)
+            if parsed is not None
+        ]
+    
     def get_email_by_id(self, email_id: str, user_query: str = "") -> Tuple[Optional[Dict[str, Any]], str]:
         """Get a specific email by ID and process through Claude.
         
@@ -384,32 +827,21 @@ class GmailAPIClient:
                 original_user_query=f"Get email with ID {email_id}"
             )
             
-            # Get the email from Gmail API
-            try:
-                msg = self.service.users().messages().get(
-                    userId=self.user_id, id=email_id, format='full'
-                ).execute()
-            except ssl.SSLError as e_ssl:
-                logger.error(f"SSL Error retrieving email ID {email_id}: {e_ssl}")
-                return None, f"SSL Error retrieving email {email_id}: {str(e_ssl)}. Please check your internet connection, firewall, or proxy settings. The system's date/time might also be incorrect."
-            
-            # Extract relevant message data
-            headers = {header['name']: header['value'] for header in msg['payload']['headers']}
-            body_info = self._get_email_body(msg, truncate=True)
-            
-            email_info = {
-                'id': msg['id'],
-                'threadId': msg['threadId'],
-                'labelIds': msg.get('labelIds', []),
-                'snippet': msg.get('snippet', ''),
-                'subject': headers.get('Subject', 'No Subject'),
-                'from': headers.get('From', 'Unknown Sender'),
-                'to': headers.get('To', 'Unknown Recipient'),
-                'date': headers.get('Date', 'Unknown Date'),
-                'body': body_info['body'],
-                'truncated': body_info['truncated'],
-                'full_length': body_info['full_length']
-            }
+            # Get the email from the message cache or the Gmail API
+            parsed = self._cached_message(email_id)
+            if parsed is None:
+                try:
+                    msg = self.service.users().messages().get(
+                        userId=self.user_id, id=email_id, format='full'
+                    ).execute()
+                except ssl.SSLError as e_ssl:
+                    logger.error(f"SSL Error retrieving email ID {email_id}: {e_ssl}")
+                    return None, f"SSL Error retrieving email {email_id}: {str(e_ssl)}. Please check your internet connection, firewall, or proxy settings. The system's date/time might also be incorrect."
+                parsed = self._parse_message(msg)
+                if self.message_cache:
+                    self.message_cache.put(parsed)
+            
+            email_info = self._email_info(parsed)
             
             # Log the Gmail API response
             log_gmail_response(
@@ -456,6 +888,10 @@ class GmailAPIClient:
         Returns:
             Dictionary with email body text and metadata
         """
+        return self._truncate_body(self._decode_body(message), truncate)
+    
+    def _decode_body(self, message: Dict[str, Any]) -> str:
+        """Decode the plain-text body of a raw Gmail message resource."""
         full_body = ""
         
         # Extract body from payload parts (multipart emails)
@@ -473,7 +909,11 @@ class GmailAPIClient:
         # Fallback to snippet if body is empty
         if not full_body and 'snippet' in message:
             full_body = message['snippet']
-            
+        
+        return full_body
+    
+    def _truncate_body(self, full_body: str, truncate: bool = True) -> Dict[str, Any]:
+        """Apply the token-saving body limit to a decoded body."""
         # Prepare result with metadata
         result = {
             'full_length': len(full_body),
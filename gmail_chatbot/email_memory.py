@@ -9,6 +9,7 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 from gmail_chatbot.email_config import DATA_DIR
+from gmail_chatbot.vector_db.bm25 import BM25Index
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -40,6 +41,9 @@ class EmailMemoryStore:
         self.client_memory = self._load_or_create(self.client_memory_file)
         self.email_memory = self._load_or_create(self.email_memory_file)
         self.interaction_memory = self._load_or_create(self.interaction_memory_file)
+        
+        # BM25 index over email_memory, built on the first keyword search
+        self._keyword_index: Optional[BM25Index] = None
     
     def _load_or_create(self, file_path: Path) -> Dict:
         """Load a memory file or create it if it doesn't exist."""
@@ -92,7 +96,8 @@ class EmailMemoryStore:
                        client: Optional[str] = None,
                        tags: Optional[List[str]] = None,
                        requires_action: bool = False,
-                       action_type: Optional[str] = None) -> None:
+                       action_type: Optional[str] = None,
+                       save: bool = True) -> None:
         """Store information about an email for future reference.
         
         Args:
@@ -106,6 +111,8 @@ class EmailMemoryStore:
             tags: List of tags/keywords for the email
             requires_action: Whether this email needs action
             action_type: Type of action needed (if applicable)
+            save: Write the memory files now; pass False when the caller
+                saves once after a batch (see ``add_email_memories``)
         """
         if email_id in self.email_memory:
             # Update existing email record
@@ -121,6 +128,7 @@ class EmailMemoryStore:
                 existing_tags = set(self.email_memory[email_id].get("tags", []))
                 updated_tags = list(existing_tags.union(set(tags)))
                 self.email_memory[email_id]["tags"] = updated_tags
+            self._index_email(email_id)
         else:
             # Create new email record
             self.email_memory[email_id] = {
@@ -137,15 +145,51 @@ class EmailMemoryStore:
                 "last_accessed": datetime.now().isoformat(),
                 "access_count": 1
             }
+            self._index_email(email_id)
             
             # If this is associated with a client, update client interaction count
             if client and client.lower().replace(' ', '_') in self.client_memory:
                 client_key = client.lower().replace(' ', '_')
                 self.client_memory[client_key]["interactions"] += 1
-                self._save_memory(self.client_memory, self.client_memory_file)
+                if save:
+                    self._save_memory(self.client_memory, self.client_memory_file)
         
         # Save to file
+        if save:
+            self._save_memory(self.email_memory, self.email_memory_file)
+    
+    def add_email_memories(self, emails: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """Store several emails and write the memory files once.
+        
+        Args:
+            emails: Dicts with the keyword arguments of ``add_email_memory``
+        
+        Returns:
+            Dict mapping each email ID to True once it is written
+        
+        Raises:
+            Exception: If the memory files could not be written
+        """
+        if not emails:
+            return {}
+        for email in emails:
+            EmailMemoryStore.add_email_memory(
+                self,
+                email_id=email["email_id"],
+                subject=email.get("subject", ""),
+                sender=email.get("sender", ""),
+                recipient=email.get("recipient", ""),
+                date=email.get("date", ""),
+                summary=email.get("summary", ""),
+                client=email.get("client"),
+                tags=email.get("tags"),
+                requires_action=email.get("requires_action", False),
+                action_type=email.get("action_type"),
+                save=False
+            )
+        self._save_memory(self.client_memory, self.client_memory_file)
         self._save_memory(self.email_memory, self.email_memory_file)
+        return {email["email_id"]: True for email in emails}
     
     def record_interaction(self, 
                          query: str, 
@@ -242,9 +286,27 @@ class EmailMemoryStore:
         'summary': 1
     }
     
+    def _keyword_fields(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Fields of an email record that keyword search looks at."""
+        return {field: email_data.get(field) for field in self.KEYWORD_WEIGHTS}
+    
+    def _index_email(self, email_id: str) -> None:
+        """Refresh one email in the keyword index if it has been built."""
+        if self._keyword_index is not None:
+            self._keyword_index.add(email_id, self._keyword_fields(self.email_memory[email_id]))
+    
+    def _get_keyword_index(self) -> BM25Index:
+        """Return the keyword index, building it from email_memory on first use."""
+        if self._keyword_index is None:
+            index = BM25Index(field_weights=self.KEYWORD_WEIGHTS)
+            for email_id, email_data in self.email_memory.items():
+                index.add(email_id, self._keyword_fields(email_data))
+            self._keyword_index = index
+        return self._keyword_index
+    
     def find_related_emails(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
-        """Find emails related to a specific query using simple keyword matching.
-        This is a simplified version of vector search using keyword matching.
+        """Find emails related to a specific query using BM25 keyword matching.
+        Subject, tag and summary terms are weighted by ``KEYWORD_WEIGHTS``.
         
         Args:
             query: Search query
@@ -253,41 +315,9 @@ class EmailMemoryStore:
         Returns:
             List of related email information
         """
-        # Convert query to lowercase for case-insensitive matching
-        query_terms = query.lower().split()
-        
-        # Calculate relevance scores for each email
-        scored_emails = []
-        for email_id, email_data in self.email_memory.items():
-            score = 0
-            
-            # Check subject
-            subject_lower = email_data["subject"].lower()
-            for term in query_terms:
-                if term in subject_lower:
-                    score += self.KEYWORD_WEIGHTS['subject']
-            
-            # Check summary
-            summary_lower = email_data["summary"].lower()
-            for term in query_terms:
-                if term in summary_lower:
-                    score += self.KEYWORD_WEIGHTS['summary']
-            
-            # Check tags
-            for tag in email_data.get("tags", []):
-                for term in query_terms:
-                    if term in tag.lower():
-                        score += self.KEYWORD_WEIGHTS['tags']
-            
-            if score > 0:
-                scored_emails.append((email_id, email_data, score))
-        
-        # Sort by score (highest first)
-        scored_emails.sort(key=lambda x: x[2], reverse=True)
-        
-        # Return top results
         results = []
-        for email_id, email_data, score in scored_emails[:max_results]:
+        for email_id, score, _ in self._get_keyword_index().search(query, k=max_results):
+            email_data = self.email_memory[email_id]
             results.append({
                 "email_id": email_id,
                 "subject": email_data["subject"],
@@ -295,7 +325,7 @@ class EmailMemoryStore:
                 "date": email_data["date"],
                 "summary": email_data["summary"],
                 "client": email_data.get("client"),
-                "relevance_score": score,
+                "relevance_score": round(score, 2),
                 "requires_action": email_data.get("requires_action", False)
             })
         
@@ -4,12 +4,21 @@
 import json
 import logging
 import hashlib
+import threading
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 # Import the base memory store for backward compatibility
 from gmail_chatbot.email_memory import EmailMemoryStore
 
+from gmail_chatbot.email_config import (
+    VECTOR_ASYNC_INDEXING,
+    VECTOR_INDEX_QUEUE_BATCH,
+    VECTOR_INDEX_QUEUE_DELAY,
+    VECTOR_SEARCH_MODE,
+)
+from gmail_chatbot.vector_db import IndexingQueue
+
 # Import the vector database
 from gmail_chatbot.email_vector_db import vector_db
 
@@ -28,8 +37,14 @@ class EmailVectorMemoryStore(EmailMemoryStore):
     and falls back to the original keyword-based search when vector search is not available.
     """
     
-    def __init__(self) -> None:
-        """Initialize the enhanced vector-based email memory storage system."""
+    def __init__(self, async_indexing: bool = VECTOR_ASYNC_INDEXING) -> None:
+        """Initialize the enhanced vector-based email memory storage system.
+        
+        Args:
+            async_indexing: Index new emails on a background worker (see
+                ``flush_indexing``) instead of before ``add_email_memories``
+                returns
+        """
         # Initialize the base memory store
         super().__init__()
         
@@ -42,10 +57,8 @@ class EmailVectorMemoryStore(EmailMemoryStore):
             self.preferences = [] # Assuming preferences are stored as a list of dicts or MemoryEntry objects
             logger.warning("Initialized missing preferences list.")
         
-        # Initialize vector DB status from the vector_db instance
-        self.vector_search_available: bool = vector_db.vector_search_available
-        self.vector_search_error_message: Optional[str] = vector_db.initialization_error_message
-
+        # vector_search_available / vector_search_error_message read through to
+        # vector_db, which may still be loading its model in the background
         if self.vector_search_available:
             logger.info("Vector search is available and enabled.")
         else:
@@ -58,13 +71,44 @@ class EmailVectorMemoryStore(EmailMemoryStore):
             logger.warning(log_msg)
             logger.info("Falling back to keyword-based search if applicable.")
             
-        # Track emails that have been added to the vector DB
+        # Track emails that have been added to the vector DB; the lock guards
+        # it against the background indexer
         self.vector_indexed_emails = set()
+        self._indexed_lock = threading.Lock()
         self.vector_index_file = self.memory_dir / "vector_indexed_emails.json"
         
         # Load the list of already indexed emails
         self._load_indexed_emails()
+        
+        # Durable queue of emails waiting for the background indexer
+        self.index_queue: Optional[IndexingQueue] = None
+        if async_indexing:
+            self.index_queue = IndexingQueue(
+                self.memory_dir / "vector_index_queue.json",
+                self._index_records,
+                batch_size=VECTOR_INDEX_QUEUE_BATCH,
+                batch_delay=VECTOR_INDEX_QUEUE_DELAY,
+            )
     
+    @property
+    def vector_search_available(self) -> bool:
+        """Whether vector search can be used (optimistic while the model loads)."""
+        return vector_db.vector_search_available
+
+    @property
+    def vector_search_error_message(self) -> Optional[str]:
+        """Error from loading the embedding model, if any."""
+        return vector_db.initialization_error_message
+
+    @property
+    def vector_search_readiness(self) -> str:
+        """Loading state of the embedding model, see ``EmailVectorDB.readiness``."""
+        return vector_db.readiness
+
+    def warm_up_vector_search(self) -> None:
+        """Start loading the embedding model and index in the background."""
+        vector_db.warm_up()
+
     def get_vector_search_error_message(self) -> Optional[str]:
         """Return the error message related to vector search initialization, if any."""
         return self.vector_search_error_message
@@ -82,9 +126,11 @@ class EmailVectorMemoryStore(EmailMemoryStore):
     
     def _save_indexed_emails(self) -> None:
         """Save the list of emails that have been indexed in the vector database."""
+        with self._indexed_lock:
+            indexed = list(self.vector_indexed_emails)
         try:
             with open(self.vector_index_file, 'w', encoding='utf-8') as f:
-                json.dump(list(self.vector_indexed_emails), f)
+                json.dump(indexed, f)
         except Exception as e:
             logger.error(f"Error saving vector indexed emails: {e}")
     
@@ -115,65 +161,110 @@ class EmailVectorMemoryStore(EmailMemoryStore):
             requires_action: Whether this email needs action
             action_type: Type of action needed (if applicable)
         """
+        self.add_email_memories([{
+            "email_id": email_id,
+            "subject": subject,
+            "sender": sender,
+            "recipient": recipient,
+            "date": date,
+            "summary": summary,
+            "body": body,
+            "client": client,
+            "tags": tags,
+            "requires_action": requires_action,
+            "action_type": action_type
+        }])
+    
+    def add_email_memories(self, emails: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """Store several emails and index them in the vector database in one batch.
+        
+        The JSON memory files are written once, and all emails that carry a
+        body are embedded and added to the vector index with a single
+        ``vector_db.add_emails`` call.
+        
+        Args:
+            emails: Dicts with the keyword arguments of ``add_email_memory``
+        
+        Returns:
+            Dict mapping each email ID to True if it is stored and indexed
+            (or journaled for indexing when the indexing queue is enabled)
+        """
         # First, store in the base memory system
-        super().add_email_memory(
-            email_id=email_id,
-            subject=subject,
-            sender=sender,
-            recipient=recipient,
-            date=date,
-            summary=summary,
-            client=client,
-            tags=tags,
-            requires_action=requires_action,
-            action_type=action_type
-        )
-        
-        # If vector search is available and we have the body text, add to vector DB
-        if self.vector_search_available and body:
-            try:
-                # Check if this email is already in the vector DB
-                if email_id in self.vector_indexed_emails:
-                    # Check if we need to reindex (e.g., if the content has changed)
-                    current_email = self.email_memory.get(email_id, {})
-                    content_changed = current_email.get("summary") != summary
-                    
-                    if content_changed:
-                        logger.info(f"Email {email_id} content changed, reindexing in vector DB")
-                    else:
-                        logger.debug(f"Email {email_id} already indexed in vector DB")
-                        return
-                
-                # Add/update in vector DB
-                tags_list = tags or []
-                if client:
-                    tags_list.append(f"client:{client}")
-                
-                # Add to vector database
-                result = vector_db.add_email(
-                    email_id=email_id,
-                    subject=subject,
-                    sender=sender,
-                    recipient=recipient,
-                    body=body,  # Use full email body for better vector representation
-                    date=date,
-                    tags=tags_list,
-                    force_reindex=True if email_id in self.vector_indexed_emails else False
-                )
-                
-                if result:
-                    # Track that this email has been indexed
-                    self.vector_indexed_emails.add(email_id)
-                    self._save_indexed_emails()
-                    logger.info(f"Email {email_id} successfully indexed in vector DB")
-                else:
-                    logger.warning(f"Failed to index email {email_id} in vector DB")
-                    
-            except Exception as e:
-                logger.error(f"Error indexing email in vector DB: {e}")
+        results = super().add_email_memories(emails)
+        
+        if not self.vector_search_available:
+            return results
+        
+        # Only emails with a full body are worth indexing
+        records = []
+        for email in emails:
+            if not email.get("body"):
+                continue
+            tags_list = list(email.get("tags") or [])
+            if email.get("client"):
+                tags_list.append(f"client:{email['client']}")
+            records.append({
+                "email_id": email["email_id"],
+                "subject": email.get("subject", ""),
+                "sender": email.get("sender", ""),
+                "recipient": email.get("recipient", ""),
+                "body": email["body"],  # Use full email body for better vector representation
+                "date": email.get("date", ""),
+                "tags": tags_list
+            })
+        if not records:
+            return results
+        
+        if self.index_queue is not None:
+            # Embedding happens on the worker; this only journals the emails
+            self.index_queue.enqueue(records)
+            return results
+        try:
+            indexed = self._index_records(records)
+        except Exception as e:
+            logger.error(f"Error indexing emails in vector DB: {e}")
+            indexed = {record["email_id"]: False for record in records}
+        for email_id, ok in indexed.items():
+            results[email_id] = results.get(email_id, True) and ok
+        return results
     
-
+    def _index_records(self, records: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """Add emails to the vector database and record which were indexed.
+        
+        Args:
+            records: Dicts accepted by ``vector_db.add_emails``
+        
+        Returns:
+            Dict mapping each email ID to True if it is indexed
+        """
+        # Unchanged emails are skipped by the vector DB's content hash check
+        results = vector_db.add_emails(records)
+        
+        indexed = [email_id for email_id, ok in results.items() if ok]
+        failed = [email_id for email_id, ok in results.items() if not ok]
+        if indexed:
+            # Track that these emails have been indexed
+            with self._indexed_lock:
+                self.vector_indexed_emails.update(indexed)
+            self._save_indexed_emails()
+            logger.info(f"{len(indexed)} emails indexed in vector DB")
+        if failed:
+            logger.warning(f"Failed to index emails in vector DB: {', '.join(failed)}")
+        return results
     
+    def flush_indexing(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued emails are indexed.
+        
+        Args:
+            timeout: Seconds to wait at most, or None to wait until done
+        
+        Returns:
+            True if nothing is left in the indexing queue
+        """
+        if self.index_queue is None:
+            return True
+        return self.index_queue.flush(timeout)
+
     def is_notebook_empty(self) -> bool:
         """Check if the notebook (emails, clients, preferences) is empty."""
         # Check emails in vector DB (via vector_indexed_emails for speed) and base email_memory
@@ -270,8 +361,10 @@ class EmailVectorMemoryStore(EmailMemoryStore):
         """
         status = {
             "vector_search_available": self.vector_search_available,
+            "readiness": self.vector_search_readiness,
             "indexed_emails": len(self.vector_indexed_emails),
-            "total_emails": len(self.email_memory)
+            "total_emails": len(self.email_memory),
+            "index_queue": self.index_queue.stats() if self.index_queue else None
         }
         
         # Add details from vector DB if available
@@ -285,6 +378,59 @@ class EmailVectorMemoryStore(EmailMemoryStore):
         
         return status
     
+    def _emails_from_groups(self, email_results: List[Dict[str, Any]], limit: int,
+                            min_relevance: float) -> List[Dict[str, Any]]:
+        """Convert email-grouped search results to email records.
+        
+        Args:
+            email_results: Results from vector_db.search_emails, best first
+            limit: Maximum number of emails to return
+            min_relevance: Minimum relevance score (0-10) to include in results
+        
+        Returns:
+            Email information with relevance scores and the best-matching snippet
+        """
+        results = []
+        for result in email_results:
+            email_id = result['email_id']
+            
+            # Calculate relevance score (0-10 scale) from the best-matching chunk
+            relevance_score = round(result['similarity'] * 10, 2)  # Round to 2 decimal places for readability
+            
+            # Skip results below minimum relevance threshold
+            if relevance_score < min_relevance:
+                continue
+            
+            # If this email exists in our memory, use the full metadata
+            if email_id in self.email_memory:
+                email_data = self.email_memory[email_id]
+                
+                results.append({
+                    "email_id": email_id,
+                    "subject": email_data["subject"],
+                    "sender": email_data["sender"],
+                    "date": email_data["date"],
+                    "summary": email_data["summary"],
+                    "client": email_data.get("client"),
+                    "relevance_score": relevance_score,
+                    "snippet": result["snippet"],
+                    "requires_action": email_data.get("requires_action", False),
+                    "search_type": result.get("search_type", "vector")
+                })
+                if len(results) >= limit:
+                    break
+        return results
+
+    def _keyword_related_emails(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        logger.info(f"Using keyword search for query: {query}")
+        keyword_results = super().find_related_emails(query, limit)  # Use updated parameter name
+        
+        # Add search type to distinguish in logs
+        for result in keyword_results:
+            result["search_type"] = "keyword"
+            
+        return keyword_results
+
     def find_related_emails(self, query: str, limit: int = 5, 
                       min_relevance: float = 0.0,
                       filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
@@ -304,62 +450,58 @@ class EmailVectorMemoryStore(EmailMemoryStore):
         if self.vector_search_available and len(self.vector_indexed_emails) > 0:
             try:
                 logger.info(f"Using vector search for query: {query} (limit={limit}, min_relevance={min_relevance})")
-                # Request more results than needed to allow for filtering by min_relevance
-                search_limit = min(limit * 2, 20)  # Double the limit but cap at 20 to avoid excessive results
-                vector_results = vector_db.search(query, num_results=search_limit, filters=filters)
-                
-                if vector_results:
-                    # Convert vector results to the expected format
-                    results = []
-                
-                for result in vector_results:
-                    # Get the email ID from the search result metadata
-                    email_id = result['metadata'].get('email_id')
-                    
-                    # Calculate relevance score (0-10 scale)
-                    relevance_score = round(result['similarity'] * 10, 2)  # Round to 2 decimal places for readability
-                    
-                    # Skip results below minimum relevance threshold
-                    if relevance_score < min_relevance:
-                        continue
-                    
-                    # If this email exists in our memory, use the full metadata
-                    if email_id in self.email_memory:
-                        email_data = self.email_memory[email_id]
-                        
-                        results.append({
-                            "email_id": email_id,
-                            "subject": email_data["subject"],
-                            "sender": email_data["sender"],
-                            "date": email_data["date"],
-                            "summary": email_data["summary"],
-                            "client": email_data.get("client"),
-                            "relevance_score": relevance_score,
-                            "requires_action": email_data.get("requires_action", False),
-                            "search_type": "vector"
-                        })
-                    
-                    if results:
-                        # Sort by relevance score (highest first) and limit to requested number
-                        results.sort(key=lambda x: x['relevance_score'], reverse=True)
-                        results = results[:limit]
-                        
-                        logger.info(f"Found {len(results)} related emails using vector search (after relevance filtering)")
-                        return results
+                # Chunks are grouped per email until `limit` distinct emails are found
+                # Relevance is filtered before the limit, so weak top hits don't use it up
+                email_results = vector_db.search_emails(
+                    query, limit=limit, filters=filters, mode=VECTOR_SEARCH_MODE,
+                    min_similarity=min_relevance / 10
+                )
+                results = self._emails_from_groups(email_results, limit, min_relevance)
+                if results:
+                    logger.info(f"Found {len(results)} related emails using vector search (after relevance filtering)")
+                    return results
                     
                 logger.info("No vector search results, falling back to keyword search")
             except Exception as e:
                 logger.error(f"Error in vector search: {e}")
         
         # Fall back to keyword search
-        logger.info(f"Using keyword search for query: {query}")
-        keyword_results = super().find_related_emails(query, limit)  # Use updated parameter name
+        return self._keyword_related_emails(query, limit)
+
+    def find_related_emails_many(self, queries: List[str], limit: int = 5,
+                                 min_relevance: float = 0.0,
+                                 filters: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        """Run find_related_emails for several queries with one batched vector search.
         
-        # Add search type to distinguish in logs
-        for result in keyword_results:
-            result["search_type"] = "keyword"
-            
-        return keyword_results
+        Args:
+            queries: Search queries
+            limit: Maximum number of results per query
+            min_relevance: Minimum relevance score (0-10) to include in results
+            filters: Optional filters applied to every query
+        
+        Returns:
+            One list of related emails per query, in the order of ``queries``
+        """
+        batches: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        if queries and self.vector_search_available and len(self.vector_indexed_emails) > 0:
+            try:
+                logger.info(f"Using batched vector search for {len(queries)} queries (limit={limit}, min_relevance={min_relevance})")
+                email_batches = vector_db.search_emails_many(
+                    queries, limit=limit, filters=filters, mode=VECTOR_SEARCH_MODE,
+                    min_similarity=min_relevance / 10
+                )
+                batches = [
+                    self._emails_from_groups(email_results, limit, min_relevance)
+                    for email_results in email_batches
+                ]
+            except Exception as e:
+                logger.error(f"Error in batched vector search: {e}")
+        
+        # Queries without vector results fall back to keyword search
+        return [
+            results or self._keyword_related_emails(query, limit)
+            for query, results in zip(queries, batches)
+        ]
 
 
     def batch_process_historical_emails(self, limit: int, callback: Optional[callable] = None) -> Dict[str, Any]:
@@ -401,55 +543,34 @@ class EmailVectorMemoryStore(EmailMemoryStore):
             logger.info(f"Starting batch processing of {total_to_process} unindexed emails")
             results["total_to_process"] = total_to_process
             
-            # Process emails
-            for i, (email_id, email_data) in enumerate(unindexed_emails):
+            # Build vector records for all emails up front
+            records = self.vector_records([email_id for email_id, _ in unindexed_emails])
+            
+            # Index in embedding-sized slices so progress can still be reported
+            step = max(1, vector_db.embedding_batch_size)
+            for start in range(0, total_to_process, step):
+                batch = records[start:start + step]
                 try:
-                    # Extract email data
-                    subject = email_data.get("subject", "")
-                    sender = email_data.get("sender", "")
-                    recipient = email_data.get("recipient", "")
-                    date = email_data.get("date", "")
-                    summary = email_data.get("summary", "")
-                    client = email_data.get("client")
-                    tags = email_data.get("tags", [])
-                    
-                    # For historical emails, we might not have the full body, so create a synthetic one
-                    # combining subject and summary for vector indexing
-                    body = f"Subject: {subject}\n\n{summary}"
-                    
-                    # Add to vector database
-                    tags_list = tags or []
-                    if client:
-                        tags_list.append(f"client:{client}")
-                    
-                    result = vector_db.add_email(
-                        email_id=email_id,
-                        subject=subject,
-                        sender=sender,
-                        recipient=recipient,
-                        body=body,
-                        date=date,
-                        tags=tags_list,
-                        force_reindex=False  # This is a first-time indexing
-                    )
-                    
-                    if result:
+                    batch_results = vector_db.add_emails(batch, force_reindex=False)  # This is a first-time indexing
+                except Exception as e:
+                    logger.error(f"Error batch indexing {len(batch)} emails: {e}")
+                    batch_results = {}
+                
+                for record in batch:
+                    email_id = record["email_id"]
+                    if batch_results.get(email_id):
                         # Track that this email has been indexed
                         self.vector_indexed_emails.add(email_id)
                         results["indexed"] += 1
-                        logger.info(f"Batch indexed email {email_id}")
                     else:
                         results["errors"] += 1
                         logger.warning(f"Failed to batch index email {email_id}")
-                except Exception as e:
-                    results["errors"] += 1
-                    logger.error(f"Error batch indexing email {email_id}: {e}")
                 
                 # Update progress
-                results["processed"] += 1
+                results["processed"] += len(batch)
                 if callback and callable(callback):
-                    progress_pct = (i + 1) / total_to_process * 100
-                    callback(progress_pct, i + 1, total_to_process)
+                    progress_pct = results["processed"] / total_to_process * 100
+                    callback(progress_pct, results["processed"], total_to_process)
             
             # Save the updated indexed emails list
             self._save_indexed_emails()
@@ -465,6 +586,39 @@ class EmailVectorMemoryStore(EmailMemoryStore):
             results["error_message"] = str(e)
             return results
     
+    def vector_records(self, email_ids: List[str]) -> List[Dict[str, Any]]:
+        """Build ``vector_db.add_emails`` records for emails in memory.
+        
+        Memory keeps no full body, so the indexed text combines the
+        subject and summary. Unknown IDs are skipped.
+        
+        Args:
+            email_ids: IDs of emails in ``email_memory``
+        
+        Returns:
+            One record per known email, in the given order
+        """
+        records = []
+        for email_id in email_ids:
+            email_data = self.email_memory.get(email_id)
+            if email_data is None:
+                continue
+            subject = email_data.get("subject", "")
+            summary = email_data.get("summary", "")
+            tags_list = list(email_data.get("tags") or [])
+            if email_data.get("client"):
+                tags_list.append(f"client:{email_data['client']}")
+            records.append({
+                "email_id": email_id,
+                "subject": subject,
+                "sender": email_data.get("sender", ""),
+                "recipient": email_data.get("recipient", ""),
+                "body": f"Subject: {subject}\n\n{summary}",
+                "date": email_data.get("date", ""),
+                "tags": tags_list
+            })
+        return records
+    
     def remember_user_preference(self, label: str, content: str, source: str = "user", tags: List[str] = None) -> bool:
         """Store structured user preferences for later use.
         
@@ -30,79 +30,128 @@ import logging
 import warnings
 import traceback
 import argparse
+import threading
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple
 
+from gmail_chatbot.disk_store import DiskStore, DiskStoreError
+from gmail_chatbot.vector_db import ChunkBM25Index, ChunkStore, MetadataFilterIndex
+from gmail_chatbot.vector_db.filters import parse_date
+from gmail_chatbot.vector_db.text_splitter import TokenTextSplitter
 from gmail_chatbot.vector_db import create_new_index, store_chunks_without_vectors
-from gmail_chatbot.vector_db import search as vector_search, keyword_search
-# Apply hot-patch for PyTorch before importing it
-try:  # pragma: no cover - torch is optional in the test environment
-    import torch  # type: ignore
-
-    torch.classes.__path__ = (
-        []
-    )  # Hot-patch to prevent Streamlit watcher issues
-    warnings.filterwarnings(
-        "ignore",
-        message=r".*Tried to instantiate class '__path__._path'.*",
-        category=UserWarning,
-        module="torch",
-    )
+from gmail_chatbot.vector_db import search as vector_search, keyword_search, hybrid_search
+from gmail_chatbot.vector_db import search_many as vector_search_many, hybrid_search_many
+from gmail_chatbot.vector_db import QueryCache, search_emails_many
+from gmail_chatbot.vector_db.search import SEARCH_MODES
+from gmail_chatbot.vector_db import CachedEmbeddings, EmbeddingCache
+from gmail_chatbot.vector_db import Reindexer, ann
+from gmail_chatbot.vector_db.embedding_backends import (
+    cache_model_key,
+    create_embeddings,
+    register_backend,
+)
+from gmail_chatbot.vector_db.faiss_store import FaissChunkIndex, legacy_docstore_path
+
+# torch is imported (and hot-patched) only when the embedding model loads
+torch = None
+_torch_configured = False
+
+
+def _configure_torch() -> None:
+    """Import torch and silence the warnings it triggers under Streamlit.
+
+    Called right before the embedding model is created so importing this
+    module doesn't pull in torch.
+    """
+    global torch, _torch_configured
+    if _torch_configured:
+        return
+    _torch_configured = True
+    try:  # pragma: no cover - torch is optional in the test environment
+        import torch as _torch  # type: ignore
+
+        _torch.classes.__path__ = (
+            []
+        )  # Hot-patch to prevent Streamlit watcher issues
+        warnings.filterwarnings(
+            "ignore",
+            message=r".*Tried to instantiate class '__path__._path'.*",
+            category=UserWarning,
+            module="torch",
+        )
 
-    # Also suppress other common torch warnings
-    warnings.filterwarnings(
-        "ignore",
-        message=r".*Examining the path of torch\.classes raised.*",
-        category=UserWarning,
-    )
+        # Also suppress other common torch warnings
+        warnings.filterwarnings(
+            "ignore",
+            message=r".*Examining the path of torch\.classes raised.*",
+            category=UserWarning,
+        )
 
-    # Force disable torch warnings completely
-    logging.getLogger("pytorch_pretrained_bert").setLevel(logging.ERROR)
-    logging.getLogger("pytorch").setLevel(logging.ERROR)
-    logging.getLogger("transformers").setLevel(logging.ERROR)
+        # Force disable torch warnings completely
+        logging.getLogger("pytorch_pretrained_bert").setLevel(logging.ERROR)
+        logging.getLogger("pytorch").setLevel(logging.ERROR)
+        logging.getLogger("transformers").setLevel(logging.ERROR)
 
-    # Last resort: filter all torch-related warnings
-    old_showwarning = warnings.showwarning
+        # Last resort: filter all torch-related warnings
+        old_showwarning = warnings.showwarning
 
-    def custom_showwarning(message, *args, **kwargs):
-        msg_str = str(message)
-        if (
-            "torch" in msg_str
-            or "Tried to instantiate class" in msg_str
-            or "__path__._path" in msg_str
-        ):
-            return  # Suppress the warning
-        old_showwarning(message, *args, **kwargs)  # Show other warnings
+        def custom_showwarning(message, *args, **kwargs):
+            msg_str = str(message)
+            if (
+                "torch" in msg_str
+                or "Tried to instantiate class" in msg_str
+                or "__path__._path" in msg_str
+            ):
+                return  # Suppress the warning
+            old_showwarning(message, *args, **kwargs)  # Show other warnings
 
-    warnings.showwarning = custom_showwarning
-except Exception:
-    torch = None
+        warnings.showwarning = custom_showwarning
+        torch = _torch
+    except Exception:
+        torch = None
 
 # Import environment configuration
-from gmail_chatbot.email_config import DATA_DIR
+from gmail_chatbot.email_config import (
+    DATA_DIR,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    HYBRID_DENSE_WEIGHT,
+    HYBRID_FUSION,
+    VECTOR_CHUNK_OVERLAP_TOKENS,
+    VECTOR_CHUNK_TOKENS,
+    VECTOR_COMPACT_DEAD_FRACTION,
+    VECTOR_EMAIL_SCORING,
+    VECTOR_EMBED_BATCH_SIZE,
+    VECTOR_EMBEDDING_BACKEND,
+    VECTOR_HNSW_EF_SEARCH,
+    VECTOR_HNSW_MIN_CHUNKS,
+    VECTOR_INDEX_TYPE,
+    VECTOR_IVF_NPROBE,
+    VECTOR_MIN_INDEX_RECALL,
+    VECTOR_IVFPQ_MIN_CHUNKS,
+    VECTOR_LAZY_INIT,
+    VECTOR_MMAP_INDEX,
+    VECTOR_QUERY_CACHE_SIZE,
+    VECTOR_REINDEX_BATCH_SIZE,
+    VECTOR_SHARD_BY,
+)
 
 # Provide simple constants for tests that import them
 EMBEDDING_MODEL_NAME = "test-embeddings"
 DEFAULT_CACHE_DIR = os.path.join(DATA_DIR, "vector_cache")
 
+# Seconds between checks for an index generation published by another process
+INDEX_REFRESH_INTERVAL = 1.0
+
 # Configure logging
 logger = logging.getLogger(__name__)
 logging.getLogger("faiss.loader").setLevel(logging.WARNING)
 logging.getLogger("torch").setLevel(logging.ERROR)
 logger.debug("email_vector_db.py loaded")
 
-# Try to import required dependencies
-try:
-    from langchain.text_splitter import RecursiveCharacterTextSplitter
-
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
-    logger.warning("langchain not installed. TextSplitter will be limited.")
-
 # Try to import vector libraries with proper fallbacks
 try:
-    from langchain_community.vectorstores import FAISS
+    import faiss  # noqa: F401
 
     # Force FAISS to CPU-only mode as per user request / configuration
     GPU_AVAILABLE = False
@@ -114,11 +163,17 @@ try:
     )
 
     # Ensure 'langchain-huggingface' is installed in your environment
-    from langchain_huggingface import HuggingFaceEmbeddings
+    try:
+        from langchain_huggingface import HuggingFaceEmbeddings
 
-    logger.info(
-        "Using HuggingFaceEmbeddings from langchain_huggingface package"
-    )
+        logger.info(
+            "Using HuggingFaceEmbeddings from langchain_huggingface package"
+        )
+    except ModuleNotFoundError:
+        if VECTOR_EMBEDDING_BACKEND == "torch":
+            raise
+        # The ONNX backends don't need torch or langchain-huggingface
+        HuggingFaceEmbeddings = None
 
     VECTOR_LIBS_AVAILABLE = True
 except ModuleNotFoundError as e:  # pragma: no cover - optional dependency
@@ -129,64 +184,17 @@ except ModuleNotFoundError as e:  # pragma: no cover - optional dependency
     )
 
 
-class SimpleTextSplitter:
-    """Fallback text splitter when langchain is not available"""
-
-    def __init__(self, chunk_size: int = 800, chunk_overlap: int = 50):
-        """Initialize with chunk parameters
-
-        Args:
-            chunk_size: Target size of each chunk in characters
-            chunk_overlap: Overlap between chunks in characters
-        """
-        self.chunk_size = chunk_size
-        self.chunk_overlap = chunk_overlap
-
-    def split_text(self, text: str) -> List[str]:
-        """Split text into chunks with overlap
-
-        Args:
-            text: Text to split
-
-        Returns:
-            List of text chunks
-        """
-        if not text:
-            return []
-
-        # Basic splitting on paragraph breaks when possible
-        paragraphs = re.split(r"\n\s*\n", text)
-
-        chunks = []
-        current_chunk = ""
-
-        for para in paragraphs:
-            # If adding this paragraph would exceed chunk size, store current chunk and start new one
-            if (
-                len(current_chunk) + len(para)
-                > self.chunk_size - self.chunk_overlap
-                and current_chunk
-            ):
-                chunks.append(current_chunk.strip())
-                # Start new chunk with overlap from the end of previous chunk
-                if len(current_chunk) > self.chunk_overlap:
-                    current_chunk = (
-                        current_chunk[-self.chunk_overlap :] + "\n\n" + para
-                    )
-                else:
-                    current_chunk = para
-            else:
-                # Add paragraph to current chunk
-                if current_chunk:
-                    current_chunk += "\n\n" + para
-                else:
-                    current_chunk = para
+def _torch_embeddings(model_name: str, cache_folder: str) -> Any:
+    """sentence-transformers on PyTorch, the default embedding backend"""
+    _configure_torch()
+    return HuggingFaceEmbeddings(
+        model_name=model_name,
+        cache_folder=cache_folder,
+        # Consider adding model_kwargs={'device': 'cpu'} if GPU issues persist despite FAISS CPU mode
+    )
 
-        # Add the last chunk if not empty
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
 
-        return chunks
+register_backend("torch", _torch_embeddings)
 
 
 class EmailVectorDB:
@@ -196,16 +204,79 @@ class EmailVectorDB:
         self,
         cache_dir: Optional[str] = None,
         embedding_model: str = "all-MiniLM-L6-v2",
-        chunk_size: int = 600,
-        chunk_overlap: int = 50,
+        chunk_size: int = VECTOR_CHUNK_TOKENS,
+        chunk_overlap: int = VECTOR_CHUNK_OVERLAP_TOKENS,
+        embedding_batch_size: int = VECTOR_EMBED_BATCH_SIZE,
+        lazy: bool = False,
+        embedding_cache_size: int = EMBEDDING_CACHE_MAX_ENTRIES,
+        compact_dead_fraction: float = VECTOR_COMPACT_DEAD_FRACTION,
+        index_type: str = VECTOR_INDEX_TYPE,
+        mmap_index: bool = VECTOR_MMAP_INDEX,
+        query_cache_size: int = VECTOR_QUERY_CACHE_SIZE,
+        embedding_backend: str = VECTOR_EMBEDDING_BACKEND,
+        shard_by: str = VECTOR_SHARD_BY,
     ):
-        """Initialize the vector database with configurable parameters."""
+        """Initialize the vector database with configurable parameters.
+
+        ``chunk_size`` and ``chunk_overlap`` are measured in tokens of the
+        embedding model's tokenizer (estimated until the model is loaded),
+        so chunks fit the model's input window.
+
+        With ``lazy=True`` the embedding model and FAISS index are not loaded
+        here but on the first search or add (or by ``warm_up``); ``readiness``
+        tracks progress and ``vector_search_available`` is optimistic until
+        loading fails.
+
+        Chunks of removed or re-indexed emails are tombstoned and skipped by
+        search; once they make up ``compact_dead_fraction`` of the store it is
+        rebuilt from the live chunks (0 disables automatic compaction).
+
+        ``index_type`` is ``flat``, ``hnsw``, ``ivfpq`` or ``auto``; with
+        ``auto`` the FAISS index is promoted to HNSW and then IVF-PQ as the
+        chunk count crosses ``VECTOR_HNSW_MIN_CHUNKS`` and
+        ``VECTOR_IVFPQ_MIN_CHUNKS``, provided the new index's recall@10
+        against exact search reaches ``VECTOR_MIN_INDEX_RECALL``.
+
+        Each index write is published as a new generation file named in
+        ``<index_id>.manifest.json``. With ``mmap_index`` the current
+        generation is mapped read-only and searches switch to newer
+        generations written by other processes; the index is copied onto
+        the heap only when this process adds to it.
+
+        Up to ``query_cache_size`` search results are cached in memory (0
+        disables the cache); any add or delete invalidates them.
+
+        ``embedding_backend`` names the runtime that computes embeddings:
+        ``torch``, ``onnx`` or ``onnx-int8`` (see
+        :mod:`gmail_chatbot.vector_db.embedding_backends`).
+
+        ``shard_by`` (``month`` or ``quarter``) partitions chunks by date so
+        ``date_range`` filters only touch the overlapping time shards.
+        """
         self.vector_search_available: bool = False
         self.initialization_error_message: Optional[str] = None
         self.embeddings: Optional[HuggingFaceEmbeddings] = (
             None  # Ensure HuggingFaceEmbeddings is imported if not already
         )
         self.embedding_model_name: str = embedding_model
+        self.embedding_backend = embedding_backend
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_cache_size = embedding_cache_size
+        self.embedding_cache: Optional[EmbeddingCache] = None
+        self.compact_dead_fraction = compact_dead_fraction
+        self.index_type = index_type
+        self.hnsw_min_chunks = VECTOR_HNSW_MIN_CHUNKS
+        self.ivfpq_min_chunks = VECTOR_IVFPQ_MIN_CHUNKS
+        self.hnsw_ef_search = VECTOR_HNSW_EF_SEARCH
+        self.ivf_nprobe = VECTOR_IVF_NPROBE
+        self.min_index_recall = VECTOR_MIN_INDEX_RECALL
+        # (type, chunk count) of the last promotion rejected for low recall
+        self._rejected_promotion: Optional[Tuple[str, int]] = None
+        self.mmap_index = mmap_index
+        self.shard_by = shard_by
+        self.query_cache: Optional[QueryCache] = (
+            QueryCache(query_cache_size) if query_cache_size > 0 else None
+        )
 
         # Set up cache directory
         if cache_dir is None:
@@ -225,68 +296,31 @@ class EmailVectorDB:
                     f"Cannot create vector cache directory: {e}"
                 )
 
-        # Set up the text splitter
+        # Set up the token-aware text splitter
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-
-        if LANGCHAIN_AVAILABLE:
-            self.text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                length_function=len,
-                separators=["\n\n", "\n", ". ", " ", ""],
-            )
-            logger.info("Using langchain RecursiveCharacterTextSplitter")
-        else:
-            self.text_splitter = SimpleTextSplitter(
-                chunk_size=chunk_size, chunk_overlap=chunk_overlap
-            )
-            logger.info("Using SimpleTextSplitter fallback")
-
-        # Initialize embeddings model if available
-        if VECTOR_LIBS_AVAILABLE:
-            try:
-                logger.info(
-                    f"Attempting to initialize embedding model: {self.embedding_model_name}"
-                )
-                self.embeddings = HuggingFaceEmbeddings(
-                    model_name=self.embedding_model_name,
-                    cache_folder=os.path.join(self.cache_dir, "models"),
-                    # Consider adding model_kwargs={'device': 'cpu'} if GPU issues persist despite FAISS CPU mode
-                )
-                self.vector_search_available = True
-                self.initialization_error_message = None
-                logger.info(
-                    f"Successfully initialized embedding model: {self.embedding_model_name}"
-                )
-            except OSError as e_os:
-                self.embeddings = None
-                self.vector_search_available = False
-                error_code_info = (
-                    f" (OS Error Code: {e_os.errno})"
-                    if hasattr(e_os, "errno")
-                    else ""
-                )
-                self.initialization_error_message = (
-                    f"✗ Embedding model ('{self.embedding_model_name}') failed to load due to an OS error (likely out of memory): {str(e_os)}.{error_code_info} "
-                    f"Try on a machine with more RAM (e.g., 16GB+) or use a lighter model like 'sentence-transformers/all-MiniLM-L6-v2'."
-                )
-                logger.error(
-                    f"Failed to initialize embedding model '{self.embedding_model_name}' due to OSError: {e_os}",
-                    exc_info=True,
-                )
-            except Exception as e:
-                self.embeddings = None
-                self.vector_search_available = False
-                self.initialization_error_message = f"✗ Embedding model ('{self.embedding_model_name}') failed to load due to an unexpected error: {str(e)}."
-                logger.exception(
-                    f"Failed to initialize embedding model '{self.embedding_model_name}': {e}"
-                )
-        else:
+        self.text_splitter = TokenTextSplitter(chunk_size, chunk_overlap)
+
+        # Readiness of the embedding model and index: "pending" (lazy, not
+        # loaded yet), "loading", "ready", "failed" or "unavailable"
+        self.readiness = "pending"
+        self._init_lock = threading.Lock()
+        self._index_load_attempted = False
+        self._warmup_thread: Optional[threading.Thread] = None
+        # Serializes index writes, removals and compaction
+        self._write_lock = threading.RLock()
+
+        if not VECTOR_LIBS_AVAILABLE:
             self.embeddings = None
             self.vector_search_available = False
+            self.readiness = "unavailable"
             self.initialization_error_message = "✗ Vector search libraries (FAISS, HuggingFaceEmbeddings) are not available or failed to import. Vector search disabled."
             logger.error(self.initialization_error_message)
+        elif lazy:
+            # Libraries are present; report search as available until proven otherwise
+            self.vector_search_available = True
+        else:
+            self._load_embeddings()
 
         # Active vector DB and chunks
         self.active_db = None
@@ -299,46 +333,289 @@ class EmailVectorDB:
         self.is_indexed = False
         self.index_id = "email_index"
 
-        # Initialize email metadata index
+        # Names the current index generation; replaced atomically on publish
+        self._manifest_store = DiskStore(
+            Path(self.cache_dir) / f"{self.index_id}.manifest.json", journal=True
+        )
+        self._index_generation = 0
+        self._index_checked_at = 0.0
+
+        # Segmented on-disk chunk store; ``chunks``/``chunk_metadata`` are an
+        # in-memory copy that is only materialized on request
+        self.chunk_store = ChunkStore(
+            self._get_chunks_dir(), legacy_path=self._get_chunks_path()
+        )
+        self.chunks_loaded = False
+        # Metadata posting lists so filtered searches only touch matching rows;
+        # the email_id postings double as the email -> row id map
+        self.filter_index = MetadataFilterIndex(self.chunk_store, self.shard_by)
+        # Inverted index for the keyword fallback, built on first use
+        self.keyword_index = ChunkBM25Index(self.chunk_store)
+
+        # Initialize email metadata index (journaled, one record per email)
+        self._metadata_store = DiskStore(
+            Path(self._get_metadata_path()), journal=True
+        )
         self.email_metadata: Dict[str, Dict[str, Any]] = {}
         self.load_email_metadata()
 
+        # Recall/latency of the current ANN index, measured when it was built
+        self._index_stats_store = DiskStore(
+            Path(self.cache_dir) / f"{self.index_id}.stats.json"
+        )
+        try:
+            self.index_stats: Dict[str, Any] = self._index_stats_store.load()
+            self.index_stats.pop("schema_version", None)
+        except DiskStoreError as e:
+            logger.warning(f"Ignoring unreadable index stats: {e}")
+            self.index_stats = {}
+
+    def _load_embeddings(self) -> None:
+        """Create the embedding model, recording readiness and any error"""
+        self.readiness = "loading"
+        try:
+            logger.info(
+                f"Attempting to initialize embedding model: {self.embedding_model_name} "
+                f"({self.embedding_backend} backend)"
+            )
+            self.embeddings = create_embeddings(
+                self.embedding_backend,
+                self.embedding_model_name,
+                os.path.join(self.cache_dir, "models"),
+            )
+            if self.embedding_cache_size > 0:
+                # Unchanged chunks and repeated queries are served from disk
+                self.embedding_cache = EmbeddingCache(
+                    os.path.join(self.cache_dir, "embedding_cache"),
+                    cache_model_key(self.embedding_backend, self.embedding_model_name),
+                    max_entries=self.embedding_cache_size,
+                )
+                self.embeddings = CachedEmbeddings(
+                    self.embeddings, self.embedding_cache
+                )
+            self.vector_search_available = True
+            self.initialization_error_message = None
+            self.readiness = "ready"
+            logger.info(
+                f"Successfully initialized embedding model: {self.embedding_model_name}"
+            )
+        except OSError as e_os:
+            self.embeddings = None
+            self.vector_search_available = False
+            self.readiness = "failed"
+            error_code_info = (
+                f" (OS Error Code: {e_os.errno})"
+                if hasattr(e_os, "errno")
+                else ""
+            )
+            self.initialization_error_message = (
+                f"✗ Embedding model ('{self.embedding_model_name}') failed to load due to an OS error (likely out of memory): {str(e_os)}.{error_code_info} "
+                f"Try on a machine with more RAM (e.g., 16GB+) or use a lighter model like 'sentence-transformers/all-MiniLM-L6-v2'."
+            )
+            logger.error(
+                f"Failed to initialize embedding model '{self.embedding_model_name}' due to OSError: {e_os}",
+                exc_info=True,
+            )
+        except Exception as e:
+            self.embeddings = None
+            self.vector_search_available = False
+            self.readiness = "failed"
+            self.initialization_error_message = f"✗ Embedding model ('{self.embedding_model_name}') failed to load due to an unexpected error: {str(e)}."
+            logger.exception(
+                f"Failed to initialize embedding model '{self.embedding_model_name}': {e}"
+            )
+
+    def ensure_ready(self) -> bool:
+        """Load the embedding model and FAISS index if not done yet
+
+        Blocks while another thread (e.g. ``warm_up``) is loading them.
+
+        Returns:
+            bool: True if vector search can be used
+        """
+        if self.readiness == "pending" or (
+            self.embeddings is not None and not self._index_load_attempted
+        ):
+            with self._init_lock:
+                if self.readiness == "pending":
+                    self._load_embeddings()
+                if self.embeddings is not None and not self._index_load_attempted:
+                    self._index_load_attempted = True
+                    if self.active_db is None:
+                        self._load_index()
+        return self.vector_search_available and self.embeddings is not None
+
+    def warm_up(self) -> Optional[threading.Thread]:
+        """Start loading the model and index on a background daemon thread
+
+        Returns:
+            The warm-up thread, or None if there is nothing left to load
+        """
+        if self.readiness != "pending":
+            return None
+        with self._init_lock:
+            if self._warmup_thread is None:
+                self._warmup_thread = threading.Thread(
+                    target=self.ensure_ready, name="vector-db-warmup", daemon=True
+                )
+                self._warmup_thread.start()
+        return self._warmup_thread
+
     def _get_content_hash(self, content: str) -> str:
         """Generate content hash for deduplication and versioning"""
         return hashlib.md5(content.encode()).hexdigest()
 
     def _get_index_path(self) -> str:
-        """Get path to FAISS index file"""
-        return os.path.join(self.cache_dir, f"{self.index_id}.faiss")
+        """Get path to the current FAISS index generation"""
+        name = self._read_manifest().get("file") or f"{self.index_id}.faiss"
+        return os.path.join(self.cache_dir, name)
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            return self._manifest_store.load()
+        except DiskStoreError as e:
+            logger.error(f"Error reading index manifest: {e}")
+            return {}
+
+    def _save_index(self) -> None:
+        """Write the index as a new generation and publish it to readers
+
+        Called after the chunk store holds every row the index covers, so
+        a reader that sees the generation can resolve all of its ids.
+        """
+        generation = int(self._read_manifest().get("generation", 0)) + 1
+        name = None
+        if self.active_db is not None:
+            name = f"{self.index_id}.g{generation:06d}.faiss"
+            self.active_db.save(os.path.join(self.cache_dir, name))
+        self._manifest_store.save(
+            {
+                "generation": generation,
+                "file": name,
+                "ntotal": self.active_db.ntotal if self.active_db is not None else 0,
+                "chunk_rows": len(self.chunk_store),
+                "published_at": datetime.now().isoformat(),
+            }
+        )
+        self._index_generation = generation
+        self._remove_old_generations(generation)
+
+    def _remove_old_generations(self, current: int) -> None:
+        """Delete index files older than the previous generation
+
+        The previous one is kept for readers that are switching over;
+        POSIX readers keep mapped files even after they are unlinked.
+        """
+        pattern = re.compile(rf"^{re.escape(self.index_id)}(?:\.g(\d+))?\.faiss$")
+        for name in os.listdir(self.cache_dir):
+            match = pattern.match(name)
+            if not match or int(match.group(1) or 0) >= current - 1:
+                continue
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError as e:  # e.g. still mapped by a reader on Windows
+                logger.debug(f"Could not remove old index {name}: {e}")
+
+    def refresh_index(self) -> bool:
+        """Switch to a newer index generation published by another process
+
+        Returns:
+            bool: True if a newer generation was loaded
+        """
+        self._index_checked_at = time.monotonic()
+        if self.embeddings is None or not self._index_load_attempted:
+            return False
+        generation = int(self._read_manifest().get("generation", 0))
+        if generation <= self._index_generation:
+            return False
+        with self._write_lock:
+            if generation <= self._index_generation:
+                return False
+            self.chunk_store.refresh()
+            self.chunks, self.chunk_metadata = [], []
+            self.chunks_loaded = False
+            self.load_email_metadata()
+            self._load_index()
+        logger.info(f"Switched to index generation {self._index_generation}")
+        return True
+
+    def reload(self) -> None:
+        """Reopen the chunk store, email metadata and index from disk
+
+        Used after the files under ``cache_dir`` were replaced as a whole,
+        e.g. when a reindex swaps in its shadow copy.
+        """
+        with self._write_lock:
+            self.chunk_store = ChunkStore(self._get_chunks_dir())
+            self.filter_index = MetadataFilterIndex(self.chunk_store, self.shard_by)
+            self.keyword_index = ChunkBM25Index(self.chunk_store)
+            self.chunks, self.chunk_metadata = [], []
+            self.chunks_loaded = False
+            self.load_email_metadata()
+            if self.query_cache is not None:
+                self.query_cache.clear()
+            self.active_db = None
+            if self.embeddings is not None and self._index_load_attempted:
+                self._load_index()
+            else:
+                self._index_generation = int(self._read_manifest().get("generation", 0))
+            self.is_indexed = self.active_db is not None
+        logger.info(f"Reloaded vector DB from {self.cache_dir}")
 
     def _get_chunks_path(self) -> str:
-        """Get path to chunk data file"""
+        """Get path to the legacy single-file chunk data"""
         return os.path.join(self.cache_dir, f"{self.index_id}.chunks.json")
 
+    def _get_chunks_dir(self) -> str:
+        """Get path to the segmented chunk store directory"""
+        return os.path.join(self.cache_dir, f"{self.index_id}.chunks")
+
     def _get_metadata_path(self) -> str:
         """Get path to email metadata file"""
         return os.path.join(self.cache_dir, "email_metadata.json")
 
+    def _ensure_chunks_loaded(self) -> None:
+        """Materialize chunk text and metadata in memory"""
+        if not self.chunks_loaded:
+            self.chunks, self.chunk_metadata = self.chunk_store.load_all()
+            self.chunks_loaded = True
+
+    def _append_chunks(
+        self, chunks: List[str], chunk_metadata: List[Dict[str, Any]]
+    ) -> None:
+        """Persist new chunks and keep the in-memory copy in sync"""
+        self.chunk_store.append(chunks, chunk_metadata)
+        if self.chunks_loaded:
+            self.chunks.extend(chunks)
+            self.chunk_metadata.extend(chunk_metadata)
+
     def load_email_metadata(self) -> None:
         """Load email metadata from disk"""
-        metadata_path = self._get_metadata_path()
-        if os.path.exists(metadata_path):
-            try:
-                with open(metadata_path, "r", encoding="utf-8") as f:
-                    self.email_metadata = json.load(f)
+        try:
+            metadata = self._metadata_store.load()
+            metadata.pop("schema_version", None)
+            self.email_metadata = metadata
+            if self.email_metadata:
                 logger.info(
                     f"Loaded metadata for {len(self.email_metadata)} emails"
                 )
-            except Exception as e:
-                logger.error(f"Error loading email metadata: {e}")
-                self.email_metadata = {}
+        except DiskStoreError as e:
+            logger.error(f"Error loading email metadata: {e}")
+            self.email_metadata = {}
+
+    def _record_email_metadata(self, email_ids: List[str]) -> None:
+        """Journal the metadata of the given emails in a single write"""
+        try:
+            self._metadata_store.update_many(
+                {email_id: self.email_metadata[email_id] for email_id in email_ids}
+            )
+        except DiskStoreError as e:
+            logger.error(f"Error saving metadata for {len(email_ids)} emails: {e}")
 
     def save_email_metadata(self) -> None:
-        """Save email metadata to disk"""
-        metadata_path = self._get_metadata_path()
+        """Write all email metadata to disk as a compacted snapshot"""
         try:
-            with open(metadata_path, "w", encoding="utf-8") as f:
-                json.dump(self.email_metadata, f, indent=2)
+            self._metadata_store.save(dict(self.email_metadata))
             logger.info(
                 f"Saved metadata for {len(self.email_metadata)} emails"
             )
@@ -372,161 +649,552 @@ class EmailVectorDB:
         Returns:
             bool: True if email was added successfully
         """
-        # Calculate content hash for deduplication
-        content = f"Subject: {subject}\n\nFrom: {sender}\nTo: {recipient}\nDate: {date}\n\n{body}"
-        content_hash = self._get_content_hash(content)
+        results = self.add_emails(
+            [
+                {
+                    "email_id": email_id,
+                    "subject": subject,
+                    "sender": sender,
+                    "recipient": recipient,
+                    "body": body,
+                    "date": date,
+                    "tags": tags,
+                }
+            ],
+            force_reindex=force_reindex,
+        )
+        return results.get(email_id, False)
+
+    def add_emails(
+        self,
+        emails: Iterable[Dict[str, Any]],
+        force_reindex: bool = False,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, bool]:
+        """Add many emails to the vector database in one pass
+
+        All emails are split up front, identical chunk texts are embedded
+        once, embeddings are computed in batches and the index, chunk store
+        and email metadata are each written once for the whole call.
+
+        Args:
+            emails: Dicts with ``email_id`` (or ``id``), ``subject``,
+                ``sender``, ``recipient``, ``body``, ``date`` and optional
+                ``tags``
+            force_reindex: Whether to force reindexing even if emails exist
+            batch_size: Chunks per embedding call, defaults to
+                ``embedding_batch_size``
 
-        # Check if email already exists with same hash
-        if email_id in self.email_metadata and not force_reindex:
+        Returns:
+            Dict mapping each email ID to True if it is indexed
+        """
+        results: Dict[str, bool] = {}
+
+        # Skip unchanged emails; a later duplicate in the batch wins
+        pending: Dict[str, Dict[str, Any]] = {}
+        for email in emails:
+            email_id = email.get("email_id") or email.get("id")
+            if not email_id:
+                logger.warning("Skipping email without an ID")
+                continue
+            content = self._build_content(email)
+            content_hash = self._get_content_hash(content)
             if (
-                self.email_metadata[email_id].get("content_hash")
+                not force_reindex
+                and self.email_metadata.get(email_id, {}).get("content_hash")
                 == content_hash
             ):
-                logger.info(
-                    f"Email {email_id} already indexed with same content"
-                )
-                return True
-
-        # Store email metadata
-        self.email_metadata[email_id] = {
-            "subject": subject,
-            "sender": sender,
-            "recipient": recipient,
-            "date": date,
-            "content_hash": content_hash,
-            "tags": tags or [],
-            "indexed_at": datetime.now().isoformat(),
-            "chunk_count": 0,
-        }
+                logger.info(f"Email {email_id} already indexed with same content")
+                results[email_id] = True
+                continue
+            pending[email_id] = dict(
+                email, content=content, content_hash=content_hash
+            )
+
+        if not pending:
+            return results
 
+        # Chunks are sized with the embedding model's tokenizer once loaded
+        self.ensure_ready()
+        self.text_splitter.counter.bind(self.embeddings)
         try:
-            # Split the content into chunks
-            if LANGCHAIN_AVAILABLE:
-                chunks = self.text_splitter.split_text(content)
-            else:
-                chunks = self.text_splitter.split_text(content)
+            split = self.text_splitter.split_many(
+                [email["content"] for email in pending.values()]
+            )
+        except Exception as e:
+            logger.error(f"Error splitting {len(pending)} emails: {e}")
+            results.update(dict.fromkeys(pending, False))
+            return results
+
+        all_chunks: List[str] = []
+        all_metadata: List[Dict[str, Any]] = []
+        new_metadata: Dict[str, Dict[str, Any]] = {}
+        for (email_id, email), chunks in zip(pending.items(), split):
 
             if not chunks:
                 logger.warning(f"No chunks generated for email {email_id}")
-                return False
+                results[email_id] = False
+                continue
 
-            # Create metadata for each chunk
-            chunk_metadata = []
+            tags = list(email.get("tags") or [])
             for i, chunk in enumerate(chunks):
-                chunk_metadata.append(
+                all_chunks.append(chunk)
+                all_metadata.append(
                     {
                         "email_id": email_id,
                         "chunk_index": i,
-                        "subject": subject,
-                        "sender": sender,
-                        "date": date,
-                        "tags": tags or [],
+                        "subject": email.get("subject", ""),
+                        "sender": email.get("sender", ""),
+                        "date": email.get("date", ""),
+                        "tags": tags,
                     }
                 )
 
-            # Update email metadata with chunk count
-            self.email_metadata[email_id]["chunk_count"] = len(chunks)
-
-            # Add to existing index if it exists, otherwise create new one
-            if self.active_db is not None:
-                # Add new chunks to existing vector DB
-                self.active_db.add_texts(chunks, metadatas=chunk_metadata)
-                logger.info(
-                    f"Added {len(chunks)} chunks for email {email_id} to existing index"
+            new_metadata[email_id] = {
+                "subject": email.get("subject", ""),
+                "sender": email.get("sender", ""),
+                "recipient": email.get("recipient", ""),
+                "date": email.get("date", ""),
+                "content_hash": email["content_hash"],
+                "tags": tags,
+                "indexed_at": datetime.now().isoformat(),
+                "chunk_count": len(chunks),
+            }
+
+        if not all_chunks:
+            return results
+
+        with self._write_lock:
+            # Chunks of earlier versions are replaced, not left as duplicates
+            replaced = [
+                email_id for email_id in new_metadata if email_id in self.email_metadata
+            ]
+            self._delete_rows(self._rows_for_emails(replaced))
+            try:
+                self._index_chunks(all_chunks, all_metadata, batch_size)
+            except Exception as e:
+                logger.error(
+                    f"Error adding {len(new_metadata)} emails to vector DB: {e}"
                 )
+                traceback.print_exc()
+                # Their old chunks are gone, so a retry must index them again
+                self._forget_emails(replaced)
+                results.update(dict.fromkeys(new_metadata, False))
+                return results
+
+        self.email_metadata.update(new_metadata)
+        self._record_email_metadata(list(new_metadata))
+        results.update(dict.fromkeys(new_metadata, True))
+        logger.info(
+            f"Indexed {len(new_metadata)} emails as {len(all_chunks)} chunks"
+        )
+        return results
+
+    def upsert_email(
+        self,
+        email_id: str,
+        subject: str,
+        sender: str,
+        recipient: str,
+        body: str,
+        date: str,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """Index an email, replacing the chunks of any earlier version
+
+        Unchanged emails are left as they are.
+
+        Returns:
+            bool: True if the email is indexed
+        """
+        return self.add_email(
+            email_id, subject, sender, recipient, body, date, tags=tags
+        )
+
+    def remove_email(self, email_id: str) -> bool:
+        """Remove an email and its chunks from the vector database
+
+        Args:
+            email_id: ID of the email to remove
+
+        Returns:
+            bool: True if the email was indexed
+        """
+        return self.remove_emails([email_id]).get(email_id, False)
+
+    def remove_emails(self, email_ids: Iterable[str]) -> Dict[str, bool]:
+        """Remove several emails and their chunks in one pass
+
+        Chunks are tombstoned right away, so searches stop returning them;
+        the FAISS index shrinks at the next compaction.
+
+        Args:
+            email_ids: IDs of the emails to remove
+
+        Returns:
+            Dict mapping each email ID to True if it was indexed
+        """
+        email_ids = list(dict.fromkeys(email_ids))
+        with self._write_lock:
+            rows = self._rows_for_emails(email_ids)
+            removed = [
+                email_id for email_id in email_ids if email_id in self.email_metadata
+            ]
+            self._forget_emails(removed)
+            self._delete_rows(rows)
+        if removed:
+            logger.info(f"Removed {len(removed)} emails ({len(rows)} chunks)")
+        return {email_id: email_id in removed for email_id in email_ids}
+
+    def _forget_emails(self, email_ids: List[str]) -> None:
+        """Drop the metadata of the given emails, in memory and on disk"""
+        for email_id in email_ids:
+            self.email_metadata.pop(email_id, None)
+        try:
+            self._metadata_store.delete_many(email_ids)
+        except DiskStoreError as e:
+            logger.error(f"Error removing metadata for {len(email_ids)} emails: {e}")
+
+    def _rows_for_emails(self, email_ids: Iterable[str]) -> List[int]:
+        """Return the live chunk row ids of the given emails"""
+        rows: List[int] = []
+        for email_id in email_ids:
+            rows.extend(self.filter_index.rows_for("email_id", email_id))
+        return rows
+
+    def _delete_rows(self, rows: List[int]) -> None:
+        """Tombstone chunk rows and compact once enough of the store is dead"""
+        if not self.chunk_store.delete(rows):
+            return
+        if self.chunks_loaded:
+            self.chunks, self.chunk_metadata = [], []
+            self.chunks_loaded = False
+        total = len(self.chunk_store)
+        dead = len(self.chunk_store.deleted)
+        if self.compact_dead_fraction > 0 and dead >= total * self.compact_dead_fraction:
+            self.compact()
+
+    def compact(self) -> bool:
+        """Rebuild the FAISS index and chunk store from live chunks only
+
+        Vectors are copied out of the current index when it is aligned with
+        the chunk store, otherwise the live chunks are embedded again (mostly
+        from the embedding cache).
+
+        Returns:
+            bool: True if deleted chunks were dropped
+        """
+        with self._write_lock:
+            dead = len(self.chunk_store.deleted)
+            if not dead:
+                return False
+            rows: List[int] = []
+            chunks: List[str] = []
+            chunk_metadata: List[Dict[str, Any]] = []
+            for row_id, text, meta in self.chunk_store.iter_rows():
+                rows.append(row_id)
+                chunks.append(text)
+                chunk_metadata.append(meta)
+
+            if self.embeddings is not None and self.active_db is None:
+                self._load_index()
+            if self.embeddings is None or self.active_db is None or not chunks:
+                # No vectors to keep in step; rewrite the chunk store alone
+                self.chunk_store.clear()
+                self.chunk_store.append(chunks, chunk_metadata)
+                if not chunks and self.active_db is not None:
+                    self.active_db = None
+                    self.is_indexed = False
+                    self._save_index()
             else:
-                # Check if index exists on disk
-                index_path = self._get_index_path()
-                chunks_path = self._get_chunks_path()
-
-                if os.path.exists(index_path) and os.path.exists(chunks_path):
-                    # Load existing index
-                    if self.embeddings is not None:
-                        try:
-                            self.active_db = FAISS.load_local(
-                                self.cache_dir,
-                                self.embeddings,
-                                index_name=self.index_id,
-                                allow_dangerous_deserialization=True,
-                            )
-                            logger.info(
-                                f"Loaded existing FAISS index from {index_path}"
-                            )
-
-                            # Load existing chunks metadata
-                            with open(chunks_path, "r", encoding="utf-8") as f:
-                                existing_metadata = json.load(f)
-                                self.chunks = existing_metadata.get(
-                                    "chunks", []
-                                )
-                                self.chunk_metadata = existing_metadata.get(
-                                    "metadata", []
-                                )
-
-                            # Add new chunks to existing vector DB
-                            self.active_db.add_texts(
-                                chunks, metadatas=chunk_metadata
-                            )
-
-                            # Update chunks metadata
-                            self.chunks.extend(chunks)
-                            self.chunk_metadata.extend(chunk_metadata)
-
-                            # Save updated chunks metadata
-                            with open(chunks_path, "w", encoding="utf-8") as f:
-                                json.dump(
-                                    {
-                                        "chunks": self.chunks,
-                                        "metadata": self.chunk_metadata,
-                                    },
-                                    f,
-                                    indent=2,
-                                )
-
-                            logger.info(
-                                f"Added {len(chunks)} chunks to existing index, total chunks: {len(self.chunks)}"
-                            )
-
-                        except Exception as e:
-                            logger.error(f"Error loading existing index: {e}")
-                            traceback.print_exc()
-
-                            # Create new index from scratch
-                            self._create_new_index(chunks, chunk_metadata)
-                    else:
-                        logger.warning(
-                            "Embeddings not available, using fallback keyword storage"
-                        )
-                        # Save just the chunks without vector index
-                        self._store_chunks_without_vectors(
-                            chunks, chunk_metadata
-                        )
-                else:
-                    # Create new index
-                    if self.embeddings is not None:
-                        self._create_new_index(chunks, chunk_metadata)
-                    else:
-                        logger.warning(
-                            "Embeddings not available, using fallback keyword storage"
-                        )
-                        # Save just the chunks without vector index
-                        self._store_chunks_without_vectors(
-                            chunks, chunk_metadata
-                        )
-
-            # Save updated metadata
-            self.save_email_metadata()
-            return True
+                epoch = self.chunk_store.epoch
+                self._create_new_index(
+                    chunks, chunk_metadata, self._live_vectors(rows, chunks)
+                )
+                if self.chunk_store.epoch == epoch:
+                    logger.error("Compaction failed; keeping deleted chunks")
+                    return False
+
+            self.chunks, self.chunk_metadata = chunks, chunk_metadata
+            self.chunks_loaded = True
+        logger.info(f"Compacted vector DB: dropped {dead} deleted chunks, {len(chunks)} remain")
+        return True
+
+    def _live_vectors(
+        self, rows: List[int], chunks: List[str]
+    ) -> List[List[float]]:
+        """Vectors for the given live rows, reusing the index when aligned"""
+        index = getattr(self.active_db, "index", None)
+        if index is not None and index.ntotal == len(self.chunk_store):
+            try:
+                return [index.reconstruct(row).tolist() for row in rows]
+            except Exception as e:
+                logger.warning(f"Cannot read vectors back from the index: {e}")
+        return self._embed_chunks(chunks)
+
+    @staticmethod
+    def _build_content(email: Dict[str, Any]) -> str:
+        """Build the indexed text of an email"""
+        return (
+            f"Subject: {email.get('subject', '')}\n\n"
+            f"From: {email.get('sender', '')}\n"
+            f"To: {email.get('recipient', '')}\n"
+            f"Date: {email.get('date', '')}\n\n"
+            f"{email.get('body', '')}"
+        )
 
+    def _embed_chunks(
+        self, chunks: List[str], batch_size: Optional[int] = None
+    ) -> List[List[float]]:
+        """Embed chunks in batches, computing each distinct text only once
+
+        Args:
+            chunks: Chunk texts, possibly containing duplicates
+            batch_size: Texts per ``embed_documents`` call
+
+        Returns:
+            One embedding per input chunk, in order
+        """
+        size = max(1, batch_size or self.embedding_batch_size)
+        unique: Dict[str, str] = {}
+        for chunk in chunks:
+            unique.setdefault(self._get_content_hash(chunk), chunk)
+
+        hashes = list(unique)
+        vectors: Dict[str, List[float]] = {}
+        for start in range(0, len(hashes), size):
+            batch = hashes[start : start + size]
+            embedded = self.embeddings.embed_documents([unique[h] for h in batch])
+            vectors.update(zip(batch, embedded))
+
+        if len(hashes) < len(chunks):
+            logger.debug(
+                f"Embedded {len(hashes)} distinct texts for {len(chunks)} chunks"
+            )
+        return [vectors[self._get_content_hash(chunk)] for chunk in chunks]
+
+    def _load_index(self) -> None:
+        """Load the FAISS index from disk into ``active_db`` if present"""
+        manifest = self._read_manifest()
+        self._index_generation = int(manifest.get("generation", 0))
+        index_path = self._get_index_path()
+        if not (os.path.exists(index_path) and len(self.chunk_store) > 0):
+            self.active_db = None
+            return
+        try:
+            self.active_db = FaissChunkIndex.load(
+                index_path, self.chunk_store, self.embeddings, mmap=self.mmap_index
+            )
+            ann.configure_search(
+                self.active_db.index, self.hnsw_ef_search, self.ivf_nprobe
+            )
+            logger.info(f"Loaded existing FAISS index from {index_path}")
         except Exception as e:
-            logger.error(f"Error adding email {email_id} to vector DB: {e}")
+            logger.error(f"Error loading existing index: {e}")
             traceback.print_exc()
+            return
+
+        docstore_path = legacy_docstore_path(index_path)
+        if docstore_path:
+            # The chunk store already holds everything the pickle did
+            os.remove(docstore_path)
+            logger.info(f"Removed legacy pickled docstore {docstore_path}")
+
+        # Rows appended after the last published generation are not indexed yet
+        expected_rows = manifest.get("chunk_rows", len(self.chunk_store))
+        if self.active_db.ntotal != expected_rows:
+            # Vector ids no longer address chunk rows; rebuild from the store
+            logger.warning(
+                f"FAISS index has {self.active_db.ntotal} vectors for "
+                f"{len(self.chunk_store)} chunks, rebuilding it"
+            )
+            self.active_db = None
+            self._rebuild_index()
+
+    def _index_chunks(
+        self,
+        chunks: List[str],
+        chunk_metadata: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+    ) -> None:
+        """Embed chunks and persist them with a single index write"""
+        if self.embeddings is None:
+            logger.warning(
+                "Embeddings not available, using fallback keyword storage"
+            )
+            # Save just the chunks without vector index
+            self._store_chunks_without_vectors(chunks, chunk_metadata)
+            return
+
+        embeddings = self._embed_chunks(chunks, batch_size)
+
+        if self.active_db is None:
+            self._load_index()
+
+        else:
+            self.refresh_index()
+
+        if self.active_db is not None and self.active_db.ntotal != len(self.chunk_store):
+            # Chunks were appended without publishing their vectors (crash)
+            logger.warning("FAISS index is behind the chunk store, rebuilding it")
+            self.active_db = None
+
+        if self.active_db is None:
+            self._rebuild_index(chunks, chunk_metadata, embeddings, batch_size)
+            return
+
+        if self.active_db.read_only:
+            # Mapped pages can't grow; take a private copy to write to
+            self.active_db = FaissChunkIndex.load(
+                self._get_index_path(), self.chunk_store, self.embeddings
+            )
+            ann.configure_search(
+                self.active_db.index, self.hnsw_ef_search, self.ivf_nprobe
+            )
+        self.active_db.add_vectors(embeddings)
+        self._maybe_promote_index()
+        self._append_chunks(chunks, chunk_metadata)
+        self._save_index()
+        logger.info(
+            f"Added {len(chunks)} chunks to existing index, total chunks: {len(self.chunk_store)}"
+        )
+
+    def _rebuild_index(
+        self,
+        chunks: Sequence[str] = (),
+        chunk_metadata: Sequence[Dict[str, Any]] = (),
+        embeddings: Sequence[List[float]] = (),
+        batch_size: Optional[int] = None,
+    ) -> None:
+        """Create the index from the live stored chunks plus the given ones
+
+        Chunks stored without vectors (keyword-only mode, or a lost index
+        file) are embedded again, mostly from the embedding cache.
+        """
+        stored = list(self.chunk_store.iter_rows())
+        all_chunks = [text for _, text, _ in stored] + list(chunks)
+        if not all_chunks:
+            return
+        self._create_new_index(
+            all_chunks,
+            [meta for _, _, meta in stored] + list(chunk_metadata),
+            self._embed_chunks([text for _, text, _ in stored], batch_size)
+            + list(embeddings),
+        )
+
+    def _maybe_promote_index(
+        self, vectors: Optional[Sequence[List[float]]] = None
+    ) -> bool:
+        """Rebuild the FAISS index as the type the index policy asks for
+
+        With ``auto`` the index only moves up (flat, HNSW, IVF-PQ) as it
+        grows; an explicitly configured type is always enforced. The new
+        index is evaluated against exact search on a sample of queries and
+        the result kept in ``index_stats``. Under ``auto`` a new index whose
+        recall is below ``min_index_recall`` is discarded, and the same
+        promotion is not tried again until the index has grown by half.
+        The caller saves the index.
+
+        Args:
+            vectors: All vectors of the index in row order, if at hand
+
+        Returns:
+            bool: True if the index was rebuilt
+        """
+        index = getattr(self.active_db, "index", None)
+        if index is None or index.ntotal == 0:
+            return False
+        current = ann.index_type_of(index)
+        target = ann.choose_index_type(
+            index.ntotal, self.index_type, self.hnsw_min_chunks, self.ivfpq_min_chunks
+        )
+        if target == "ivfpq" and not ann.ivfpq_trainable(index.ntotal, index.d):
+            target = "hnsw"
+        if target == current or (
+            self.index_type == "auto" and not ann.is_promotion(current, target)
+        ):
+            return False
+        if self.index_type == "auto" and self._rejected_promotion is not None:
+            rejected_type, rejected_size = self._rejected_promotion
+            if rejected_type == target and index.ntotal < rejected_size * 1.5:
+                return False
+
+        try:
+            if vectors is None or len(vectors) != index.ntotal:
+                vectors = self._all_index_vectors(index)
+            started = time.perf_counter()
+            new_index = ann.build_index(
+                vectors, target, self.hnsw_ef_search, self.ivf_nprobe
+            )
+            build_seconds = time.perf_counter() - started
+            stats = ann.evaluate_index(new_index, vectors)
+        except Exception as e:
+            logger.error(f"Could not build {target} index: {e}")
+            return False
+
+        if self.index_type == "auto" and stats["recall_at_k"] < self.min_index_recall:
+            self._rejected_promotion = (target, index.ntotal)
+            logger.warning(
+                f"Keeping the {current} index: {target} reached recall@{stats['k']} "
+                f"{stats['recall_at_k']}, below {self.min_index_recall}"
+            )
             return False
+        self._rejected_promotion = None
+
+        self.active_db.index = new_index
+        self.active_db.read_only = False
+        stats.update(
+            build_seconds=round(build_seconds, 2),
+            built_at=datetime.now().isoformat(),
+        )
+        self.index_stats = stats
+        try:
+            self._index_stats_store.save(stats)
+        except DiskStoreError as e:
+            logger.warning(f"Could not save index stats: {e}")
+        logger.info(
+            f"Rebuilt {current} index as {target} over {index.ntotal} chunks "
+            f"(recall@{stats['k']} {stats['recall_at_k']}, {stats['latency_ms']} ms/query)"
+        )
+        return True
+
+    def _all_index_vectors(self, index: Any) -> Any:
+        """Every vector of ``index`` in row order, embedding again if needed"""
+        try:
+            return ann.index_vectors(index)
+        except Exception as e:
+            if index.ntotal != len(self.chunk_store):
+                raise
+            logger.info(f"Re-embedding chunks, index vectors unreadable: {e}")
+            records = self.chunk_store.get_many(range(len(self.chunk_store)))
+            return self._embed_chunks([text for text, _ in records])
+
+    def _ann_status(self) -> Dict[str, Any]:
+        """Index type, query parameters and measured recall/latency"""
+        index = getattr(self.active_db, "index", None)
+        size = index.ntotal if index is not None else len(self.chunk_store)
+        current = ann.index_type_of(index) if index is not None else None
+        return {
+            "type": current,
+            "configured": self.index_type,
+            "target": ann.choose_index_type(
+                size, self.index_type, self.hnsw_min_chunks, self.ivfpq_min_chunks
+            ),
+            "params": ann.search_params(index),
+            "evaluation": (
+                self.index_stats
+                if self.index_stats.get("type") == current
+                else None
+            ),
+        }
 
     def _create_new_index(
-        self, chunks: List[str], chunk_metadata: List[Dict[str, Any]]
+        self,
+        chunks: List[str],
+        chunk_metadata: List[Dict[str, Any]],
+        embeddings: Optional[List[List[float]]] = None,
     ) -> None:
-        create_new_index(self, chunks, chunk_metadata)
+        create_new_index(self, chunks, chunk_metadata, embeddings)
 
     def _store_chunks_without_vectors(
         self, chunks: List[str], chunk_metadata: List[Dict[str, Any]]
@@ -538,8 +1206,144 @@ class EmailVectorDB:
         query: str,
         num_results: int = 5,
         filters: Optional[Dict[str, Any]] = None,
+        mode: str = "vector",
+    ) -> List[Dict[str, Any]]:
+        """Search indexed chunks
+
+        Args:
+            query: Search text
+            num_results: Maximum number of results
+            filters: Metadata filters, see ``_matches_filters``
+            mode: ``vector`` returns vector hits and uses keyword search only
+                when there are none; ``hybrid`` runs both concurrently and
+                fuses the rankings (``HYBRID_FUSION``, ``HYBRID_DENSE_WEIGHT``)
+
+        Returns:
+            List of result dicts with content, metadata, similarity and search_type
+        """
+        return self._search_cached([query], num_results, filters, mode)[0]
+
+    def search_many(
+        self,
+        queries: Sequence[str],
+        num_results: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        mode: str = "vector",
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for several queries at once
+
+        All queries are embedded in one model call and sent to FAISS in one
+        search, so a multi-intent request costs about one query's latency.
+
+        Args:
+            queries: Search texts
+            num_results: Maximum number of results per query
+            filters: Metadata filters applied to every query
+            mode: ``vector`` or ``hybrid``, as for ``search``
+
+        Returns:
+            One result list per query, in the order of ``queries``
+        """
+        return self._search_cached(list(queries), num_results, filters, mode)
+
+    def search_emails(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        mode: str = "vector",
+        scoring: str = VECTOR_EMAIL_SCORING,
+        min_similarity: float = 0.0,
     ) -> List[Dict[str, Any]]:
-        return vector_search(self, query, num_results, filters)
+        """Search and return matching emails rather than chunks
+
+        Chunks are over-fetched until ``limit`` distinct emails are found,
+        so long emails with many matching chunks don't crowd out others.
+
+        Args:
+            query: Search text
+            limit: Maximum number of emails
+            filters: Metadata filters, see ``_matches_filters``
+            mode: ``vector`` or ``hybrid``, as for ``search``
+            scoring: ``max`` ranks an email by its best chunk, ``sum_top``
+                by the sum of its best three
+            min_similarity: Emails whose best chunk scores lower are left
+                out before ``limit`` is applied
+
+        Returns:
+            Email results with email_id, score, similarity, snippet (the
+            best-matching chunk), metadata and matched_chunks
+        """
+        return self.search_emails_many(
+            [query], limit, filters, mode, scoring, min_similarity
+        )[0]
+
+    def search_emails_many(
+        self,
+        queries: Sequence[str],
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        mode: str = "vector",
+        scoring: str = VECTOR_EMAIL_SCORING,
+        min_similarity: float = 0.0,
+    ) -> List[List[Dict[str, Any]]]:
+        """Run ``search_emails`` for several queries with batched searches"""
+        return search_emails_many(
+            self, list(queries), limit, filters, mode, scoring, min_similarity
+        )
+
+    def _search_generation(self) -> tuple:
+        """Changes whenever cached search results may be stale"""
+        return (self.chunk_store.generation, self._index_generation, id(self.active_db))
+
+    def _search_cached(
+        self,
+        queries: List[str],
+        num_results: int,
+        filters: Optional[Dict[str, Any]],
+        mode: str,
+    ) -> List[List[Dict[str, Any]]]:
+        """Serve queries from the result cache and search the others"""
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        self.ensure_ready()
+        if time.monotonic() - self._index_checked_at >= INDEX_REFRESH_INTERVAL:
+            self.refresh_index()
+
+        generation = self._search_generation()
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(queries)
+        keys: List[tuple] = []
+        if self.query_cache is not None:
+            keys = [QueryCache.key(q, num_results, filters, mode) for q in queries]
+            results = [self.query_cache.get(key, generation) for key in keys]
+        missing = [i for i, cached in enumerate(results) if cached is None]
+
+        if len(missing) == 1:
+            query = queries[missing[0]]
+            if mode == "hybrid":
+                found = [
+                    hybrid_search(
+                        self, query, num_results, filters, HYBRID_FUSION, HYBRID_DENSE_WEIGHT
+                    )
+                ]
+            else:
+                found = [vector_search(self, query, num_results, filters)]
+        elif missing:
+            batch = [queries[i] for i in missing]
+            if mode == "hybrid":
+                found = hybrid_search_many(
+                    self, batch, num_results, filters, HYBRID_FUSION, HYBRID_DENSE_WEIGHT
+                )
+            else:
+                found = vector_search_many(self, batch, num_results, filters)
+        else:
+            found = []
+
+        for i, query_results in zip(missing, found):
+            results[i] = query_results
+            if self.query_cache is not None:
+                self.query_cache.put(keys[i], generation, query_results)
+        return results  # type: ignore[return-value]
 
     def _keyword_search(
         self,
@@ -562,7 +1366,9 @@ class EmailVectorDB:
             bool: True if metadata matches all filters
         """
         for key, value in filters.items():
-            if key not in metadata:
+            # date_range is checked against the chunk's "date" field
+            field = "date" if key == "date_range" else key
+            if field not in metadata:
                 return False
 
             # Handle different filter types
@@ -576,15 +1382,18 @@ class EmailVectorDB:
                     return False
             elif key == "date_range":
                 # Date range filter (expects [start_date, end_date])
+                # Naive dates are taken as UTC, as in the time shards; if
+                # date parsing fails, skip this filter
                 try:
                     if len(value) == 2:
-                        email_date = datetime.fromisoformat(metadata["date"])
-                        start_date = datetime.fromisoformat(value[0])
-                        end_date = datetime.fromisoformat(value[1])
-                        if not (start_date <= email_date <= end_date):
+                        email_date = parse_date(metadata["date"])
+                        start_date = parse_date(value[0])
+                        end_date = parse_date(value[1])
+                        if None not in (email_date, start_date, end_date) and not (
+                            start_date <= email_date <= end_date
+                        ):
                             return False
-                except (ValueError, TypeError):
-                    # If date parsing fails, skip this filter
+                except TypeError:
                     pass
             else:
                 # Default exact match for other fields
@@ -615,28 +1424,45 @@ class EmailVectorDB:
     def get_status(self) -> Dict[str, Any]:
         """Get current status of the vector DB
 
+        Never blocks on model loading; ``readiness`` reports its progress.
+
         Returns:
             Dict with status information
         """
         return {
             "vector_search_available": VECTOR_LIBS_AVAILABLE
-            and self.embeddings is not None,
+            and self.vector_search_available,
+            "readiness": self.readiness,
+            "initialization_error": self.initialization_error_message,
             "gpu_acceleration": (
                 GPU_AVAILABLE if "GPU_AVAILABLE" in globals() else False
             ),
-            "fallback_search_available": len(self.chunks) > 0,
+            "fallback_search_available": self.chunk_store.live_count() > 0,
             "embedding_model": (
-                self.embedding_model_name if self.embeddings else None
+                self.embedding_model_name
+                if self.vector_search_available
+                else None
             ),
+            "embedding_backend": self.embedding_backend,
             "indexed_emails": len(self.email_metadata),
-            "total_chunks": len(self.chunks),
+            "total_chunks": self.chunk_store.live_count(),
+            "deleted_chunks": len(self.chunk_store.deleted),
+            "ann_index": self._ann_status(),
+            "embedding_cache": (
+                self.embedding_cache.stats() if self.embedding_cache else None
+            ),
             "index_path": self._get_index_path(),
+            "index_generation": self._index_generation,
+            "index_mmap": bool(getattr(self.active_db, "read_only", False)),
+            "query_cache": self.query_cache.stats() if self.query_cache else None,
+            "time_shards": self.filter_index.shard_stats(),
+            "filter_columns": self.filter_index.column_stats(),
             "cache_dir": self.cache_dir,
         }
 
 
-# Create a singleton instance for easy import
-vector_db = EmailVectorDB()
+# Create a singleton instance for easy import; the model loads on first use
+vector_db = EmailVectorDB(lazy=VECTOR_LAZY_INIT)
 
 
 def test_email_vector_db():
@@ -687,55 +1513,40 @@ This should be indexed and retrievable by semantic or keyword search.""",
     logger.info("Vector DB Status:\n%s", json.dumps(status, indent=2))
 
 
-def reindex_all_emails():
-    """Rebuild the FAISS index from scratch using all emails in memory."""
+def reindex_all_emails(
+    resume: bool = False, batch_size: int = VECTOR_REINDEX_BATCH_SIZE
+) -> bool:
+    """Rebuild the vector index from all emails in memory.
+
+    The new index is built next to the live one and swapped in when it is
+    complete, so searches keep working meanwhile. Progress is checkpointed
+    every ``batch_size`` emails; ``resume`` continues an interrupted run.
+    """
     from gmail_chatbot.email_memory_vector import vector_memory
 
     logger.info("Starting complete vector reindexing...")
-
-    # Check if vector index file exists and delete it
-    index_path = vector_db._get_index_path()
-    if os.path.exists(index_path):
-        try:
-            os.remove(index_path)
-            logger.info(f"Deleted existing index file: {index_path}")
-        except Exception as e:
-            logger.error(f"Error deleting index file: {e}")
-            return False
-
-    # Get all email IDs from memory
-    email_ids = vector_memory.get_all_email_ids()
-    logger.info(f"Found {len(email_ids)} emails to reindex")
-
-    # Reset the vector indexed emails tracking
-    vector_memory.vector_indexed_emails = set()
-
-    # Process all emails in batches
-    batch_size = 100
-    total_processed = 0
-    total_indexed = 0
-
-    for i in range(0, len(email_ids), batch_size):
-        batch = email_ids[i : i + batch_size]
-        logger.info(
-            f"Processing batch {i//batch_size + 1} ({len(batch)} emails)"
-        )
-
-        result = vector_memory.batch_process_historical_emails(
-            limit=len(batch)
+    reindexer = Reindexer(vector_db, batch_size=batch_size)
+    try:
+        report = reindexer.run(
+            vector_memory.get_all_email_ids,
+            vector_memory.vector_records,
+            resume=resume,
         )
-
-        total_processed += result.get("processed", 0)
-        total_indexed += result.get("indexed", 0)
-
-        logger.info(
-            f"Batch result: {result.get('indexed')} indexed, {result.get('errors')} errors"
+    except Exception as e:
+        logger.error(
+            f"Reindexing stopped: {e}; continue with --reindex --resume"
         )
+        traceback.print_exc()
+        return False
 
+    # The swapped-in index holds exactly the emails that were reindexed
+    with vector_memory._indexed_lock:
+        vector_memory.vector_indexed_emails = set(vector_db.email_metadata)
+    vector_memory._save_indexed_emails()
     logger.info(
-        f"Reindexing complete: {total_indexed}/{total_processed} emails indexed"
+        f"Reindexing complete: {report['indexed']}/{report['total']} emails indexed"
     )
-    return True
+    return report["failed"] == 0
 
 
 if __name__ == "__main__":
@@ -746,6 +1557,17 @@ if __name__ == "__main__":
         action="store_true",
         help="Rebuild the vector index from scratch",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="With --reindex, continue an interrupted reindex",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=VECTOR_REINDEX_BATCH_SIZE,
+        help="With --reindex, emails indexed between checkpoints",
+    )
     parser.add_argument(
         "--test",
         action="store_true",
@@ -762,7 +1584,7 @@ if __name__ == "__main__":
         logger.info(f"GPU acceleration: {status['gpu_acceleration']}")
 
     if args.reindex:
-        reindex_all_emails()
+        reindex_all_emails(resume=args.resume, batch_size=args.batch_size)
     elif args.test:
         test_email_vector_db()
     else:
@@ -773,6 +1595,9 @@ if __name__ == "__main__":
         logger.info(
             "\nTo rebuild the index: python -m gmail_chatbot.email_vector_db --reindex"
         )
+        logger.info(
+            "To continue an interrupted rebuild: python -m gmail_chatbot.email_vector_db --reindex --resume"
+        )
         logger.info(
             "To run tests: python -m gmail_chatbot.email_vector_db --test"
         )
@@ -1,17 +1,17 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 import logging
 import time
 import random # Added for jitter in retry logic
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Iterable, Optional, Union
 from datetime import datetime
 
 # Import the memory models and disk store
 from gmail_chatbot.memory_models import MemoryEntry, MemoryKind, MemorySource
 from gmail_chatbot.disk_store import DiskStore, DiskStoreError
+from gmail_chatbot.vector_db.bm25 import BM25Index
 
 # Import constants
 
@@ -39,12 +39,19 @@ class EnhancedMemoryStore:
     - Backward compatibility with legacy memory formats
     """
     
-    def __init__(self, memory_path: Optional[Path] = None, schema_version: int = 1):
+    # Store names accepted by ``journal_stores``
+    STORE_NAMES = ("client", "email", "interaction", "preferences", "memory_entries")
+    
+    def __init__(self, memory_path: Optional[Path] = None, schema_version: int = 1,
+                 journal_stores: Optional[Iterable[str]] = None):
         """Initialize enhanced memory store with vector-first approach.
         
         Args:
             memory_path: Path to the memory directory
             schema_version: Schema version for memory files
+            journal_stores: Names of stores (see ``STORE_NAMES``) that should
+                write appends/updates to a write-ahead log instead of
+                rewriting the whole JSON file
         """
         # Set up memory paths
         self.memory_path = memory_path or Path(__file__).parent / "data" / "memory"
@@ -60,12 +67,18 @@ class EnhancedMemoryStore:
         # Schema version for serialization
         self.schema_version = schema_version
         
+        # Stores that opt in to the append-only journal backend
+        self.journal_stores = set(journal_stores or ())
+        unknown = self.journal_stores - set(self.STORE_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown memory store name(s): {', '.join(sorted(unknown))}")
+        
         # Create DiskStore instances for each memory file
-        self.client_store = DiskStore(self.client_memory_path, schema_version=schema_version)
-        self.email_store = DiskStore(self.email_memory_path, schema_version=schema_version)
-        self.interaction_store = DiskStore(self.interaction_memory_path, schema_version=schema_version)
-        self.preferences_store = DiskStore(self.preferences_path, schema_version=schema_version)
-        self.memory_entries_store = DiskStore(self.memory_entries_path, schema_version=schema_version)
+        self.client_store = self._make_store("client", self.client_memory_path)
+        self.email_store = self._make_store("email", self.email_memory_path)
+        self.interaction_store = self._make_store("interaction", self.interaction_memory_path)
+        self.preferences_store = self._make_store("preferences", self.preferences_path)
+        self.memory_entries_store = self._make_store("memory_entries", self.memory_entries_path)
         
         # Initialize memory stores
         self.client_memory = self._load_client_memory()
@@ -77,6 +90,9 @@ class EnhancedMemoryStore:
         # Initialize vector database tracking
         self.indexed_entries = {}
         
+        # Per-kind BM25 indexes for keyword search: kind -> (index, entries indexed)
+        self._keyword_indexes: Dict[str, Any] = {}
+        
         # Check vector database availability
         self.vector_search_available = VECTOR_LIBS_AVAILABLE and vector_db is not None
         if self.vector_search_available:
@@ -84,6 +100,11 @@ class EnhancedMemoryStore:
         else:
             logger.warning("Vector search is not available, falling back to keyword search")
     
+    def _make_store(self, name: str, path: Path) -> DiskStore:
+        """Create the DiskStore for ``name``, journaled if requested."""
+        return DiskStore(path, schema_version=self.schema_version,
+                         journal=name in self.journal_stores)
+    
     def _load_preferences(self) -> List[Dict[str, Any]]:
         """Load preferences from file with thread-safe operations."""
         try:
@@ -160,11 +181,8 @@ class EnhancedMemoryStore:
                         # Use a more aggressive locking approach for fallback
                         self.email_store._acquire_lock()
                         try:
-                            # Direct file operations with lock held
-                            current_emails = []
-                            if self.email_store.path.exists():
-                                with open(self.email_store.path, 'r', encoding='utf-8') as f:
-                                    current_emails = json.load(f)
+                            # Read snapshot plus any journaled records with lock held
+                            current_emails = DiskStore._copy(self.email_store._read_unlocked())
                                     
                             # Make sure it's a list
                             if not isinstance(current_emails, list):
@@ -174,9 +192,7 @@ class EnhancedMemoryStore:
                             current_emails.append(entry.to_dict())
                             
                             # Write directly with lock held
-                            self.email_store.path.parent.mkdir(exist_ok=True, parents=True)
-                            with open(self.email_store.path, 'w', encoding='utf-8') as f:
-                                json.dump(current_emails, f, indent=2)
+                            self.email_store._write_unlocked(current_emails)
                                 
                             # Update our local cache
                             self.email_memory = current_emails
@@ -383,10 +399,8 @@ class EnhancedMemoryStore:
                         # Use a more aggressive locking approach for fallback
                         self.preferences_store._acquire_lock()
                         try:
-                            current_prefs = []
-                            if self.preferences_store.path.exists():
-                                with open(self.preferences_store.path, 'r', encoding='utf-8') as f:
-                                    current_prefs = json.load(f)
+                            # Read snapshot plus any journaled records with lock held
+                            current_prefs = DiskStore._copy(self.preferences_store._read_unlocked())
                                     
                             # Make sure it's a list
                             if not isinstance(current_prefs, list):
@@ -396,9 +410,7 @@ class EnhancedMemoryStore:
                             current_prefs.append(entry.to_dict())
                             
                             # Write directly with lock held
-                            self.preferences_store.path.parent.mkdir(exist_ok=True, parents=True)
-                            with open(self.preferences_store.path, 'w', encoding='utf-8') as f:
-                                json.dump(current_prefs, f, indent=2)
+                            self.preferences_store._write_unlocked(current_prefs)
                                 
                             # Update our local cache
                             self.preferences = current_prefs
@@ -504,11 +516,8 @@ class EnhancedMemoryStore:
                         # Use a more aggressive locking approach for fallback
                         self.interaction_store._acquire_lock()
                         try:
-                            # Direct file operations with lock held
-                            current_interactions = []
-                            if self.interaction_store.path.exists():
-                                with open(self.interaction_store.path, 'r', encoding='utf-8') as f:
-                                    current_interactions = json.load(f)
+                            # Read snapshot plus any journaled records with lock held
+                            current_interactions = DiskStore._copy(self.interaction_store._read_unlocked())
                                     
                             # Make sure it's a list
                             if not isinstance(current_interactions, list):
@@ -518,9 +527,7 @@ class EnhancedMemoryStore:
                             current_interactions.append(entry.to_dict())
                             
                             # Write directly with lock held
-                            self.interaction_store.path.parent.mkdir(exist_ok=True, parents=True)
-                            with open(self.interaction_store.path, 'w', encoding='utf-8') as f:
-                                json.dump(current_interactions, f, indent=2)
+                            self.interaction_store._write_unlocked(current_interactions)
                                 
                             # Update our local cache
                             self.interaction_memory = current_interactions
@@ -641,9 +648,51 @@ class EnhancedMemoryStore:
             
         return results
     
+    # Memory collections searched by keyword, with the fields indexed for each
+    KEYWORD_FIELDS = {
+        "preference": ("content",),
+        "email": ("content", "summary", "subject"),
+        "interaction": ("content", "response", "query"),
+    }
+    
+    def _keyword_entries(self, name: str) -> List[Any]:
+        """Entries of a keyword-searchable collection, in insertion order."""
+        collection = {
+            "preference": self.preferences,
+            "email": self.email_memory,
+            "interaction": self.interaction_memory,
+        }[name]
+        if isinstance(collection, dict):
+            return list(collection.values())
+        return collection or []
+    
+    @staticmethod
+    def _entry_dict(entry: Any) -> Any:
+        """Return ``entry`` as a dict when it is a MemoryEntry-like object."""
+        if not isinstance(entry, dict) and hasattr(entry, 'to_dict'):
+            return entry.to_dict()
+        return entry
+    
+    def _keyword_index(self, name: str, entries: List[Any]) -> BM25Index:
+        """Return the BM25 index for a collection, indexing entries appended since the last search.
+        
+        Collections are append-only, so only the tail is indexed; if a
+        collection shrank it is reindexed from scratch.
+        """
+        index, indexed = self._keyword_indexes.get(name, (None, 0))
+        if index is None or indexed > len(entries):
+            index, indexed = BM25Index(), 0
+        fields = self.KEYWORD_FIELDS[name]
+        for position in range(indexed, len(entries)):
+            entry = self._entry_dict(entries[position])
+            if isinstance(entry, dict):
+                index.add(position, {field: entry.get(field) for field in fields})
+        self._keyword_indexes[name] = (index, len(entries))
+        return index
+    
     def _keyword_search(self, query: str, kind: Optional[Union[MemoryKind, str]] = None, 
                         limit: int = 5) -> List[Dict[str, Any]]:
-        """Search memory using simple keyword matching.
+        """Search memory using BM25 keyword matching.
         
         Args:
             query: The search query
@@ -651,87 +700,24 @@ class EnhancedMemoryStore:
             limit: Maximum number of results to return
             
         Returns:
-            List of matching memory entries as dictionaries
+            List of matching memory entries as dictionaries, best match first
         """
-        results = []
-        search_terms = query.lower().split()
-        
-        # Search preferences
-        if kind is None or kind == MemoryKind.PREFERENCE or (isinstance(kind, str) and kind == "preference"):
-            for pref in self.preferences:
-                # Handle both dictionary and MemoryEntry objects
-                if isinstance(pref, dict):
-                    content = pref.get("content", "")
-                    if any(term in content.lower() for term in search_terms):
-                        results.append(pref)
-                        if len(results) >= limit:
-                            return results
-                else:
-                    # Assuming it's a MemoryEntry object or has a content attribute
-                    try:
-                        if hasattr(pref, 'content'):
-                            if any(term in pref.content.lower() for term in search_terms):
-                                results.append(pref.to_dict() if hasattr(pref, 'to_dict') else pref)
-                                if len(results) >= limit:
-                                    return results
-                    except AttributeError:
-                        logger.warning(f"Skipping preference item that is not a dict or MemoryEntry: {type(pref)}")
-        
-        # Search email memory
-        if kind is None or kind == MemoryKind.EMAIL or (isinstance(kind, str) and kind == "email"):
-            # Handle email memory which could be a dict of entries or a list
-            if isinstance(self.email_memory, dict):
-                for _, email_data in self.email_memory.items():
-                    # Get content from various fields
-                    email_content = ""
-                    for field in ["content", "summary", "subject"]:
-                        if isinstance(email_data, dict) and field in email_data:
-                            email_content += " " + str(email_data[field])
-                    
-                    if any(term in email_content.lower() for term in search_terms):
-                        results.append(email_data)
-                        if len(results) >= limit:
-                            return results
-            elif isinstance(self.email_memory, list):
-                for email_data in self.email_memory:
-                    # Similar processing for list-based storage
-                    if isinstance(email_data, dict):
-                        email_content = ""
-                        for field in ["content", "summary", "subject"]:
-                            if field in email_data:
-                                email_content += " " + str(email_data[field])
-                        
-                        if any(term in email_content.lower() for term in search_terms):
-                            results.append(email_data)
-                            if len(results) >= limit:
-                                return results
-        
-        # Search interaction memory
-        if kind is None or kind == MemoryKind.NOTE or (isinstance(kind, str) and kind in ("note", "interaction")):
-            # Handle interaction memory which could be a dict of entries or a list
-            if isinstance(self.interaction_memory, dict):
-                for _, interaction_data in self.interaction_memory.items():
-                    interaction_content = ""
-                    for field in ["content", "response", "query"]:
-                        if isinstance(interaction_data, dict) and field in interaction_data:
-                            interaction_content += " " + str(interaction_data[field])
-                    
-                    if any(term in interaction_content.lower() for term in search_terms):
-                        results.append(interaction_data)
-                        if len(results) >= limit:
-                            return results
-            elif isinstance(self.interaction_memory, list):
-                for interaction_data in self.interaction_memory:
-                    if isinstance(interaction_data, dict):
-                        interaction_content = ""
-                        for field in ["content", "response", "query"]:
-                            if field in interaction_data:
-                                interaction_content += " " + str(interaction_data[field])
-                        
-                        if any(term in interaction_content.lower() for term in search_terms):
-                            results.append(interaction_data)
-                            if len(results) >= limit:
-                                return results
+        if kind is None:
+            names = list(self.KEYWORD_FIELDS)
+        elif kind in (MemoryKind.PREFERENCE, "preference"):
+            names = ["preference"]
+        elif kind in (MemoryKind.EMAIL, "email"):
+            names = ["email"]
+        elif kind in (MemoryKind.NOTE, "note", "interaction"):
+            names = ["interaction"]
+        else:
+            return []
         
-        return results
-
+        scored = []
+        for name in names:
+            entries = self._keyword_entries(name)
+            for position, score, _ in self._keyword_index(name, entries).search(query, k=limit):
+                scored.append((score, self._entry_dict(entries[position])))
+        
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [entry for _, entry in scored[:limit]]
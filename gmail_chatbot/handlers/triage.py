@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict
-from typing import Dict, List, TYPE_CHECKING, Any
+from typing import Dict, List, Optional, TYPE_CHECKING, Any
 
 from gmail_chatbot.query_classifier import postprocess_claude_response
 
@@ -51,13 +51,24 @@ def handle_triage_query(
         request_id=request_id
     )
     urgent_results: List[Dict[str, Any]] = []
+    # Emails related to the message itself; searched only without action items
+    message_results: Optional[List[Dict[str, Any]]] = None
     if app.memory_actions_handler.is_vector_search_available(
         request_id=request_id
     ):
         urgent_query = "urgent OR ASAP"
-        urgent_results = app.memory_actions_handler.find_related_emails(
-            urgent_query, limit=5, request_id=f"{request_id}_urgent"
-        )
+        if action_items:
+            urgent_results = app.memory_actions_handler.find_related_emails(
+                urgent_query, limit=5, request_id=f"{request_id}_urgent"
+            )
+        else:
+            # The message results are used if nothing urgent turns up, so
+            # run both searches in one batch
+            urgent_results, message_results = (
+                app.memory_actions_handler.find_related_emails_many(
+                    [urgent_query, message], limit=5, request_id=request_id
+                )
+            )
         for item in urgent_results:
             text = (
                 f"{item.get('subject', '')} {item.get('summary', '')}".lower()
@@ -129,15 +140,11 @@ def handle_triage_query(
             for item in delegation_candidates[:3]:
                 response_parts.append(f"- {item.get('subject', 'No Subject')}")
         response = "\n".join(response_parts)
-    elif app.memory_actions_handler.is_vector_search_available(
-        request_id=request_id
-    ):
+    elif message_results is not None:
         logging.info(
-            f"[{request_id}] No action items for triage, trying vector search for relevant emails."
-        )
-        vector_results = app.memory_actions_handler.find_related_emails(
-            message, limit=5, request_id=request_id
+            f"[{request_id}] No action items for triage, using vector search for relevant emails."
         )
+        vector_results = message_results
         if vector_results:
             response = app.claude_client.evaluate_vector_match(
                 user_query=message,
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Incremental inbox sync for the Gmail Chatbot.
+
+Stores the last seen mailbox ``historyId`` and uses the Gmail history API to
+fetch only messages added since the previous sync, instead of re-running a
+keyword search per client on every start.
+"""
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
+
+from gmail_chatbot.disk_store import DiskStore
+from gmail_chatbot.email_config import (
+    INBOX_SYNC_STATE_FILE,
+    INBOX_SYNC_BOOTSTRAP_QUERY,
+    INBOX_SYNC_BOOTSTRAP_MAX,
+)
+
+if TYPE_CHECKING:
+    from gmail_chatbot.email_gmail_api import GmailAPIClient
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryExpiredError(RuntimeError):
+    """Raised when a stored historyId is too old for ``users().history().list``."""
+    pass
+
+
+def route_emails_to_clients(emails: List[Dict[str, Any]], client_names: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Assign each email to the first known client it mentions.
+
+    Matching is a case-insensitive substring test over subject, sender,
+    recipient, snippet and body, mirroring the ``"<client>"`` full-text
+    search this replaces.
+
+    Args:
+        emails: Email dicts as returned by ``GmailAPIClient``
+        client_names: Known client names
+
+    Returns:
+        Dict mapping client name to its emails; clients without mail are omitted
+    """
+    needles = [(name, name.lower()) for name in client_names if name]
+    buckets: Dict[str, List[Dict[str, Any]]] = {}
+    for email in emails:
+        haystack = " ".join(
+            str(email.get(field, "")) for field in ("subject", "from", "to", "snippet", "body")
+        ).lower()
+        for name, needle in needles:
+            if needle in haystack:
+                buckets.setdefault(name, []).append(email)
+                break
+    return buckets
+
+
+class InboxSync:
+    """Fetches only messages added to the mailbox since the last sync.
+
+    The first sync (or one whose stored historyId has expired) seeds from
+    ``INBOX_SYNC_BOOTSTRAP_QUERY``. After that, each sync costs one history
+    call plus one fetch per new message. The new historyId is only persisted
+    when the caller calls ``commit``, so a failed run is retried next time.
+    """
+
+    def __init__(self, gmail_client: 'GmailAPIClient', state_path: Path = INBOX_SYNC_STATE_FILE) -> None:
+        """Initialize the sync engine.
+
+        Args:
+            gmail_client: Authenticated GmailAPIClient
+            state_path: JSON file holding the last synced historyId
+        """
+        self.gmail_client = gmail_client
+        self._state = DiskStore(Path(state_path))
+
+    @property
+    def history_id(self) -> Optional[str]:
+        """The historyId recorded by the last committed sync, if any."""
+        return self._state.load().get("history_id")
+
+    def fetch_new_emails(self, request_id: Optional[str] = None) -> Tuple[List[Dict[str, Any]], str]:
+        """Return emails added since the last committed sync.
+
+        Args:
+            request_id: Optional unique ID to trace this request through the chain
+
+        Returns:
+            Tuple of (new email dicts, historyId to pass to ``commit``)
+        """
+        history_id = self.history_id
+        msg_ids: List[str] = []
+        new_history_id = None
+
+        if history_id:
+            try:
+                msg_ids, new_history_id = self.gmail_client.list_history(history_id)
+                logger.info(f"[{request_id}] History sync from {history_id}: {len(msg_ids)} new message(s)")
+            except HistoryExpiredError as e:
+                logger.warning(f"[{request_id}] {e}; falling back to a bootstrap sync")
+                new_history_id = None
+
+        if new_history_id is None:
+            # Read the history ID before listing so nothing added meanwhile is missed
+            new_history_id = self.gmail_client.get_current_history_id()
+            msg_ids = self.gmail_client.list_message_ids(INBOX_SYNC_BOOTSTRAP_QUERY, INBOX_SYNC_BOOTSTRAP_MAX)
+            logger.info(f"[{request_id}] Bootstrap sync: {len(msg_ids)} message(s) from '{INBOX_SYNC_BOOTSTRAP_QUERY}'")
+
+        emails = self.gmail_client.get_emails_by_ids(msg_ids, request_id) if msg_ids else []
+        return emails, new_history_id
+
+    def commit(self, history_id: str) -> None:
+        """Record ``history_id`` as the starting point of the next sync."""
+        self._state.update_many({
+            "history_id": str(history_id),
+            "last_sync": datetime.now().isoformat(),
+        })
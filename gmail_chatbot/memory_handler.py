@@ -10,6 +10,7 @@ import threading
 
 from .prompt_templates import NOTEBOOK_EMPTY_PROMPT, NOTEBOOK_SUMMARY_PREFIX
 from gmail_chatbot.preference_detector import PreferenceDetector
+from gmail_chatbot.inbox_sync import InboxSync, route_emails_to_clients
 
 
 if TYPE_CHECKING:
@@ -47,6 +48,7 @@ class MemoryActionsHandler:
         self.preference_detector = preference_detector
         self._proactive_summary_queue = queue.Queue() # Thread-safe queue for summaries
         self._summary_lock = threading.Lock() # Lock for summary generation if needed, though Queue is thread-safe
+        self.inbox_sync = InboxSync(gmail_client) # History-based incremental fetch for enrichment
         logger.info("MemoryActionsHandler initialized with PreferenceDetector and proactive summary queue")
 
     def get_handler_client_names(self) -> List[str]:
@@ -65,37 +67,74 @@ class MemoryActionsHandler:
 
     def store_emails_in_memory(
         self, emails: List[Dict[str, Any]], query: str, request_id: str
-    ) -> None:
+    ) -> Dict[str, bool]:
         """Store emails in the memory store.
 
+        Emails without an ID are skipped. If the batched write fails, each
+        email is stored on its own so one bad record doesn't drop the rest.
+
         Args:
             emails: List of email data dictionaries
             query: The query that produced these emails
             request_id: Unique ID for tracking this request in logs
+
+        Returns:
+            Dict mapping each stored email ID to True if it was persisted
+            (and indexed, when the vector store indexes synchronously)
         """
         if not emails:
             logger.info(f"[{request_id}] No emails to store for query: {query}")
-            return
+            return {}
 
         logger.info(f"[{request_id}] Storing {len(emails)} emails for query: {query}")
+        records = []
         for email_data in emails:
-            try:
-                self.memory_store.add_email_memory(
-                    email_id=email_data.get("id", "unknown_id"),
-                    subject=email_data.get("subject", "No Subject"),
-                    sender=email_data.get("sender", "Unknown Sender"),
-                    recipient=email_data.get("recipient", "Unknown Recipient"),
-                    date=email_data.get("date", datetime.now().isoformat()),
-                    summary=email_data.get("summary", "No Summary"),
-                    body=email_data.get("body"), # Pass body for vector indexing
-                    client=email_data.get("client"), # If client is determined earlier
-                    tags=email_data.get("tags", []) + [f"query:{query}"],
-                    requires_action=email_data.get("requires_action", False),
-                    action_type=email_data.get("action_type")
-                )
-            except Exception as e:
-                logger.error(f"[{request_id}] Error storing email {email_data.get('id')}: {e}")
+            email_id = email_data.get("id") if isinstance(email_data, dict) else None
+            if not email_id:
+                logger.warning(f"[{request_id}] Skipping malformed email without an ID: {email_data!r:.200}")
+                continue
+            records.append({
+                "email_id": email_id,
+                "subject": email_data.get("subject", "No Subject"),
+                "sender": email_data.get("sender") or email_data.get("from", "Unknown Sender"),
+                "recipient": email_data.get("recipient") or email_data.get("to", "Unknown Recipient"),
+                "date": email_data.get("date", datetime.now().isoformat()),
+                "summary": email_data.get("summary", "No Summary"),
+                "body": email_data.get("body"),  # Pass body for vector indexing
+                "client": email_data.get("client"),  # If client is determined earlier
+                "tags": list(email_data.get("tags") or []) + [f"query:{query}"],
+                "requires_action": email_data.get("requires_action", False),
+                "action_type": email_data.get("action_type"),
+            })
+        if not records:
+            return {}
+
+        try:
+            # One batched write and embedding pass for the whole result set
+            results = self._store_records(records)
+        except Exception as e:
+            logger.error(f"[{request_id}] Error storing {len(records)} emails, retrying one by one: {e}")
+            results = {}
+            for record in records:
+                try:
+                    results.update(self._store_records([record]))
+                except Exception as record_error:
+                    logger.error(f"[{request_id}] Error storing email {record['email_id']}: {record_error}")
+                    results[record["email_id"]] = False
+
+        failed = [email_id for email_id, ok in results.items() if not ok]
+        if failed:
+            logger.warning(f"[{request_id}] {len(failed)} emails were not stored: {', '.join(failed)}")
         logger.info(f"[{request_id}] Finished storing emails.")
+        return results
+
+    def _store_records(self, records: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """Write records to the memory store and return its per-email results."""
+        results = self.memory_store.add_email_memories(records)
+        if not isinstance(results, dict):
+            # Stores that report nothing stored everything or raised
+            results = {}
+        return {record["email_id"]: bool(results.get(record["email_id"], True)) for record in records}
 
     def handle_user_memory_query(self, message: str, request_id: str) -> Optional[str]:
         """Handle queries about stored memory information by dispatching to specific handlers.
@@ -242,7 +281,11 @@ class MemoryActionsHandler:
 
     def perform_autonomous_memory_enrichment(self, request_id: str) -> None:
         """
-        Autonomously fetches and stores recent emails for known clients.
+        Autonomously fetches and stores new emails for known clients.
+
+        Only messages added since the last sync are fetched (via the Gmail
+        history API) and routed to clients locally, so the cost scales with
+        new mail rather than with clients x recent emails.
         """
         logger.info(f"[{request_id}] Starting autonomous memory enrichment task.")
         client_names = self.memory_store.get_client_names()
@@ -250,60 +293,52 @@ class MemoryActionsHandler:
             logger.info(f"[{request_id}] No clients found for autonomous memory enrichment.")
             return
 
-        for client_name in client_names:
+        try:
+            new_emails, history_id = self.inbox_sync.fetch_new_emails(request_id=request_id)
+        except Exception as e:
+            logger.error(f"[{request_id}] Error syncing inbox for autonomous enrichment: {e}")
+            self._create_and_queue_enrichment_summary(0, 0, errors_occurred=True)
+            return
+
+        buckets = route_emails_to_clients(new_emails, client_names)
+        logger.info(f"[{request_id}] Synced {len(new_emails)} new emails; {sum(len(b) for b in buckets.values())} matched {len(buckets)} client(s).")
+
+        errors_occurred = False
+        for client_name, emails_data_list in buckets.items():
             try:
-                logger.info(f"[{request_id}] Fetching recent emails for client: {client_name}")
-                # Formulate a Gmail search query for emails related to the client in the last 7 days.
-                gmail_search_query = f'"{client_name}" newer_than:7d'
-                
-                # search_emails returns a tuple: (list_of_email_dicts, claude_response_string)
-                emails_data_list, _ = self.gmail_client.search_emails(
-                    query=gmail_search_query,
-                    original_user_query=f"Autonomous fetch for {client_name}", 
-                    request_id=f"{request_id}_client_{client_name.replace(' ', '_')}"
+                for email in emails_data_list:
+                    if "client" not in email or not email["client"]:
+                        email["client"] = client_name
+                    if "tags" not in email or not isinstance(email["tags"], list):
+                        email["tags"] = []
+                    if "autonomously_fetched" not in email["tags"]:
+                        email["tags"].append("autonomously_fetched")
+
+                stored = self.store_emails_in_memory(
+                    emails=emails_data_list,
+                    query=f"Autonomously fetched for {client_name}",
+                    request_id=request_id
                 )
-
-                if emails_data_list:
-                    logger.info(f"[{request_id}] Found {len(emails_data_list)} emails for client {client_name}. Storing them.")
-                    for email in emails_data_list:
-                        if "client" not in email or not email["client"]:
-                            email["client"] = client_name
-                        if "tags" not in email or not isinstance(email["tags"], list):
-                            email["tags"] = []
-                        if "autonomously_fetched" not in email["tags"]:
-                             email["tags"].append("autonomously_fetched")
-                                
-                logger.info(f"[{request_id}] Fetched {len(emails_data_list)} emails for {client_name}. Processing...")
-                
-                processed_email_ids = [email['id'] for email in emails_data_list]
-                # Simulate storing/processing these emails. 
-                # In a real scenario, this would involve calls to store_emails_in_memory or similar,
-                # and potentially creating notes if logic dictates.
-                # For this example, we'll assume all fetched emails are 'processed'.
-                num_processed = len(emails_data_list)
-                num_notes_created = 0 # Placeholder - actual note creation logic would be complex
-
-                if num_processed > 0:
-                    # This is where you would call self.store_emails_in_memory if not already done
-                    # For example, if GmailAPIClient.get_recent_emails_for_client doesn't auto-summarize/store:
-                    # self.store_emails_in_memory(recent_emails, query=f"autonomous_client_scan:{client_name}", request_id=request_id)
-                    self.store_emails_in_memory(
-                        emails=emails_data_list, 
-                        query=f"Autonomously fetched for {client_name}", 
-                        request_id=request_id
-                    )
+                failed = [email_id for email_id, ok in stored.items() if not ok]
+                if failed:
+                    raise RuntimeError(f"{len(failed)} of {len(stored)} emails were not stored")
 
                 # After processing for this client, create and queue a summary
                 self._create_and_queue_enrichment_summary(
-                    processed_emails_count=num_processed, 
-                    new_notes_count=num_notes_created, 
+                    processed_emails_count=len(emails_data_list),
+                    new_notes_count=0, # Placeholder - actual note creation logic would be complex
                     client_name=client_name
                 )
 
             except Exception as e:
+                errors_occurred = True
                 logger.error(f"[{request_id}] Error during autonomous enrichment for client {client_name}: {e}")
                 self._create_and_queue_enrichment_summary(0, 0, client_name=client_name, errors_occurred=True)
 
+        # Advance the sync point only once every bucket was stored, so failures are retried
+        if not errors_occurred:
+            self.inbox_sync.commit(history_id)
+
         logger.info(f"[{request_id}] Autonomous memory enrichment task completed cycle.")
 
     def record_interaction_in_memory(
@@ -456,6 +491,41 @@ class MemoryActionsHandler:
             logger.info("Retrieving structured action items.")
         return self.memory_store.get_action_items()
 
+    def is_vector_search_available(self, request_id: Optional[str] = None) -> bool:
+        """Return True if the memory store can run vector searches."""
+        return bool(self.memory_store.vector_search_available)
+
+    def find_related_emails(
+        self, query: str, limit: int = 5, request_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return stored emails related to ``query``, best match first."""
+        if request_id:
+            logger.info(f"[{request_id}] Finding emails related to: {query}")
+        return self.memory_store.find_related_emails(query, limit=limit)
+
+    def find_related_emails_many(
+        self, queries: List[str], limit: int = 5, request_id: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Find related emails for several queries with one batched search.
+
+        Args:
+            queries: Independent search queries
+            limit: Maximum number of emails per query
+            request_id: Optional identifier used for logging
+
+        Returns:
+            One result list per query, in the order of ``queries``
+        """
+        if request_id:
+            logger.info(f"[{request_id}] Finding emails related to {len(queries)} queries.")
+        return self.memory_store.find_related_emails_many(queries, limit=limit)
+
+    def get_delegation_candidates(
+        self, action_items: List[Dict[str, Any]], request_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return the action items that could be delegated."""
+        return self._get_delegation_candidates(action_items)
+
     def manage_preferences(self, message: str, request_id: str) -> str:
         """Handle queries about user preferences.
 
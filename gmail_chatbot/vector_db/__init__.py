@@ -1,11 +1,55 @@
 """Vector database utilities."""
 
+from .ann import build_index, choose_index_type, evaluate_index
+from .bm25 import BM25Index, ChunkBM25Index, tokenize
+from .chunk_store import ChunkStore
+from .embedding_cache import CachedEmbeddings, EmbeddingCache
+from .faiss_store import ChunkDocument, FaissChunkIndex
+from .filters import MetadataColumns, MetadataFilterIndex, TimeShards
+from .index_queue import IndexingQueue
 from .indexing import create_new_index, store_chunks_without_vectors
-from .search import search, keyword_search
+from .reindex import Reindexer
+from .text_splitter import TokenCounter, TokenTextSplitter
+from .search import (
+    QueryCache,
+    fuse_results,
+    group_by_email,
+    hybrid_search,
+    hybrid_search_many,
+    keyword_search,
+    search,
+    search_emails_many,
+    search_many,
+)
 
 __all__ = [
+    "build_index",
+    "choose_index_type",
+    "evaluate_index",
+    "BM25Index",
+    "ChunkBM25Index",
+    "tokenize",
+    "ChunkStore",
+    "CachedEmbeddings",
+    "EmbeddingCache",
+    "ChunkDocument",
+    "FaissChunkIndex",
+    "MetadataColumns",
+    "MetadataFilterIndex",
+    "TimeShards",
+    "IndexingQueue",
     "create_new_index",
     "store_chunks_without_vectors",
+    "Reindexer",
+    "TokenCounter",
+    "TokenTextSplitter",
+    "QueryCache",
+    "fuse_results",
+    "group_by_email",
+    "hybrid_search",
+    "hybrid_search_many",
     "search",
+    "search_emails_many",
+    "search_many",
     "keyword_search",
 ]
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""FAISS index types and promotion policy for :mod:`gmail_chatbot`.
+
+Three index types are supported:
+
+* ``flat``  - exact search, 4 bytes per dimension, cost linear in chunks
+* ``hnsw``  - graph index, sub-linear query cost; recall is approximate and
+  grows with ``efSearch``
+* ``ivfpq`` - inverted lists with product quantization, a few dozen bytes
+  per vector; trained on a sample of the corpus
+
+With ``auto`` the index is promoted from flat to HNSW to IVF-PQ as the
+number of chunks crosses the configured thresholds, once the new index's
+recall against exact search is high enough (see :func:`evaluate_index`).
+Filtered searches don't rely on the graph or inverted lists for small
+candidate sets; :mod:`gmail_chatbot.vector_db.search` scans them exactly.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Ordered from exact/small to approximate/large
+INDEX_TYPES = ("flat", "hnsw", "ivfpq")
+
+# Neighbours per HNSW node and beam width while building the graph
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+
+# Bits per product-quantizer code and the upper bound on sub-quantizers
+PQ_NBITS = 8
+PQ_MAX_SUBQUANTIZERS = 16
+
+# FAISS k-means wants about this many training points per centroid
+MIN_POINTS_PER_CENTROID = 39
+
+# Vectors sampled to train the IVF-PQ coarse quantizer and codebooks
+DEFAULT_TRAIN_SAMPLE = 100_000
+
+
+def choose_index_type(
+    n_chunks: int,
+    configured: str = "auto",
+    hnsw_min_chunks: int = 0,
+    ivfpq_min_chunks: int = 0,
+) -> str:
+    """Return the index type to use for ``n_chunks`` vectors.
+
+    Args:
+        n_chunks: Number of vectors in the index
+        configured: ``flat``, ``hnsw``, ``ivfpq`` or ``auto``
+        hnsw_min_chunks: ``auto`` uses HNSW from this size on (0 disables)
+        ivfpq_min_chunks: ``auto`` uses IVF-PQ from this size on (0 disables)
+    """
+    if configured in INDEX_TYPES:
+        return configured
+    if configured != "auto":
+        logger.warning("Unknown index type %r, choosing automatically", configured)
+    if ivfpq_min_chunks and n_chunks >= ivfpq_min_chunks:
+        return "ivfpq"
+    if hnsw_min_chunks and n_chunks >= hnsw_min_chunks:
+        return "hnsw"
+    return "flat"
+
+
+def index_type_of(index: Any) -> str:
+    """Map a FAISS index object to one of :data:`INDEX_TYPES`."""
+    name = type(index).__name__
+    if "HNSW" in name:
+        return "hnsw"
+    if "IVF" in name:
+        return "ivfpq"
+    return "flat"
+
+
+def ivfpq_params(n_vectors: int, dim: int, max_subquantizers: int = PQ_MAX_SUBQUANTIZERS) -> Tuple[int, int]:
+    """Return ``(nlist, m)`` for an IVF-PQ index over ``n_vectors``.
+
+    ``nlist`` follows the usual ``4 * sqrt(n)`` rule, capped so each
+    centroid gets enough training points; ``m`` is the largest divisor of
+    ``dim`` not above ``max_subquantizers``.
+    """
+    nlist = max(1, min(int(4 * math.sqrt(n_vectors)), n_vectors // MIN_POINTS_PER_CENTROID))
+    m = max(d for d in range(1, min(dim, max_subquantizers) + 1) if dim % d == 0)
+    return nlist, m
+
+
+def ivfpq_trainable(n_vectors: int, dim: int) -> bool:
+    """True if there are enough vectors to train IVF-PQ codebooks."""
+    nlist, _ = ivfpq_params(n_vectors, dim)
+    return n_vectors >= max(2**PQ_NBITS, nlist) * MIN_POINTS_PER_CENTROID // 4
+
+
+def configure_search(index: Any, hnsw_ef_search: int, ivf_nprobe: int) -> None:
+    """Apply query-time accuracy knobs; a no-op for flat indexes."""
+    if hasattr(index, "hnsw"):
+        index.hnsw.efSearch = hnsw_ef_search
+    if hasattr(index, "nprobe"):
+        index.nprobe = max(1, min(ivf_nprobe, getattr(index, "nlist", ivf_nprobe)))
+
+
+def train_ivfpq(vectors: Any, train_sample: int = DEFAULT_TRAIN_SAMPLE) -> Optional[Any]:
+    """Create an IVF-PQ index trained on a random sample of ``vectors``.
+
+    Returns None when there are too few vectors to train the codebooks.
+    """
+    import faiss  # type: ignore
+    import numpy as np  # type: ignore
+
+    n, dim = vectors.shape
+    if not ivfpq_trainable(n, dim):
+        return None
+    nlist, m = ivfpq_params(n, dim)
+    sample_size = min(n, max(train_sample, nlist * MIN_POINTS_PER_CENTROID))
+    sample = vectors[np.random.default_rng(0).choice(n, sample_size, replace=False)]
+
+    started = time.perf_counter()
+    quantizer = faiss.IndexFlatL2(dim)
+    index = faiss.IndexIVFPQ(quantizer, dim, nlist, m, PQ_NBITS)
+    index.train(sample)
+    logger.info(
+        "Trained IVF-PQ index (nlist=%d, m=%d) on %d vectors in %.1fs",
+        nlist,
+        m,
+        sample_size,
+        time.perf_counter() - started,
+    )
+    return index
+
+
+def build_index(
+    vectors: Any,
+    index_type: str,
+    hnsw_ef_search: int = 64,
+    ivf_nprobe: int = 16,
+    train_sample: int = DEFAULT_TRAIN_SAMPLE,
+) -> Any:
+    """Build a FAISS index of ``index_type`` holding ``vectors`` in order.
+
+    Vector ``i`` keeps position ``i``, so row ids stay aligned with the
+    chunk store. IVF-PQ falls back to HNSW for corpora too small to train.
+    """
+    import faiss  # type: ignore
+    import numpy as np  # type: ignore
+
+    data = np.ascontiguousarray(vectors, dtype="float32")
+    dim = data.shape[1]
+    index = None
+    if index_type == "ivfpq":
+        index = train_ivfpq(data, train_sample)
+        if index is None:
+            logger.info("Too few vectors to train IVF-PQ, using HNSW")
+            index_type = "hnsw"
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, HNSW_M)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    elif index is None:
+        index = faiss.IndexFlatL2(dim)
+    configure_search(index, hnsw_ef_search, ivf_nprobe)
+    index.add(data)
+    return index
+
+
+def index_vectors(index: Any) -> Any:
+    """Read all vectors back from an index that stores them uncompressed."""
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def evaluate_index(index: Any, vectors: Any, k: int = 10, n_queries: int = 50) -> Dict[str, Any]:
+    """Measure recall@k and per-query latency of ``index`` against exact search.
+
+    Queries are a random sample of the indexed vectors; the exact neighbours
+    are computed by brute force over ``vectors``.
+    """
+    import faiss  # type: ignore
+    import numpy as np  # type: ignore
+
+    data = np.ascontiguousarray(vectors, dtype="float32")
+    n = data.shape[0]
+    k = min(k, n)
+    queries = data[np.random.default_rng(1).choice(n, min(n_queries, n), replace=False)]
+
+    if hasattr(faiss, "knn"):
+        exact_search = lambda query: faiss.knn(query, data, k)  # noqa: E731
+    else:  # older FAISS without faiss.knn
+        reference = faiss.IndexFlatL2(data.shape[1])
+        reference.add(data)
+        exact_search = lambda query: reference.search(query, k)  # noqa: E731
+
+    started = time.perf_counter()
+    exact = [exact_search(query[None, :])[1][0] for query in queries]
+    exact_ms = (time.perf_counter() - started) * 1000 / len(queries)
+
+    started = time.perf_counter()
+    approx = [index.search(query[None, :], k)[1][0] for query in queries]
+    latency_ms = (time.perf_counter() - started) * 1000 / len(queries)
+
+    hits = sum(len(set(a) & set(e)) for a, e in zip(approx, exact))
+    return {
+        "type": index_type_of(index),
+        "k": k,
+        "queries": len(queries),
+        "recall_at_k": round(hits / (k * len(queries)), 4) if k else 1.0,
+        "latency_ms": round(latency_ms, 3),
+        "exact_latency_ms": round(exact_ms, 3),
+        "evaluated_on": int(index.ntotal),
+    }
+
+
+def search_params(index: Optional[Any]) -> Dict[str, Any]:
+    """Query-time parameters of ``index`` for status reporting."""
+    params: Dict[str, Any] = {}
+    if index is None:
+        return params
+    if hasattr(index, "hnsw"):
+        params["ef_search"] = index.hnsw.efSearch
+    if hasattr(index, "nprobe"):
+        params["nprobe"] = index.nprobe
+        params["nlist"] = getattr(index, "nlist", None)
+    return params
+
+
+def is_promotion(current: str, target: str) -> bool:
+    """True if ``target`` is a larger-scale index type than ``current``."""
+    return INDEX_TYPES.index(target) > INDEX_TYPES.index(current)
+
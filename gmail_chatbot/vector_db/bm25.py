@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""BM25 inverted index shared by the keyword search paths of :mod:`gmail_chatbot`."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - for type hints only
+    from gmail_chatbot.vector_db.chunk_store import ChunkStore
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase ``text`` and split it into word tokens."""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+class BM25Index:
+    """Incrementally maintained inverted index with Okapi BM25 scoring.
+
+    Documents are added (or replaced) one at a time under any hashable id.
+    A document is either a plain string or a mapping of field name to text;
+    with ``field_weights`` a term's frequency is the weighted sum of its
+    counts per field, so e.g. a subject hit can outweigh a body hit.
+
+    Queries only visit the posting lists of their own terms, so search cost
+    follows the number of matching documents rather than the corpus size.
+    """
+
+    def __init__(
+        self,
+        field_weights: Optional[Mapping[str, float]] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        self.field_weights = dict(field_weights or {})
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[Hashable, float]] = {}
+        self._doc_lengths: Dict[Hashable, float] = {}
+        self._doc_terms: Dict[Hashable, Tuple[str, ...]] = {}
+        self._total_length = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._doc_lengths
+
+    def _term_frequencies(self, document: Union[str, Mapping[str, Any]]) -> Counter:
+        if isinstance(document, str):
+            return Counter(tokenize(document))
+        frequencies: Counter = Counter()
+        for field, value in document.items():
+            weight = self.field_weights.get(field, 1.0)
+            if not weight or value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                value = " ".join(str(v) for v in value)
+            for term in tokenize(str(value)):
+                frequencies[term] += weight
+        return frequencies
+
+    def add(self, doc_id: Hashable, document: Union[str, Mapping[str, Any]]) -> None:
+        """Index ``document`` under ``doc_id``, replacing any previous version."""
+        frequencies = self._term_frequencies(document)
+        with self._lock:
+            self._remove_unlocked(doc_id)
+            for term, tf in frequencies.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+            length = float(sum(frequencies.values()))
+            self._doc_lengths[doc_id] = length
+            self._doc_terms[doc_id] = tuple(frequencies)
+            self._total_length += length
+
+    def remove(self, doc_id: Hashable) -> None:
+        """Drop ``doc_id`` from the index if present."""
+        with self._lock:
+            self._remove_unlocked(doc_id)
+
+    def _remove_unlocked(self, doc_id: Hashable) -> None:
+        length = self._doc_lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self._doc_terms.pop(doc_id, ()):
+            docs = self._postings[term]
+            del docs[doc_id]
+            if not docs:
+                del self._postings[term]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings = {}
+            self._doc_lengths = {}
+            self._doc_terms = {}
+            self._total_length = 0.0
+
+    def search(
+        self,
+        query: str,
+        k: Optional[int] = 10,
+        allowed: Optional[Collection[Hashable]] = None,
+    ) -> List[Tuple[Hashable, float, float]]:
+        """Return the best-scoring documents for ``query``.
+
+        Args:
+            query: Free-text query
+            k: Maximum number of hits, or None for all matching documents
+            allowed: Optional set of doc ids to restrict the search to
+
+        Returns:
+            List of ``(doc_id, bm25_score, coverage)`` tuples, best first.
+            ``coverage`` is the IDF-weighted fraction of query terms the
+            document contains, in ``[0, 1]``.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            n_docs = len(self._doc_lengths)
+            if not n_docs:
+                return []
+            avg_length = self._total_length / n_docs or 1.0
+            scores: Dict[Hashable, float] = {}
+            matched_idf: Dict[Hashable, float] = {}
+            total_idf = 0.0
+            for term in terms:
+                docs = self._postings.get(term)
+                df = len(docs) if docs else 0
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                total_idf += idf
+                if not docs:
+                    continue
+                for doc_id, tf in docs.items():
+                    if allowed is not None and doc_id not in allowed:
+                        continue
+                    norm = self.k1 * (1.0 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+                    matched_idf[doc_id] = matched_idf.get(doc_id, 0.0) + idf
+
+        if k is None:
+            best = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        else:
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [
+            (doc_id, score, matched_idf[doc_id] / total_idf if total_idf else 0.0)
+            for doc_id, score in best
+        ]
+
+
+class ChunkBM25Index(BM25Index):
+    """BM25 index over a :class:`ChunkStore`, keyed by chunk row id.
+
+    Like ``MetadataFilterIndex`` it is built lazily, indexes rows appended
+    since the previous query and rebuilds after ``ChunkStore.clear``. Rows
+    deleted from the store are removed on the next sync.
+    """
+
+    def __init__(self, chunk_store: "ChunkStore", **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.chunk_store = chunk_store
+        self._size = 0
+        self._deleted_seen = 0
+        self._epoch: Optional[int] = None
+
+    def sync(self) -> None:
+        """Apply rows appended to or deleted from the chunk store since the last sync."""
+        with self._lock:
+            total = len(self.chunk_store)
+            if self._epoch != self.chunk_store.epoch or self._size > total:
+                self.clear()
+                self._size = 0
+                self._deleted_seen = 0
+                self._epoch = self.chunk_store.epoch
+            deleted_rows = self.chunk_store.deleted_rows
+            for row_id in deleted_rows[self._deleted_seen :]:
+                self.remove(row_id)
+            self._deleted_seen = len(deleted_rows)
+            if self._size < total:
+                for row_id, text, _ in self.chunk_store.iter_rows(self._size):
+                    self.add(row_id, text)
+                self._size = total
+
+    def search(
+        self,
+        query: str,
+        k: Optional[int] = 10,
+        allowed: Optional[Collection[Hashable]] = None,
+    ) -> List[Tuple[Hashable, float, float]]:
+        self.sync()
+        return super().search(query, k, allowed)
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+"""Append-only chunk storage for :mod:`gmail_chatbot`.
+
+Chunks are written as JSON lines into segment files and located through a
+fixed-width binary offset index, so adding chunks costs O(new chunks) and the
+row count is known from the index size without parsing any chunk.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# segment number, byte offset, byte length
+_OFFSET_RECORD = struct.Struct("<IQI")
+
+# row id of a deleted chunk
+_TOMBSTONE_RECORD = struct.Struct("<Q")
+
+# Start a new segment once the active one grows past this size
+DEFAULT_SEGMENT_BYTES = 8 * 1024 * 1024
+
+
+class ChunkStore:
+    """Segmented, append-only store of chunk text and metadata.
+
+    Layout of ``directory``::
+
+        seg-000001.jsonl   one {"text": ..., "metadata": ...} object per line
+        offsets.bin        one (segment, offset, length) record per row
+        deleted.bin        row ids of deleted chunks, in deletion order
+
+    Row ids are positions in ``offsets.bin`` and never change once written.
+    Deleting a row only records a tombstone; reads skip deleted rows and the
+    space is reclaimed when the owner rebuilds the store after ``clear``.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        legacy_path: Optional[str] = None,
+    ) -> None:
+        """Open (or create) the store.
+
+        Args:
+            directory: Directory holding segments and the offset index
+            segment_bytes: Size at which a new segment file is started
+            legacy_path: Optional ``*.chunks.json`` file to import when the
+                store is empty
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self._lock = threading.RLock()
+        self._offsets: Optional[bytearray] = None
+        self._deleted_rows: Optional[List[int]] = None
+        self._deleted_set: Set[int] = set()
+        # Bumped by clear() so derived in-memory indexes know to rebuild
+        self.epoch = 0
+        # Bumped on every append, delete or clear so result caches invalidate
+        self.generation = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._repair_offsets()
+        if legacy_path and len(self) == 0 and os.path.exists(legacy_path):
+            self._migrate_legacy(legacy_path)
+
+    # -- paths -----------------------------------------------------------
+
+    def _offsets_path(self) -> str:
+        return os.path.join(self.directory, "offsets.bin")
+
+    def _tombstones_path(self) -> str:
+        return os.path.join(self.directory, "deleted.bin")
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"seg-{segment:06d}.jsonl")
+
+    def _segments(self) -> List[int]:
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.startswith("seg-") and name.endswith(".jsonl"):
+                try:
+                    segments.append(int(name[4:-6]))
+                except ValueError:
+                    continue
+        return sorted(segments)
+
+    # -- bookkeeping -----------------------------------------------------
+
+    def _repair_offsets(self) -> None:
+        """Drop a partially written trailing offset record after a crash."""
+        path = self._offsets_path()
+        if not os.path.exists(path):
+            return
+        size = os.path.getsize(path)
+        extra = size % _OFFSET_RECORD.size
+        if extra:
+            logger.warning("Truncating %d stray bytes from %s", extra, path)
+            with open(path, "r+b") as f:
+                f.truncate(size - extra)
+
+    def _load_offsets(self) -> bytearray:
+        if self._offsets is None:
+            path = self._offsets_path()
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    self._offsets = bytearray(f.read())
+            else:
+                self._offsets = bytearray()
+        return self._offsets
+
+    def _load_tombstones(self) -> List[int]:
+        if self._deleted_rows is None:
+            rows: List[int] = []
+            path = self._tombstones_path()
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    data = f.read()
+                usable = len(data) - len(data) % _TOMBSTONE_RECORD.size
+                rows = [row for (row,) in _TOMBSTONE_RECORD.iter_unpack(data[:usable])]
+            self._deleted_rows = rows
+            self._deleted_set = set(rows)
+        return self._deleted_rows
+
+    @property
+    def deleted_rows(self) -> List[int]:
+        """Deleted row ids in the order they were deleted (append-only)."""
+        with self._lock:
+            return self._load_tombstones()
+
+    @property
+    def deleted(self) -> Set[int]:
+        """Set of deleted row ids."""
+        with self._lock:
+            self._load_tombstones()
+            return self._deleted_set
+
+    def is_deleted(self, row_id: int) -> bool:
+        return row_id in self.deleted
+
+    def live_count(self) -> int:
+        """Number of rows that have not been deleted."""
+        return len(self) - len(self.deleted)
+
+    def __len__(self) -> int:
+        if self._offsets is not None:
+            return len(self._offsets) // _OFFSET_RECORD.size
+        path = self._offsets_path()
+        if not os.path.exists(path):
+            return 0
+        return os.path.getsize(path) // _OFFSET_RECORD.size
+
+    def size_bytes(self) -> int:
+        """Total bytes on disk for segments and the offset index."""
+        total = 0
+        for name in os.listdir(self.directory):
+            total += os.path.getsize(os.path.join(self.directory, name))
+        return total
+
+    def refresh(self) -> bool:
+        """Pick up rows and deletions written by another process.
+
+        Returns:
+            True if the store was rewritten rather than appended to, in
+            which case ``epoch`` is bumped so derived indexes rebuild
+        """
+        with self._lock:
+            old = self._offsets
+            old_deleted = self._deleted_rows
+            self._offsets = None
+            self._deleted_rows = None
+            self._deleted_set = set()
+            new = self._load_offsets()
+            changed = old is None or old_deleted is None or new != old
+            if changed or self._load_tombstones() != old_deleted:
+                self.generation += 1
+            if old is not None and new[: len(old)] != old:
+                self.epoch += 1
+                return True
+        return False
+
+    # -- writes ----------------------------------------------------------
+
+    def append(
+        self, chunks: Sequence[str], metadata: Sequence[Dict[str, Any]]
+    ) -> List[int]:
+        """Append chunks with their metadata and return the new row ids."""
+        if len(chunks) != len(metadata):
+            raise ValueError("chunks and metadata must have the same length")
+        if not chunks:
+            return []
+
+        with self._lock:
+            segments = self._segments()
+            segment = segments[-1] if segments else 1
+            seg_path = self._segment_path(segment)
+            if (
+                os.path.exists(seg_path)
+                and os.path.getsize(seg_path) >= self.segment_bytes
+            ):
+                segment += 1
+                seg_path = self._segment_path(segment)
+
+            records = bytearray()
+            with open(seg_path, "ab") as f:
+                offset = f.tell()
+                for text, meta in zip(chunks, metadata):
+                    line = (
+                        json.dumps(
+                            {"text": text, "metadata": meta},
+                            ensure_ascii=False,
+                        )
+                        + "\n"
+                    ).encode("utf-8")
+                    f.write(line)
+                    records += _OFFSET_RECORD.pack(segment, offset, len(line))
+                    offset += len(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+            first_row = len(self)
+            with open(self._offsets_path(), "ab") as f:
+                f.write(records)
+                f.flush()
+                os.fsync(f.fileno())
+            if self._offsets is not None:
+                self._offsets += records
+            self.generation += 1
+
+        return list(range(first_row, first_row + len(chunks)))
+
+    def delete(self, row_ids: Iterable[int]) -> List[int]:
+        """Tombstone rows and return the ids that were newly deleted."""
+        with self._lock:
+            self._load_tombstones()
+            total = len(self)
+            new_rows = sorted(
+                {
+                    row
+                    for row in row_ids
+                    if 0 <= row < total and row not in self._deleted_set
+                }
+            )
+            if not new_rows:
+                return []
+            with open(self._tombstones_path(), "ab") as f:
+                f.write(b"".join(_TOMBSTONE_RECORD.pack(row) for row in new_rows))
+                f.flush()
+                os.fsync(f.fileno())
+            self._deleted_rows.extend(new_rows)  # type: ignore[union-attr]
+            self._deleted_set.update(new_rows)
+            self.generation += 1
+        return new_rows
+
+    def clear(self) -> None:
+        """Remove every chunk from the store."""
+        with self._lock:
+            for name in os.listdir(self.directory):
+                os.remove(os.path.join(self.directory, name))
+            self._offsets = None
+            self._deleted_rows = None
+            self._deleted_set = set()
+            self.epoch += 1
+            self.generation += 1
+
+    def _migrate_legacy(self, legacy_path: str) -> None:
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+            chunks = legacy.get("chunks", [])
+            metadata = legacy.get("metadata", [])
+            metadata = list(metadata) + [{}] * (len(chunks) - len(metadata))
+            self.append(chunks, metadata[: len(chunks)])
+            os.replace(legacy_path, legacy_path + ".migrated")
+            logger.info(
+                "Migrated %d chunks from %s into segmented store",
+                len(chunks),
+                legacy_path,
+            )
+        except Exception as exc:  # pragma: no cover - corrupted legacy file
+            logger.error("Error migrating legacy chunks file: %s", exc)
+
+    # -- reads -----------------------------------------------------------
+
+    def _locate(self, row_id: int) -> Tuple[int, int, int]:
+        offsets = self._load_offsets()
+        if row_id < 0 or row_id >= len(offsets) // _OFFSET_RECORD.size:
+            raise IndexError(f"chunk row {row_id} out of range")
+        return _OFFSET_RECORD.unpack_from(offsets, row_id * _OFFSET_RECORD.size)
+
+    def get(self, row_id: int) -> Tuple[str, Dict[str, Any]]:
+        """Return ``(text, metadata)`` for a single row."""
+        return self.get_many([row_id])[0]
+
+    def get_many(
+        self, row_ids: Sequence[int]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Return ``(text, metadata)`` for each row id, in the given order."""
+        with self._lock:
+            located = [(i, self._locate(row_id)) for i, row_id in enumerate(row_ids)]
+        results: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * len(row_ids)
+        located.sort(key=lambda item: (item[1][0], item[1][1]))
+        handle = None
+        current_segment = None
+        try:
+            for i, (segment, offset, length) in located:
+                if segment != current_segment:
+                    if handle is not None:
+                        handle.close()
+                    handle = open(self._segment_path(segment), "rb")
+                    current_segment = segment
+                handle.seek(offset)
+                record = json.loads(handle.read(length))
+                results[i] = (record.get("text", ""), record.get("metadata", {}))
+        finally:
+            if handle is not None:
+                handle.close()
+        return results  # type: ignore[return-value]
+
+    def iter_rows(self, start: int = 0) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        """Stream ``(row_id, text, metadata)`` for live rows from ``start`` on, in order."""
+        with self._lock:
+            offsets = bytes(self._load_offsets())
+            deleted = set(self._load_tombstones())
+        handle = None
+        current_segment = None
+        try:
+            for row_id in range(start, len(offsets) // _OFFSET_RECORD.size):
+                if row_id in deleted:
+                    continue
+                segment, offset, length = _OFFSET_RECORD.unpack_from(
+                    offsets, row_id * _OFFSET_RECORD.size
+                )
+                if segment != current_segment:
+                    if handle is not None:
+                        handle.close()
+                    handle = open(self._segment_path(segment), "rb")
+                    current_segment = segment
+                handle.seek(offset)
+                record = json.loads(handle.read(length))
+                yield row_id, record.get("text", ""), record.get("metadata", {})
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def load_all(self) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """Return the text and metadata of all live chunks as two parallel lists."""
+        chunks: List[str] = []
+        metadata: List[Dict[str, Any]] = []
+        for _, text, meta in self.iter_rows():
+            chunks.append(text)
+            metadata.append(meta)
+        return chunks, metadata
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""Pluggable embedding backends for :mod:`gmail_chatbot`.
+
+A backend is a factory ``(model_name, cache_folder) -> embeddings`` where
+the embeddings object has the LangChain ``embed_documents`` and
+``embed_query`` methods. Backends are registered by name and selected with
+``VECTOR_EMBEDDING_BACKEND``:
+
+* ``torch``     - sentence-transformers on PyTorch (registered by
+  :mod:`gmail_chatbot.email_vector_db`)
+* ``onnx``      - the same model exported to ONNX, run by ONNX Runtime on
+  the CPU without importing torch
+* ``onnx-int8`` - the ONNX model with weights dynamically quantized to int8
+
+Vectors from different backends are close but not identical. The
+embedding cache is keyed per backend, and the index should be rebuilt
+(``--reindex``) after switching.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+EmbeddingFactory = Callable[[str, str], Any]
+
+# Default ONNX export shipped in the sentence-transformers model repos
+ONNX_MODEL_FILE = "onnx/model.onnx"
+ONNX_BATCH_SIZE = 32
+DEFAULT_MAX_SEQ_LENGTH = 256
+
+_BACKENDS: Dict[str, EmbeddingFactory] = {}
+
+
+def register_backend(name: str, factory: EmbeddingFactory) -> None:
+    """Make an embedding backend selectable by ``name``."""
+    _BACKENDS[name] = factory
+
+
+def available_backends() -> List[str]:
+    """Names of the registered embedding backends."""
+    return sorted(_BACKENDS)
+
+
+def create_embeddings(backend: str, model_name: str, cache_folder: str) -> Any:
+    """Create the embeddings object of ``backend`` for ``model_name``.
+
+    Raises:
+        ValueError: If no backend is registered under that name
+    """
+    factory = _BACKENDS.get(backend)
+    if factory is None:
+        raise ValueError(
+            f"Unknown embedding backend {backend!r}; expected one of {available_backends()}"
+        )
+    return factory(model_name, cache_folder)
+
+
+def cache_model_key(backend: str, model_name: str) -> str:
+    """Model name the embedding cache stores this backend's vectors under.
+
+    The torch backend keeps the bare model name so existing caches stay valid.
+    """
+    return model_name if backend == "torch" else f"{model_name}@{backend}"
+
+
+class OnnxEmbeddings:
+    """Sentence-transformers model run through ONNX Runtime.
+
+    ``model_name`` is a local directory or a Hugging Face repo id; bare
+    names such as ``all-MiniLM-L6-v2`` resolve to ``sentence-transformers/``.
+    Only the ONNX export and tokenizer files are downloaded. Token
+    embeddings are mean-pooled over the attention mask and L2-normalized
+    when the model ends in a ``Normalize`` module, matching
+    sentence-transformers. With ``quantize`` the weights are converted to
+    int8 once with ONNX Runtime's dynamic quantization and the result is
+    cached next to the download.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_folder: str,
+        quantize: bool = False,
+        batch_size: int = ONNX_BATCH_SIZE,
+        threads: int = 0,
+    ) -> None:
+        import numpy as np
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self._np = np
+        self.model_name = model_name
+        self.quantize = quantize
+        self.batch_size = max(1, batch_size)
+        model_dir = self._resolve_model_dir(model_name, cache_folder)
+
+        max_length = DEFAULT_MAX_SEQ_LENGTH
+        config_path = os.path.join(model_dir, "sentence_bert_config.json")
+        if os.path.exists(config_path):
+            with open(config_path, "r", encoding="utf-8") as f:
+                max_length = int(json.load(f).get("max_seq_length", max_length))
+        self.normalize = True
+        modules_path = os.path.join(model_dir, "modules.json")
+        if os.path.exists(modules_path):
+            with open(modules_path, "r", encoding="utf-8") as f:
+                self.normalize = any(
+                    module.get("type", "").endswith(".Normalize") for module in json.load(f)
+                )
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length)
+        self.tokenizer.enable_padding()
+
+        model_path = os.path.join(model_dir, ONNX_MODEL_FILE)
+        if quantize:
+            model_path = self._quantized_model(model_path, cache_folder, model_name)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            model_path, options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        logger.info("Loaded ONNX embedding model %s from %s", model_name, model_path)
+
+    @staticmethod
+    def _resolve_model_dir(model_name: str, cache_folder: str) -> str:
+        if os.path.isdir(model_name):
+            return model_name
+        from huggingface_hub import snapshot_download
+
+        repo_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        return snapshot_download(
+            repo_id,
+            cache_dir=cache_folder,
+            allow_patterns=[
+                ONNX_MODEL_FILE,
+                "tokenizer.json",
+                "sentence_bert_config.json",
+                "modules.json",
+            ],
+        )
+
+    @staticmethod
+    def _quantized_model(model_path: str, cache_folder: str, model_name: str) -> str:
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        target = os.path.join(cache_folder, "onnx-int8", slug, "model.int8.onnx")
+        if not os.path.exists(target):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            partial = target + ".partial"
+            quantize_dynamic(model_path, partial, weight_type=QuantType.QInt8)
+            os.replace(partial, target)
+            logger.info("Quantized %s to int8 at %s", model_name, target)
+        return target
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        np = self._np
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        # Similar lengths share a batch so little time goes into padding
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start : start + self.batch_size]
+            encodings = self.tokenizer.encode_batch([texts[i] for i in batch])
+            mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            feed = {
+                "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": mask,
+                "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+            }
+            tokens = self.session.run(
+                None, {name: value for name, value in feed.items() if name in self._input_names}
+            )[0]
+            weights = mask[:, :, None].astype(np.float32)
+            pooled = (tokens * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+            if self.normalize:
+                pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            for i, vector in zip(batch, pooled):
+                vectors[i] = vector.tolist()
+        return vectors  # type: ignore[return-value]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(list(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text])[0]
+
+
+register_backend("onnx", lambda model_name, cache_folder: OnnxEmbeddings(model_name, cache_folder))
+register_backend(
+    "onnx-int8",
+    lambda model_name, cache_folder: OnnxEmbeddings(model_name, cache_folder, quantize=True),
+)
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""Persistent embedding cache for :mod:`gmail_chatbot`."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from gmail_chatbot.disk_store import DiskStore, DiskStoreError
+
+try:  # pragma: no cover - optional dependency
+    from langchain_core.embeddings import Embeddings as _EmbeddingsBase
+except ImportError:  # pragma: no cover - langchain not installed
+    _EmbeddingsBase = object  # type: ignore[misc, assignment]
+
+logger = logging.getLogger(__name__)
+
+# Each record is a key digest followed by ``dim`` float32 values
+_DIGEST_BYTES = 16
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace so formatting-only differences share an entry."""
+    return " ".join(text.split())
+
+
+class EmbeddingCache:
+    """Size-bounded on-disk cache of embedding vectors.
+
+    Vectors live in fixed-size slots of a float32 file that is read through
+    ``mmap``; a journaled :class:`DiskStore` maps slots to their keys. Keys
+    are ``sha256(model, kind, normalized text)``, so document and query
+    embeddings of different models never collide.
+
+    Once ``max_entries`` slots are used the least recently used entry is
+    overwritten in place, so the file never grows past
+    ``max_entries * (16 + 4 * dim)`` bytes. Each slot starts with the
+    digest of its key, so a slot overwritten by another process reads as a
+    miss rather than a wrong vector.
+    """
+
+    def __init__(self, directory: str, model_name: str, max_entries: int = 50000) -> None:
+        self.directory = directory
+        self.model_name = model_name
+        self.max_entries = max(1, max_entries)
+        os.makedirs(directory, exist_ok=True)
+
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.data_path = os.path.join(directory, f"{slug}.f32")
+        self._slots_store = DiskStore(Path(directory) / f"{slug}.slots.json", journal=True)
+
+        self._lock = threading.Lock()
+        self._dim: Optional[int] = None
+        # key -> slot, least recently used first
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._mmap: Optional[mmap.mmap] = None
+        if not os.path.exists(self.data_path):
+            open(self.data_path, "wb").close()
+        self._file = open(self.data_path, "r+b")
+        self.hits = 0
+        self.misses = 0
+        self._load_slots()
+
+    # -- persistence -------------------------------------------------------
+
+    def _load_slots(self) -> None:
+        try:
+            data = self._slots_store.load()
+        except DiskStoreError as exc:
+            logger.warning("Ignoring unreadable embedding cache index: %s", exc)
+            return
+        self._dim = data.get("dim")
+        slots = [
+            (int(name[5:]), key) for name, key in data.items() if name.startswith("slot:")
+        ]
+        for slot, key in sorted(slots):
+            if slot < self.max_entries:
+                self._slots[key] = slot
+
+    @property
+    def _record_size(self) -> int:
+        return _DIGEST_BYTES + 4 * (self._dim or 0)
+
+    def _view(self, end: int) -> Optional[mmap.mmap]:
+        """Return a read-only map covering at least ``end`` bytes."""
+        if self._mmap is None or len(self._mmap) < end:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < end:
+                return None
+            if self._mmap is not None:
+                self._mmap.close()
+            self._mmap = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    # -- lookups -------------------------------------------------------------
+
+    def key(self, text: str, kind: str = "document") -> str:
+        """Cache key for ``text`` embedded as ``kind`` ("document"/"query")."""
+        payload = f"{self.model_name}\0{kind}\0{_normalize(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, texts: Sequence[str], kind: str = "document") -> List[Optional[List[float]]]:
+        """Return the cached vector for each text, or None where missing."""
+        keys = [self.key(text, kind) for text in texts]
+        results: List[Optional[List[float]]] = []
+        with self._lock:
+            for key in keys:
+                vector = self._read_unlocked(key)
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    self._slots.move_to_end(key)
+                results.append(vector)
+        return results
+
+    def get(self, text: str, kind: str = "document") -> Optional[List[float]]:
+        return self.get_many([text], kind)[0]
+
+    def _read_unlocked(self, key: str) -> Optional[List[float]]:
+        slot = self._slots.get(key)
+        if slot is None or not self._dim:
+            return None
+        start = slot * self._record_size
+        view = self._view(start + self._record_size)
+        if view is None or view[start : start + _DIGEST_BYTES] != bytes.fromhex(key)[:_DIGEST_BYTES]:
+            return None
+        values = array("f")
+        values.frombytes(view[start + _DIGEST_BYTES : start + self._record_size])
+        return values.tolist()
+
+    # -- writes --------------------------------------------------------------
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]], kind: str = "document") -> None:
+        """Store vectors for ``texts``, evicting least recently used entries."""
+        if not texts:
+            return
+        updates: Dict[str, Any] = {}
+        with self._lock:
+            if self._dim is None:
+                self._dim = len(vectors[0])
+                updates["dim"] = self._dim
+            for text, vector in zip(texts, vectors):
+                if len(vector) != self._dim:
+                    logger.warning(
+                        "Not caching %d-dim embedding in a %d-dim cache", len(vector), self._dim
+                    )
+                    continue
+                key = self.key(text, kind)
+                slot = self._slots.get(key)
+                if slot is None:
+                    if len(self._slots) < self.max_entries:
+                        slot = len(self._slots)
+                    else:
+                        _, slot = self._slots.popitem(last=False)
+                self._slots[key] = slot
+                self._slots.move_to_end(key)
+                self._file.seek(slot * self._record_size)
+                self._file.write(bytes.fromhex(key)[:_DIGEST_BYTES] + array("f", vector).tobytes())
+                updates[f"slot:{slot}"] = key
+            self._file.flush()
+        try:
+            self._slots_store.update_many(updates)
+        except DiskStoreError as exc:
+            logger.warning("Could not persist embedding cache index: %s", exc)
+
+    def put(self, text: str, vector: Sequence[float], kind: str = "document") -> None:
+        self.put_many([text], [vector], kind)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._slots),
+            "max_entries": self.max_entries,
+            "bytes": os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            self._file.close()
+
+
+class CachedEmbeddings(_EmbeddingsBase):
+    """Embeddings wrapper that serves repeated texts from an EmbeddingCache.
+
+    Drop-in for the LangChain embeddings object it wraps: other attributes
+    (``model_name`` etc.) are delegated to it.
+    """
+
+    def __init__(self, embeddings: Any, cache: EmbeddingCache) -> None:
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ("embeddings", "cache"):
+            raise AttributeError(name)
+        return getattr(self.embeddings, name)
+
+    def _embed_many(self, texts: List[str], kind: str) -> List[List[float]]:
+        vectors = self.cache.get_many(texts, kind)
+        missing: Dict[str, List[int]] = {}
+        for i, (text, vector) in enumerate(zip(texts, vectors)):
+            if vector is None:
+                missing.setdefault(text, []).append(i)
+        if missing:
+            new_texts = list(missing)
+            embedded = self.embeddings.embed_documents(new_texts)
+            self.cache.put_many(new_texts, embedded, kind)
+            for text, vector in zip(new_texts, embedded):
+                for i in missing[text]:
+                    vectors[i] = list(vector)
+        return vectors  # type: ignore[return-value]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed_many(texts, "document")
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self.cache.get(text, kind="query")
+        if vector is None:
+            vector = list(self.embeddings.embed_query(text))
+            self.cache.put(text, vector, kind="query")
+        return vector
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several queries, with one model call for the uncached ones."""
+        return self._embed_many(texts, "query")
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""FAISS index addressed by chunk-store row ids for :mod:`gmail_chatbot`.
+
+Replaces LangChain's ``FAISS`` vector store. That store pickles an
+``InMemoryDocstore`` holding every chunk next to the index, so loading it
+needs ``allow_dangerous_deserialization=True`` and costs O(chunks) at start.
+Here only the raw FAISS index is written; vector ``i`` is row ``i`` of the
+:class:`ChunkStore`, which serves text and metadata by offset.
+
+Readers can open the index read-only through ``mmap`` so that processes
+share the page cache and startup doesn't read the whole file.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - for type hints only
+    from gmail_chatbot.vector_db.chunk_store import ChunkStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChunkDocument:
+    """A search hit, shaped like LangChain's ``Document``."""
+
+    page_content: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    row_id: int = -1
+
+
+class FaissChunkIndex:
+    """A FAISS index whose vector positions are chunk-store row ids."""
+
+    def __init__(
+        self, index: Any, chunk_store: "ChunkStore", embeddings: Any = None, read_only: bool = False
+    ) -> None:
+        self.index = index
+        self.chunk_store = chunk_store
+        self.embeddings = embeddings
+        # Memory-mapped indexes must be reloaded with load() before adding
+        self.read_only = read_only
+
+    @property
+    def ntotal(self) -> int:
+        return int(self.index.ntotal)
+
+    @classmethod
+    def from_vectors(
+        cls, vectors: Sequence[Sequence[float]], chunk_store: "ChunkStore", embeddings: Any = None
+    ) -> "FaissChunkIndex":
+        """Build a flat L2 index holding ``vectors`` in row order."""
+        import faiss  # type: ignore
+
+        store = cls(None, chunk_store, embeddings)
+        store.index = faiss.IndexFlatL2(len(vectors[0]))
+        store.add_vectors(vectors)
+        return store
+
+    @classmethod
+    def load(
+        cls, path: str, chunk_store: "ChunkStore", embeddings: Any = None, mmap: bool = False
+    ) -> "FaissChunkIndex":
+        """Read an index written by :meth:`save` (or by LangChain's ``save_local``).
+
+        With ``mmap`` the file is mapped read-only instead of copied onto the
+        heap; index types FAISS can't map are read normally.
+        """
+        import faiss  # type: ignore
+
+        if mmap:
+            try:
+                flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+                return cls(faiss.read_index(path, flags), chunk_store, embeddings, read_only=True)
+            except Exception as exc:
+                logger.info("Memory-mapping %s failed, reading it instead: %s", path, exc)
+        return cls(faiss.read_index(path), chunk_store, embeddings)
+
+    def save(self, path: str) -> None:
+        """Write the index atomically; no docstore or pickle is written."""
+        import faiss  # type: ignore
+
+        tmp_path = f"{path}.tmp"
+        faiss.write_index(self.index, tmp_path)
+        os.replace(tmp_path, path)
+
+    def add_vectors(self, vectors: Sequence[Sequence[float]]) -> None:
+        """Append vectors; the caller appends their chunks to the chunk store."""
+        import numpy as np  # type: ignore
+
+        if self.read_only:
+            raise RuntimeError("cannot add vectors to a memory-mapped index")
+        if len(vectors):
+            self.index.add(np.asarray(vectors, dtype="float32"))
+
+    def search_vectors(self, query_vector: Any, k: int) -> List[Tuple[int, float]]:
+        """Return ``(row id, distance)`` pairs for a ``(1, dim)`` query array."""
+        distances, labels = self.index.search(query_vector, min(k, self.ntotal))
+        return [(int(i), float(d)) for i, d in zip(labels[0], distances[0]) if i >= 0]
+
+    def similarity_search_with_score(self, query: str, k: int = 4) -> List[Tuple[ChunkDocument, float]]:
+        """Embed ``query`` and return the ``k`` nearest live chunks with their distances.
+
+        Rows tombstoned in the chunk store are skipped; the search reaches
+        past them so up to ``k`` live chunks are still returned.
+        """
+        import numpy as np  # type: ignore
+
+        if not self.ntotal:
+            return []
+        query_vector = np.asarray([self.embeddings.embed_query(query)], dtype="float32")
+        deleted = self.chunk_store.deleted
+        hits = self.search_vectors(query_vector, k + len(deleted))
+        if deleted:
+            hits = [(row, distance) for row, distance in hits if row not in deleted]
+        hits = hits[:k]
+        records = self.chunk_store.get_many([row for row, _ in hits])
+        return [
+            (ChunkDocument(text, metadata, row), distance)
+            for (text, metadata), (row, distance) in zip(records, hits)
+        ]
+
+
+def legacy_docstore_path(index_path: str) -> Optional[str]:
+    """Path of the pickled LangChain docstore next to ``index_path``, if any."""
+    path = os.path.splitext(index_path)[0] + ".pkl"
+    return path if os.path.exists(path) else None
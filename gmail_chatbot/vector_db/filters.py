@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""Metadata posting lists for filter-aware search in :mod:`gmail_chatbot`."""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np  # type: ignore
+
+    np.isin  # stub modules without the array API count as missing
+except (ImportError, AttributeError):  # pragma: no cover - numpy not installed
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:  # pragma: no cover - for type hints only
+    from gmail_chatbot.vector_db.chunk_store import ChunkStore
+
+logger = logging.getLogger(__name__)
+
+SHARD_GRANULARITIES = ("month", "quarter")
+# Filters evaluated on MetadataColumns rather than posting lists
+COLUMN_FILTERS = ("sender", "recipient", "tags")
+# Bits per tag bitset word
+_TAG_WORD_BITS = 64
+
+
+def _hashable(value: Any) -> Any:
+    """Turn lists/dicts into tuples so they can key a posting list."""
+    if isinstance(value, list):
+        return tuple(_hashable(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    return value
+
+
+def parse_date(value: Any) -> Optional[datetime]:
+    """Parse an ISO date into UTC; naive values are taken as UTC so all compare."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+class TimeShards:
+    """Chunk rows partitioned by the month or quarter of their ``date``.
+
+    Each shard keeps its rows sorted by timestamp, so a date range only
+    touches the shards it overlaps and binary-searches the boundary ones.
+    Dates are parsed once, when a row is added. Rows whose date can't be
+    parsed match every range, as they do in ``_matches_filters``.
+    """
+
+    def __init__(self, granularity: str = "month") -> None:
+        if granularity not in SHARD_GRANULARITIES:
+            raise ValueError(
+                f"Unknown shard granularity {granularity!r}; expected one of {SHARD_GRANULARITIES}"
+            )
+        self.granularity = granularity
+        # shard key -> (sorted timestamps, row ids in the same order)
+        self._shards: Dict[str, Tuple[List[float], List[int]]] = {}
+        self.undated: List[int] = []
+
+    def shard_key(self, date: datetime) -> str:
+        if self.granularity == "quarter":
+            return f"{date.year:04d}-Q{(date.month - 1) // 3 + 1}"
+        return f"{date.year:04d}-{date.month:02d}"
+
+    def add(self, row_id: int, value: Any) -> None:
+        parsed = parse_date(value)
+        if parsed is None:
+            self.undated.append(row_id)
+            return
+        stamps, rows = self._shards.setdefault(self.shard_key(parsed), ([], []))
+        stamp = parsed.timestamp()
+        position = bisect.bisect_right(stamps, stamp)
+        stamps.insert(position, stamp)
+        rows.insert(position, row_id)
+
+    def rows_between(self, start: datetime, end: datetime) -> List[int]:
+        """Rows dated within ``[start, end]`` plus the undated rows."""
+        low, high = start.timestamp(), end.timestamp()
+        matched = list(self.undated)
+        for stamps, rows in self._shards.values():
+            if stamps[-1] < low or stamps[0] > high:
+                continue
+            matched.extend(
+                rows[bisect.bisect_left(stamps, low) : bisect.bisect_right(stamps, high)]
+            )
+        return matched
+
+    def all_rows(self) -> List[int]:
+        matched = list(self.undated)
+        for _, rows in self._shards.values():
+            matched.extend(rows)
+        return matched
+
+    def stats(self) -> Dict[str, Any]:
+        """Shard count, date span and rows per shard."""
+        keys = sorted(self._shards)
+        return {
+            "granularity": self.granularity,
+            "shards": len(keys),
+            "oldest": keys[0] if keys else None,
+            "newest": keys[-1] if keys else None,
+            "rows_per_shard": {key: len(self._shards[key][1]) for key in keys},
+            "undated_rows": len(self.undated),
+        }
+
+
+class MetadataColumns:
+    """Columnar copy of the filterable chunk metadata, one entry per row.
+
+    ``sender`` and ``recipient`` are stored as ids into a table of their
+    lowercased values (-1 when the field is missing) and ``tags`` as bitsets
+    over a tag vocabulary, in 64-bit words. The columns are stdlib arrays
+    filled as rows are indexed; filters are evaluated as NumPy masks over
+    candidate row ids, or row by row when NumPy isn't installed.
+    """
+
+    def __init__(self) -> None:
+        self._codes: Dict[str, Dict[str, int]] = {key: {} for key in ("sender", "recipient")}
+        self._ids: Dict[str, array] = {key: array("i") for key in ("sender", "recipient")}
+        self._tag_bits: Dict[Any, int] = {}
+        self._tag_words: List[array] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, metadata: Dict[str, Any]) -> None:
+        """Append the next row's metadata."""
+        for key, codes in self._codes.items():
+            value = metadata.get(key)
+            if isinstance(value, str):
+                code = codes.setdefault(value.lower(), len(codes))
+            else:
+                code = -1
+            self._ids[key].append(code)
+
+        words = [0] * len(self._tag_words)
+        tags = metadata.get("tags")
+        for tag in tags if isinstance(tags, list) else []:
+            bit = self._tag_bits.setdefault(_hashable(tag), len(self._tag_bits))
+            word, offset = divmod(bit, _TAG_WORD_BITS)
+            while word >= len(self._tag_words):
+                self._tag_words.append(array("Q", bytes(8 * self._size)))
+                words.append(0)
+            words[word] |= 1 << offset
+        for column, bits in zip(self._tag_words, words):
+            column.append(bits)
+        self._size += 1
+
+    def select(self, filters: Dict[str, Any], rows: Optional[List[int]] = None) -> List[int]:
+        """Return the sorted ids in ``rows`` (default: all rows) matching ``filters``.
+
+        ``filters`` may only hold :data:`COLUMN_FILTERS` keys. Sender and
+        recipient match case-insensitive substrings and ``tags`` any listed
+        tag, as in ``EmailVectorDB._matches_filters``.
+        """
+        wanted_ids: Dict[str, set] = {}
+        for key in ("sender", "recipient"):
+            if key in filters:
+                needle = filters[key].lower()
+                wanted_ids[key] = {
+                    code for value, code in self._codes[key].items() if needle in value
+                }
+        tag_mask: Optional[List[int]] = None
+        if "tags" in filters:
+            tag_mask = [0] * len(self._tag_words)
+            for tag in filters["tags"]:
+                bit = self._tag_bits.get(_hashable(tag))
+                if bit is not None:
+                    word, offset = divmod(bit, _TAG_WORD_BITS)
+                    tag_mask[word] |= 1 << offset
+
+        if any(not codes for codes in wanted_ids.values()) or (
+            tag_mask is not None and not any(tag_mask)
+        ):
+            return []
+        if np is None:
+            return self._select_rows(wanted_ids, tag_mask, rows)
+        return self._select_masked(wanted_ids, tag_mask, rows)
+
+    def _select_masked(
+        self, wanted_ids: Dict[str, set], tag_mask: Optional[List[int]], rows: Optional[List[int]]
+    ) -> List[int]:
+        ids = (
+            np.arange(self._size, dtype=np.int64)
+            if rows is None
+            else np.asarray(rows, dtype=np.int64)
+        )
+        mask = np.ones(len(ids), dtype=bool)
+        for key, codes in wanted_ids.items():
+            column = np.frombuffer(self._ids[key], dtype=np.int32)[: self._size]
+            mask &= np.isin(column[ids], np.fromiter(codes, dtype=np.int32, count=len(codes)))
+        if tag_mask is not None:
+            any_tag = np.zeros(len(ids), dtype=bool)
+            for column, bits in zip(self._tag_words, tag_mask):
+                if bits:
+                    words = np.frombuffer(column, dtype=np.uint64)[: self._size]
+                    any_tag |= (words[ids] & np.uint64(bits)) != 0
+            mask &= any_tag
+        return sorted(ids[mask].tolist())
+
+    def _select_rows(
+        self, wanted_ids: Dict[str, set], tag_mask: Optional[List[int]], rows: Optional[List[int]]
+    ) -> List[int]:
+        matched = []
+        for row in range(self._size) if rows is None else rows:
+            if any(self._ids[key][row] not in codes for key, codes in wanted_ids.items()):
+                continue
+            if tag_mask is not None and not any(
+                column[row] & bits for column, bits in zip(self._tag_words, tag_mask)
+            ):
+                continue
+            matched.append(row)
+        return sorted(matched)
+
+    def stats(self) -> Dict[str, Any]:
+        """Row count and distinct senders, recipients and tags."""
+        return {
+            "rows": self._size,
+            "senders": len(self._codes["sender"]),
+            "recipients": len(self._codes["recipient"]),
+            "tags": len(self._tag_bits),
+            "vectorized": np is not None,
+        }
+
+
+class MetadataFilterIndex:
+    """In-memory metadata index from filter values to chunk row ids.
+
+    Exact-match keys (``email_id``, ``date`` and any other field) keep
+    posting lists of ``value -> [row ids]``. ``date_range`` filters are
+    answered from :class:`TimeShards` partitioned by ``shard_by`` (``month``
+    or ``quarter``). Those narrow the candidates first; sender, recipient
+    and tag filters are then evaluated on :class:`MetadataColumns` over the
+    remaining row ids.
+
+    The index is built lazily from the chunk store and catches up with rows
+    appended since the last call. It rebuilds after ``ChunkStore.clear``.
+    Deleted rows stay in the postings and are dropped from every result.
+    """
+
+    def __init__(self, chunk_store: "ChunkStore", shard_by: str = "month") -> None:
+        self.chunk_store = chunk_store
+        self.shard_by = shard_by
+        self._time_shards = TimeShards(shard_by)
+        self._columns = MetadataColumns()
+        self._postings: Dict[str, Dict[Any, List[int]]] = {}
+        self._size = 0
+        self._epoch: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _sync(self) -> None:
+        """Index rows appended since the last sync. Caller holds the lock."""
+        total = len(self.chunk_store)
+        if self._epoch != self.chunk_store.epoch or self._size > total:
+            self._postings = {}
+            self._time_shards = TimeShards(self.shard_by)
+            self._columns = MetadataColumns()
+            self._size = 0
+            self._epoch = self.chunk_store.epoch
+        if self._size < total:
+            for row_id, _, metadata in self.chunk_store.iter_rows(self._size):
+                self._add(row_id, metadata)
+            self._size = total
+
+    def _add(self, row_id: int, metadata: Dict[str, Any]) -> None:
+        if "date" in metadata:
+            self._time_shards.add(row_id, metadata["date"])
+        self._columns.add(metadata)
+        for key, value in metadata.items():
+            if key not in COLUMN_FILTERS:
+                self._postings.setdefault(key, {}).setdefault(_hashable(value), []).append(row_id)
+
+    def candidates(self, filters: Dict[str, Any]) -> Optional[List[int]]:
+        """Return the sorted row ids whose metadata matches ``filters``.
+
+        Args:
+            filters: Filter criteria as accepted by ``EmailVectorDB.search``
+
+        Returns:
+            Sorted list of matching row ids, or None if the filters could not
+            be resolved from the index (callers should post-filter instead)
+        """
+        with self._lock:
+            try:
+                self._sync()
+                matched: Optional[set] = None
+                for key, wanted in filters.items():
+                    if key in COLUMN_FILTERS:
+                        continue
+                    if key == "date_range":
+                        rows = set(self._date_range_rows(wanted))
+                    else:
+                        rows = set(self._postings.get(key, {}).get(_hashable(wanted), []))
+                    matched = rows if matched is None else matched & rows
+                    if not matched:
+                        return []
+                deleted = self.chunk_store.deleted
+                if matched is None:
+                    candidates = (
+                        [row for row in range(self._size) if row not in deleted]
+                        if deleted
+                        else None
+                    )
+                else:
+                    candidates = sorted(matched - deleted)
+                column_filters = {k: v for k, v in filters.items() if k in COLUMN_FILTERS}
+                if column_filters:
+                    return self._columns.select(column_filters, candidates)
+                return list(range(self._size)) if candidates is None else candidates
+            except Exception as exc:
+                logger.warning("Could not resolve filters %s from index: %s", filters, exc)
+                return None
+
+    def _date_range_rows(self, wanted: Any) -> List[int]:
+        """Rows for a ``[start, end]`` filter; an unparseable one keeps all dated rows."""
+        try:
+            bounds = [parse_date(value) for value in wanted] if len(wanted) == 2 else []
+        except TypeError:
+            bounds = []
+        if len(bounds) != 2 or None in bounds:
+            return self._time_shards.all_rows()
+        return self._time_shards.rows_between(bounds[0], bounds[1])
+
+    def shard_stats(self) -> Dict[str, Any]:
+        """Time shard layout as of the last filtered search (not synced here)."""
+        with self._lock:
+            return self._time_shards.stats()
+
+    def column_stats(self) -> Dict[str, Any]:
+        """Metadata column counts as of the last filtered search (not synced here)."""
+        with self._lock:
+            return self._columns.stats()
+
+    def rows_for(self, key: str, value: Any) -> List[int]:
+        """Return the live row ids whose ``key`` metadata equals ``value``."""
+        with self._lock:
+            self._sync()
+            rows = self._postings.get(key, {}).get(_hashable(value), [])
+            deleted = self.chunk_store.deleted
+            return [row for row in rows if row not in deleted]
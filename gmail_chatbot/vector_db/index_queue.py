@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""Durable background indexing queue for :mod:`gmail_chatbot`.
+
+Embedding and FAISS writes are too slow for the request path. Emails are
+journaled here and indexed in batches by a daemon worker thread, so a chat
+turn only pays for one journal append.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from gmail_chatbot.disk_store import DiskStore, DiskStoreError
+
+logger = logging.getLogger(__name__)
+
+IndexFunction = Callable[[List[Dict[str, Any]]], Dict[str, bool]]
+
+
+class IndexingQueue:
+    """Queue of emails waiting to be embedded and indexed.
+
+    Pending emails are journaled to a :class:`DiskStore` keyed by email id,
+    so a newer version of a pending email replaces the older one and work
+    left over from a crash is picked up on the next start. The worker waits
+    up to ``batch_delay`` seconds for a batch to fill, then hands up to
+    ``batch_size`` emails to ``index_fn``, which returns whether each email
+    was indexed. If ``index_fn`` raises, the batch is retried after
+    ``retry_delay`` seconds. Emails it reports as not indexed stay in the
+    journal and are retried on their own with exponential backoff, starting
+    at ``retry_delay`` and capped at ``max_retry_delay``. After
+    ``max_attempts`` failures an email is parked: it stays in the journal,
+    is counted as ``failed``, and gets another round on the next start or
+    when it is queued again.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        index_fn: IndexFunction,
+        batch_size: int = 32,
+        batch_delay: float = 0.5,
+        retry_delay: float = 5.0,
+        max_attempts: int = 5,
+        max_retry_delay: float = 300.0,
+    ) -> None:
+        self.index_fn = index_fn
+        self.batch_size = max(1, batch_size)
+        self.batch_delay = batch_delay
+        self.retry_delay = retry_delay
+        self.max_attempts = max(1, max_attempts)
+        self.max_retry_delay = max_retry_delay
+        self._store: DiskStore[Dict[str, Any]] = DiskStore(Path(path), journal=True)
+        self._cond = threading.Condition()
+        # email id -> {"email": record, "enqueued_at": epoch seconds}, oldest first;
+        # retried emails also carry "attempts" and "retry_at" (epoch seconds)
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, Dict[str, Any]] = {}
+        # Emails that used up their attempts; kept in the journal until the next start
+        self._parked: Dict[str, Dict[str, Any]] = {}
+        self._worker: Optional[threading.Thread] = None
+        self._stopping = False
+        self._flushing = 0
+        self.indexed = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_batch_seconds: Optional[float] = None
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = self._store.load()
+        except DiskStoreError as exc:
+            logger.warning("Ignoring unreadable indexing queue: %s", exc)
+            return
+        entries = [
+            (email_id, entry)
+            for email_id, entry in data.items()
+            if isinstance(entry, dict) and "email" in entry
+        ]
+        for email_id, entry in sorted(entries, key=lambda item: item[1].get("enqueued_at", 0)):
+            # Every email, parked ones included, gets a fresh set of attempts
+            self._pending[email_id] = {"email": entry["email"], "enqueued_at": entry.get("enqueued_at", 0)}
+        if self._pending:
+            logger.info("Resuming %d queued emails from %s", len(self._pending), self._store.path)
+            with self._cond:
+                self._ensure_worker()
+
+    # -- producer side -----------------------------------------------------
+
+    def enqueue(self, emails: Iterable[Dict[str, Any]]) -> int:
+        """Queue emails for indexing and return how many were queued.
+
+        Each email needs an ``email_id``; one already pending is replaced
+        but keeps its place (and age) in the queue.
+        """
+        now = time.time()
+        updates: Dict[str, Any] = {}
+        with self._cond:
+            for email in emails:
+                email_id = email.get("email_id")
+                if not email_id:
+                    logger.warning("Not queueing email without an ID")
+                    continue
+                previous = (
+                    self._pending.get(email_id)
+                    or self._inflight.get(email_id)
+                    or self._parked.pop(email_id, None)
+                )
+                entry = {
+                    "email": email,
+                    "enqueued_at": previous["enqueued_at"] if previous else now,
+                }
+                self._pending[email_id] = entry
+                updates[email_id] = entry
+            if not updates:
+                return 0
+            try:
+                self._store.update_many(updates)
+            except DiskStoreError as exc:
+                logger.warning("Could not persist indexing queue: %s", exc)
+            self._ensure_worker()
+            self._cond.notify_all()
+        return len(updates)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Index everything queued so far without waiting for batches to fill.
+
+        Emails waiting to be retried are not hurried; the queue drains once
+        each is indexed or parked. While ``index_fn`` keeps raising it can't
+        drain at all, so pass a ``timeout`` where that matters.
+
+        Returns:
+            True if the queue drained, False if ``timeout`` expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flushing += 1
+            self._ensure_worker()
+            self._cond.notify_all()
+            try:
+                while self._pending or self._inflight:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                return True
+            finally:
+                self._flushing -= 1
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker after its current batch; pending emails stay on disk."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    # -- status --------------------------------------------------------------
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._pending) + len(self._inflight)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, age of the oldest queued email and worker counters."""
+        with self._cond:
+            waiting = list(self._pending.values()) + list(self._inflight.values())
+            oldest = min((entry["enqueued_at"] for entry in waiting), default=None)
+            return {
+                "depth": len(waiting),
+                "lag_seconds": round(time.time() - oldest, 3) if oldest is not None else 0.0,
+                "retrying": sum(1 for entry in self._pending.values() if entry.get("attempts")),
+                "indexed": self.indexed,
+                "failed": self.failed,
+                "parked": len(self._parked),
+                "batches": self.batches,
+                "last_batch_seconds": self.last_batch_seconds,
+                "worker_alive": bool(self._worker and self._worker.is_alive()),
+            }
+
+    # -- worker ----------------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread; the caller holds ``_cond``."""
+        if self._stopping or (self._worker is not None and self._worker.is_alive()):
+            return
+        self._worker = threading.Thread(target=self._run, name="vector-indexer", daemon=True)
+        self._worker.start()
+
+    def _next_batch(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Block until a batch is due and claim it; None when stopping."""
+        with self._cond:
+            while not self._stopping:
+                retry_in = self._retry_in()
+                if retry_in <= 0:
+                    break
+                self._cond.wait(retry_in if retry_in != float("inf") else None)
+            # Let more emails arrive so they share one embedding pass
+            deadline = time.monotonic() + self.batch_delay
+            while len(self._pending) < self.batch_size and not self._flushing and not self._stopping:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            if self._stopping:
+                return None
+            now = time.time()
+            batch_ids = [
+                email_id
+                for email_id, entry in self._pending.items()
+                if entry.get("retry_at", 0) <= now
+            ][: self.batch_size]
+            batch = {email_id: self._pending.pop(email_id) for email_id in batch_ids}
+            self._inflight = batch
+            return batch
+
+    def _retry_in(self) -> float:
+        """Seconds until a pending email is due (inf if none); caller holds ``_cond``."""
+        now = time.time()
+        wait = float("inf")
+        for entry in self._pending.values():
+            wait = min(wait, entry.get("retry_at", 0) - now)
+            if wait <= 0:
+                break
+        return wait
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.max_retry_delay, self.retry_delay * 2 ** (attempts - 1))
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            started = time.perf_counter()
+            try:
+                results: Optional[Dict[str, bool]] = self.index_fn(
+                    [entry["email"] for entry in batch.values()]
+                )
+            except Exception as exc:
+                logger.error("Indexing %d queued emails failed, retrying: %s", len(batch), exc)
+                results = None
+
+            with self._cond:
+                self._inflight = {}
+                if results is None:
+                    # Back to the front of the queue unless a newer version arrived
+                    for email_id, entry in reversed(list(batch.items())):
+                        if email_id not in self._pending:
+                            self._pending[email_id] = entry
+                            self._pending.move_to_end(email_id, last=False)
+                    self._cond.notify_all()
+                    self._cond.wait(self.retry_delay)
+                    continue
+
+                self.batches += 1
+                self.last_batch_seconds = round(time.perf_counter() - started, 3)
+                done: List[str] = []
+                retries: Dict[str, Dict[str, Any]] = {}
+                now = time.time()
+                for email_id, entry in batch.items():
+                    if results.get(email_id, False):
+                        self.indexed += 1
+                        # Re-queued emails keep their newer journal entry
+                        if email_id not in self._pending:
+                            done.append(email_id)
+                        continue
+                    if email_id in self._pending:
+                        continue  # A newer version is queued and replaces this one
+                    attempts = entry.get("attempts", 0) + 1
+                    entry = dict(entry, attempts=attempts, retry_at=now + self._backoff(attempts))
+                    retries[email_id] = entry
+                    if attempts >= self.max_attempts:
+                        self.failed += 1
+                        self._parked[email_id] = entry
+                        logger.error(
+                            "Email %s was not indexed after %d attempts; parked until restart",
+                            email_id,
+                            attempts,
+                        )
+                    else:
+                        self._pending[email_id] = entry
+                try:
+                    if done:
+                        self._store.delete_many(done)
+                    if retries:
+                        self._store.update_many(retries)
+                except DiskStoreError as exc:
+                    logger.warning("Could not persist indexing queue: %s", exc)
+                self._cond.notify_all()
@@ -3,10 +3,11 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import traceback
-from typing import List, Dict, Any, TYPE_CHECKING
+from typing import List, Dict, Any, Optional, Sequence, TYPE_CHECKING
+
+from gmail_chatbot.vector_db.faiss_store import FaissChunkIndex
 
 if TYPE_CHECKING:  # pragma: no cover - for type hints only
     from gmail_chatbot.email_vector_db import EmailVectorDB
@@ -14,41 +15,43 @@ if TYPE_CHECKING:  # pragma: no cover - for type hints only
 logger = logging.getLogger(__name__)
 
 
-def create_new_index(db: "EmailVectorDB", chunks: List[str], chunk_metadata: List[Dict[str, Any]]) -> None:
-    """Create a new FAISS index from provided chunks."""
-    try:
-        from langchain_community.vectorstores import FAISS
-    except Exception as exc:  # pragma: no cover - optional dependency
-        logger.error("FAISS import failed: %s", exc)
-        db.is_indexed = False
-        return
+def create_new_index(
+    db: "EmailVectorDB",
+    chunks: List[str],
+    chunk_metadata: List[Dict[str, Any]],
+    embeddings: Optional[Sequence[List[float]]] = None,
+) -> None:
+    """Create a new FAISS index from provided chunks.
 
+    When ``embeddings`` is given the vectors are used as-is instead of
+    embedding ``chunks`` again. The chunk store is rewritten so that row
+    ``i`` holds the chunk of vector ``i``.
+    """
     try:
-        db.active_db = FAISS.from_texts(chunks, db.embeddings, metadatas=chunk_metadata)
-        db.active_db.save_local(db.cache_dir, index_name=db.index_id)
-        db.chunks = chunks
-        db.chunk_metadata = chunk_metadata
-        chunks_path = db._get_chunks_path()
-        with open(chunks_path, "w", encoding="utf-8") as f:
-            json.dump({"chunks": db.chunks, "metadata": db.chunk_metadata}, f, indent=2)
+        if embeddings is None:
+            embeddings = db._embed_chunks(chunks)
+        db.active_db = FaissChunkIndex.from_vectors(embeddings, db.chunk_store, db.embeddings)
+        # Start flat; swap in HNSW/IVF-PQ if the policy asks
+        db._maybe_promote_index(embeddings)
+        db.chunk_store.clear()
+        db.chunk_store.append(chunks, chunk_metadata)
+        db._save_index()
+        db.chunks = list(chunks)
+        db.chunk_metadata = list(chunk_metadata)
+        db.chunks_loaded = True
         logger.info("Created new FAISS index with %d chunks", len(chunks))
         db.is_indexed = True
     except Exception as exc:  # pragma: no cover - index creation failure
         logger.error("Error creating FAISS index: %s", exc)
         traceback.print_exc()
+        db.active_db = None
         db.is_indexed = False
 
 
 def store_chunks_without_vectors(db: "EmailVectorDB", chunks: List[str], chunk_metadata: List[Dict[str, Any]]) -> None:
     """Persist chunks for keyword fallback when embeddings are unavailable."""
     try:
-        db.chunks = chunks if not db.chunks else db.chunks + chunks
-        db.chunk_metadata = (
-            chunk_metadata if not db.chunk_metadata else db.chunk_metadata + chunk_metadata
-        )
-        chunks_path = db._get_chunks_path()
-        with open(chunks_path, "w", encoding="utf-8") as f:
-            json.dump({"chunks": db.chunks, "metadata": db.chunk_metadata}, f, indent=2)
+        db._append_chunks(chunks, chunk_metadata)
         logger.info("Stored %d chunks without vector indexing", len(chunks))
     except Exception as exc:  # pragma: no cover - file system errors
         logger.error("Error storing chunks without vectors: %s", exc)
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""Resumable full reindex for :mod:`gmail_chatbot`.
+
+The new index is built in a shadow copy of the cache directory next to the
+live one, so searches keep using the old index until the new one is
+complete. Progress is checkpointed after every batch, and the finished
+shadow replaces the live directory with two renames.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TYPE_CHECKING
+
+from gmail_chatbot.disk_store import DiskStore, DiskStoreError
+
+if TYPE_CHECKING:  # pragma: no cover - for type hints only
+    from gmail_chatbot.email_vector_db import EmailVectorDB
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "reindex.checkpoint.json"
+
+ListEmailIds = Callable[[], Iterable[str]]
+LoadRecords = Callable[[List[str]], List[Dict[str, Any]]]
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+class Reindexer:
+    """Rebuild the index of an :class:`EmailVectorDB` from scratch.
+
+    Emails are read ``batch_size`` at a time through ``load_records`` and
+    indexed into ``<cache_dir>.reindex``. Each batch is written to the shadow
+    chunk store, index and email metadata before the checkpoint is updated.
+    A resumed run skips the emails the shadow already holds. If a run is
+    interrupted during the swap, the next run finishes the swap before it
+    does anything else.
+    """
+
+    def __init__(self, db: "EmailVectorDB", batch_size: int = 500) -> None:
+        self.db = db
+        self.batch_size = max(1, batch_size)
+        live = os.path.normpath(db.cache_dir)
+        self.live_dir = live
+        self.shadow_dir = live + ".reindex"
+        self.old_dir = live + ".old"
+
+    def _checkpoint_store(self, directory: str) -> DiskStore[Dict[str, Any]]:
+        return DiskStore(Path(directory) / CHECKPOINT_NAME)
+
+    def _read_checkpoint(self, directory: str) -> Dict[str, Any]:
+        if not os.path.exists(os.path.join(directory, CHECKPOINT_NAME)):
+            return {}
+        try:
+            checkpoint = self._checkpoint_store(directory).load()
+        except DiskStoreError as exc:
+            logger.warning("Ignoring unreadable reindex checkpoint: %s", exc)
+            return {}
+        checkpoint.pop("schema_version", None)
+        return checkpoint
+
+    def _write_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        checkpoint["updated_at"] = datetime.now().isoformat()
+        self._checkpoint_store(self.shadow_dir).save(dict(checkpoint))
+
+    # -- run -----------------------------------------------------------------
+
+    def run(
+        self,
+        list_email_ids: ListEmailIds,
+        load_records: LoadRecords,
+        resume: bool = False,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """Build a new index from all emails and swap it in.
+
+        Args:
+            list_email_ids: Returns the IDs of every email to index. It is
+                called again after the first pass so emails stored during
+                the build are included
+            load_records: Returns records for ``add_emails`` for a batch of IDs
+            resume: Continue an interrupted reindex instead of starting over
+            progress: Called after each batch with the progress report
+
+        Returns:
+            The final progress report
+        """
+        self.recover()
+        checkpoint = self._read_checkpoint(self.shadow_dir) if resume else {}
+        if checkpoint.get("state") != "building":
+            if resume:
+                logger.info("No interrupted reindex to resume, starting a new one")
+            shutil.rmtree(self.shadow_dir, ignore_errors=True)
+            os.makedirs(self.shadow_dir)
+            checkpoint = {
+                "state": "building",
+                "started_at": datetime.now().isoformat(),
+                "seconds": 0.0,
+            }
+            self._write_checkpoint(checkpoint)
+        else:
+            logger.info("Resuming reindex started at %s", checkpoint.get("started_at"))
+
+        shadow = self._open_shadow()
+        failed: set = set()
+        previous_seconds = float(checkpoint.get("seconds", 0.0))
+        started = time.monotonic()
+        done_at_start = len(shadow.email_metadata)
+
+        report: Dict[str, Any] = {}
+        for _ in range(2):
+            email_ids = list(dict.fromkeys(list_email_ids()))
+            remaining = [
+                email_id
+                for email_id in email_ids
+                if email_id not in shadow.email_metadata and email_id not in failed
+            ]
+            for start in range(0, len(remaining), self.batch_size):
+                batch = remaining[start : start + self.batch_size]
+                results = shadow.add_emails(load_records(batch))
+                failed.update(email_id for email_id in batch if not results.get(email_id))
+
+                elapsed = time.monotonic() - started
+                checkpoint["seconds"] = round(previous_seconds + elapsed, 3)
+                self._write_checkpoint(checkpoint)
+                report = self._report(
+                    len(email_ids), len(shadow.email_metadata), len(failed),
+                    len(shadow.email_metadata) - done_at_start, elapsed, checkpoint,
+                )
+                logger.info(
+                    "Reindexed %d/%d emails (%d failed), %.1f emails/s, ETA %s",
+                    report["indexed"], report["total"], report["failed"],
+                    report["emails_per_second"], _format_eta(report["eta_seconds"]),
+                )
+                if progress is not None:
+                    progress(report)
+            if not report:
+                report = self._report(
+                    len(email_ids), len(shadow.email_metadata), len(failed), 0,
+                    time.monotonic() - started, checkpoint,
+                )
+
+        self._publish(shadow)
+        checkpoint["state"] = "swapping"
+        self._write_checkpoint(checkpoint)
+        self.recover()
+        report["seconds"] = round(previous_seconds + time.monotonic() - started, 3)
+        logger.info(
+            "Reindex complete: %d emails indexed, %d failed in %.1fs",
+            report["indexed"], report["failed"], report["seconds"],
+        )
+        return report
+
+    @staticmethod
+    def _report(
+        total: int,
+        indexed: int,
+        failed: int,
+        indexed_this_run: int,
+        elapsed: float,
+        checkpoint: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        rate = indexed_this_run / elapsed if elapsed > 0 else 0.0
+        left = max(0, total - indexed - failed)
+        return {
+            "total": total,
+            "indexed": indexed,
+            "failed": failed,
+            "emails_per_second": round(rate, 2),
+            "eta_seconds": round(left / rate, 1) if rate > 0 else None,
+            "seconds": checkpoint["seconds"],
+            "started_at": checkpoint["started_at"],
+        }
+
+    def _open_shadow(self) -> "EmailVectorDB":
+        """Open the shadow copy, sharing the live database's embedding model."""
+        db = self.db
+        db.ensure_ready()
+        shadow = type(db)(
+            cache_dir=self.shadow_dir,
+            embedding_model=db.embedding_model_name,
+            embedding_backend=db.embedding_backend,
+            chunk_size=db.chunk_size,
+            chunk_overlap=db.chunk_overlap,
+            embedding_batch_size=db.embedding_batch_size,
+            lazy=True,
+            embedding_cache_size=0,
+            # Nothing is deleted from a fresh build
+            compact_dead_fraction=0,
+            index_type=db.index_type,
+            mmap_index=False,
+            query_cache_size=0,
+        )
+        # Unchanged chunk texts are served from the live embedding cache
+        shadow.embeddings = db.embeddings
+        shadow.vector_search_available = db.vector_search_available
+        shadow.readiness = db.readiness
+        return shadow
+
+    def _publish(self, shadow: "EmailVectorDB") -> None:
+        """Number the shadow's generation after the live one.
+
+        Processes that have the live index open see a newer generation
+        once the directories are swapped, and reload.
+        """
+        manifest = shadow._read_manifest()
+        live_generation = int(self.db._read_manifest().get("generation", 0))
+        manifest["generation"] = max(int(manifest.get("generation", 0)), live_generation) + 1
+        manifest.setdefault("file", None)
+        manifest["chunk_rows"] = len(shadow.chunk_store)
+        manifest["published_at"] = datetime.now().isoformat()
+        shadow._manifest_store.save(manifest)
+
+    # -- swap ----------------------------------------------------------------
+
+    def _is_index_file(self, name: str) -> bool:
+        return name.startswith(self.db.index_id + ".") or name.startswith(
+            os.path.basename(self.db._get_metadata_path())
+        )
+
+    def recover(self) -> bool:
+        """Finish or clean up after a swap, including an interrupted one.
+
+        Returns:
+            True if a finished shadow was swapped in
+        """
+        swapped = False
+        shadow_state = self._read_checkpoint(self.shadow_dir).get("state")
+        if shadow_state == "swapping":
+            with self.db._write_lock:
+                if os.path.isdir(self.live_dir):
+                    # Model files and the embedding cache stay with the live data
+                    for name in os.listdir(self.live_dir):
+                        target = os.path.join(self.shadow_dir, name)
+                        if not self._is_index_file(name) and not os.path.exists(target):
+                            os.replace(os.path.join(self.live_dir, name), target)
+                    shutil.rmtree(self.old_dir, ignore_errors=True)
+                    os.replace(self.live_dir, self.old_dir)
+                os.replace(self.shadow_dir, self.live_dir)
+                self.db.reload()
+            swapped = True
+        elif not os.path.isdir(self.live_dir) and os.path.isdir(self.old_dir):
+            # Renamed away but never replaced; put the old index back
+            os.replace(self.old_dir, self.live_dir)
+
+        shutil.rmtree(self.old_dir, ignore_errors=True)
+        if os.path.isdir(self.live_dir):
+            # The checkpoint (and its lock file) came along with the shadow
+            for name in os.listdir(self.live_dir):
+                if name.startswith(CHECKPOINT_NAME):
+                    os.remove(os.path.join(self.live_dir, name))
+        return swapped
+
+
+def _format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "unknown"
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{secs:02d}"
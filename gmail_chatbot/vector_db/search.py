@@ -3,93 +3,727 @@
 
 from __future__ import annotations
 
+import copy
 import json
 import logging
-import os
+import math
+import threading
 import traceback
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, List, Dict, Any, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover
     from gmail_chatbot.email_vector_db import EmailVectorDB
 
 logger = logging.getLogger(__name__)
 
+# Restrict the FAISS search to the filter's candidate ids when the filter keeps
+# at most this fraction of the index; above it, over-fetching is cheaper
+PREFILTER_MAX_SELECTIVITY = 0.25
+
+# Extra neighbours requested on top of k / selectivity when over-fetching
+OVERFETCH_FACTOR = 1.5
+
+# On HNSW and IVF-PQ indexes, filtered searches over at most this many
+# candidates compare the query with every candidate vector
+EXACT_SUBSET_MAX_ROWS = 20_000
+
+# Upper bound for efSearch when it is widened for a selective filter
+MAX_FILTERED_EF_SEARCH = 4096
+
+# Each retriever contributes this many candidates per requested hybrid result
+HYBRID_CANDIDATE_FACTOR = 3
+
+# Reciprocal rank fusion constant; larger values flatten the rank curve
+RRF_K = 60
+
+FUSION_METHODS = ("rrf", "weighted")
+
+SEARCH_MODES = ("vector", "hybrid")
+
+# Email-grouped search fetches this many chunks per wanted email at first
+EMAIL_OVERFETCH_FACTOR = 3
+
+# "max" ranks an email by its best chunk, "sum_top" by its best few chunks
+EMAIL_SCORING = ("max", "sum_top")
+EMAIL_SCORE_TOP_N = 3
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class QueryCache:
+    """Bounded LRU cache of search results for one index generation.
+
+    Entries are keyed on ``(normalized query, num_results, filters, mode)``.
+    The owner passes its current generation with every call; a lookup with a
+    generation other than the cached one drops all entries, so any add or
+    delete invalidates the cache.
+
+    Results are deep-copied going in and coming out, so callers may modify
+    what they get (``metadata`` included) without touching the cache.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, List[Dict[str, Any]]]" = OrderedDict()
+        self.generation: Optional[Hashable] = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(
+        query: str, num_results: int, filters: Optional[Dict[str, Any]], mode: str
+    ) -> Tuple:
+        """Cache key; queries differing only in whitespace share an entry."""
+        return (
+            " ".join(query.split()),
+            num_results,
+            json.dumps(filters or {}, sort_keys=True, default=str),
+            mode,
+        )
+
+    def get(self, key: Tuple, generation: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of the cached results, or None on a miss."""
+        with self._lock:
+            if generation != self.generation:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self.generation = generation
+            results = self._entries.get(key)
+            if results is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return copy.deepcopy(results)
+
+    def put(self, key: Tuple, generation: Hashable, results: List[Dict[str, Any]]) -> None:
+        """Cache results computed at ``generation``; stale ones are ignored."""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = copy.deepcopy(results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
 
 def keyword_search(
     db: "EmailVectorDB", query: str, num_results: int = 5, filters: Optional[Dict[str, Any]] = None
 ) -> List[Dict[str, Any]]:
-    """Fallback keyword-based search when vector search is unavailable."""
-    if not db.chunks:
-        chunks_path = db._get_chunks_path()
-        if os.path.exists(chunks_path):
-            try:
-                with open(chunks_path, "r", encoding="utf-8") as f:
-                    chunks_data = json.load(f)
-                    db.chunks = chunks_data.get("chunks", [])
-                    db.chunk_metadata = chunks_data.get("metadata", [])
-            except Exception as exc:  # pragma: no cover - corrupted file
-                logger.error("Error loading chunks for keyword search: %s", exc)
+    """Fallback BM25 keyword search when vector search is unavailable.
+
+    ``similarity`` is the IDF-weighted share of query terms a chunk contains,
+    so a chunk matching every term scores 1.0; ranking uses the BM25 score.
+    """
+    allowed = None
+    if filters:
+        candidates = db.filter_index.candidates(filters)
+        if candidates is not None:
+            if not candidates:
                 return []
-        else:
-            logger.warning("No chunks found for keyword search")
-            return []
+            allowed = set(candidates)
+    try:
+        # Without candidates, filters are applied to a full ranking below
+        k = None if filters and allowed is None else num_results
+        hits = db.keyword_index.search(query, k=k, allowed=allowed)
+        records = db.chunk_store.get_many([row for row, _, _ in hits])
+    except Exception as exc:  # pragma: no cover - corrupted segment
+        logger.error("Error in keyword search: %s", exc)
+        return []
 
     results: List[Dict[str, Any]] = []
-    query_terms = query.lower().split()
+    for (text, metadata), (row_id, score, coverage) in zip(records, hits):
+        if filters and allowed is None and not db._matches_filters(metadata, filters):
+            continue
+        results.append(
+            {
+                "content": text,
+                "metadata": metadata,
+                "similarity": coverage,
+                "bm25_score": score,
+                "row_id": row_id,
+                "search_type": "keyword",
+            }
+        )
+        if len(results) >= num_results:
+            break
+    return results
 
-    for i, chunk in enumerate(db.chunks):
-        if filters and i < len(db.chunk_metadata):
-            if not db._matches_filters(db.chunk_metadata[i], filters):
-                continue
-        chunk_lower = chunk.lower()
-        score = 0
-        for term in query_terms:
-            if term in chunk_lower:
-                score += 1 + chunk_lower.count(term) * 0.1
-        if score > 0:
-            metadata = db.chunk_metadata[i] if i < len(db.chunk_metadata) else {}
-            results.append(
-                {
-                    "content": chunk,
-                    "metadata": metadata,
-                    "similarity": min(1.0, score / len(query_terms)),
-                    "search_type": "keyword",
-                }
-            )
 
-    results.sort(key=lambda x: x["similarity"], reverse=True)
-    return results[:num_results]
+def _rows_to_results(db: "EmailVectorDB", hits: List[Tuple[int, float]]) -> List[Dict[str, Any]]:
+    """Turn ``(row id, distance)`` pairs into search results."""
+    records = db.chunk_store.get_many([row for row, _ in hits])
+    return [
+        {
+            "content": text,
+            "metadata": metadata,
+            "similarity": 1.0 - min(1.0, distance),
+            "row_id": row,
+            "search_type": "vector",
+        }
+        for (text, metadata), (row, distance) in zip(records, hits)
+    ]
 
 
-def search(
-    db: "EmailVectorDB", query: str, num_results: int = 5, filters: Optional[Dict[str, Any]] = None
+def _exact_subset_search(
+    index: Any, query_vectors: Any, k: int, candidates: List[int]
+) -> Optional[List[List[Tuple[int, float]]]]:
+    """Brute-force the ``k`` nearest ``candidates`` from vectors read back out of ``index``.
+
+    Distances are squared L2, as ``IndexFlatL2`` reports them. Returns None
+    when the index can't reconstruct its vectors (e.g. IVF-PQ without a
+    direct map).
+    """
+    try:
+        import numpy as np  # type: ignore
+
+        ids = np.asarray(candidates, dtype="int64")
+        if hasattr(index, "reconstruct_batch"):
+            vectors = index.reconstruct_batch(ids)
+        else:
+            vectors = np.vstack([index.reconstruct(int(row)) for row in ids])
+    except Exception as exc:
+        logger.debug("Exact subset scan unavailable: %s", exc)
+        return None
+
+    queries = np.asarray(query_vectors, dtype="float32")
+    distances = (
+        (queries ** 2).sum(axis=1)[:, None]
+        - 2 * queries @ vectors.T
+        + (vectors ** 2).sum(axis=1)[None, :]
+    )
+    k = min(k, len(ids))
+    nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    hits = []
+    for row_distances, columns in zip(distances, nearest):
+        columns = columns[np.argsort(row_distances[columns])]
+        hits.append([(int(ids[c]), max(0.0, float(row_distances[c]))) for c in columns])
+    return hits
+
+
+def _search_subset(
+    index: Any, query_vectors: Any, k: int, candidates: List[int]
+) -> Optional[List[List[Tuple[int, float]]]]:
+    """Search only ``candidates``.
+
+    A flat index searches them exactly through a FAISS ID selector. HNSW
+    and IVF-PQ only visit part of the index, so a selector keeps just the
+    candidates among the nodes they happen to reach: small candidate sets
+    are scanned exactly instead, and larger ones widen ``efSearch`` or
+    ``nprobe`` by the inverse of the share of rows the filter keeps.
+
+    Returns None when the installed FAISS or index type doesn't support
+    search-time selectors, so the caller can over-fetch instead.
+    """
+    approximate = hasattr(index, "hnsw") or hasattr(index, "nprobe")
+    if approximate and len(candidates) <= EXACT_SUBSET_MAX_ROWS:
+        hits = _exact_subset_search(index, query_vectors, k, candidates)
+        if hits is not None:
+            return hits
+    widen = index.ntotal / max(1, len(candidates))
+    try:
+        import faiss  # type: ignore
+        import numpy as np  # type: ignore
+
+        ids = np.asarray(candidates, dtype="int64")
+        try:
+            selector = faiss.IDSelectorBatch(ids)
+        except TypeError:  # older SWIG signature
+            selector = faiss.IDSelectorBatch(len(ids), faiss.swig_ptr(ids))
+        # IVF and HNSW indexes only accept their own parameter classes
+        if hasattr(index, "nprobe"):
+            nprobe = min(getattr(index, "nlist", index.nprobe), math.ceil(index.nprobe * widen))
+            params = faiss.SearchParametersIVF(sel=selector, nprobe=nprobe)
+        elif hasattr(index, "hnsw"):
+            ef_search = min(MAX_FILTERED_EF_SEARCH, math.ceil(max(index.hnsw.efSearch, k) * widen))
+            params = faiss.SearchParametersHNSW(sel=selector, efSearch=max(ef_search, k))
+        else:
+            params = faiss.SearchParameters(sel=selector)
+        distances, labels = index.search(query_vectors, k, params=params)
+    except Exception as exc:
+        logger.debug("ID-restricted FAISS search unavailable: %s", exc)
+        return None
+    return [
+        [(int(i), float(d)) for i, d in zip(label_row, distance_row) if i >= 0]
+        for label_row, distance_row in zip(labels, distances)
+    ]
+
+
+def _embed_queries(embeddings: Any, queries: List[str]) -> List[List[float]]:
+    """Embed ``queries`` with one model call.
+
+    The sentence-transformers models used here embed queries and documents
+    the same way, so plain embeddings batch through ``embed_documents``.
+    """
+    embed_queries = getattr(embeddings, "embed_queries", None)
+    if embed_queries is not None:
+        return embed_queries(queries)
+    return embeddings.embed_documents(queries)
+
+
+def _vector_search_batch(
+    db: "EmailVectorDB", query_vectors: Any, num_results: int, filters: Optional[Dict[str, Any]]
+) -> Optional[List[List[Dict[str, Any]]]]:
+    """Return live, filtered vector hits per query vector.
+
+    Each query gets ``num_results`` hits, or every matching live row when
+    fewer match. All queries go to FAISS in one ``search`` call. Selective
+    filters search only the candidate ids; broad filters (and searches over
+    an index with deleted rows) over-fetch by the inverse of the share of
+    rows kept, doubling for the queries that got too few hits up to the
+    whole index. Candidate searches that come back short on an approximate
+    index take the over-fetch path too.
+    Returns None when the index can't be aligned with the chunk store.
+    """
+    index = getattr(db.active_db, "index", None)
+    if index is None or index.ntotal != len(db.chunk_store):
+        return None
+    keep: Optional[Callable[[int], bool]] = None
+    candidates = None
+    if filters:
+        candidates = db.filter_index.candidates(filters)
+        if candidates is None:
+            return None
+        keep = set(candidates).__contains__
+        kept = len(candidates)
+    elif db.chunk_store.deleted:
+        deleted = db.chunk_store.deleted
+        keep = lambda row: row not in deleted  # noqa: E731
+        kept = index.ntotal - len(deleted)
+    else:
+        kept = index.ntotal
+    if not kept:
+        return [[] for _ in range(len(query_vectors))]
+
+    k = min(num_results, kept)
+    selectivity = kept / index.ntotal
+
+    if candidates is not None and selectivity <= PREFILTER_MAX_SELECTIVITY:
+        hits = _search_subset(index, query_vectors, k, candidates)
+        if hits is not None and all(len(query_hits) >= k for query_hits in hits):
+            return [_rows_to_results(db, query_hits) for query_hits in hits]
+
+    fetch_k = min(index.ntotal, max(k, math.ceil(k / selectivity * OVERFETCH_FACTOR)))
+    hits = [[] for _ in range(len(query_vectors))]
+    pending = list(range(len(query_vectors)))
+    while pending:
+        distances, labels = index.search(query_vectors[pending], fetch_k)
+        short = []
+        for i, label_row, distance_row in zip(pending, labels, distances):
+            hits[i] = [
+                (int(row), float(d))
+                for row, d in zip(label_row, distance_row)
+                if row >= 0 and (keep is None or keep(int(row)))
+            ]
+            if len(hits[i]) < k and fetch_k < index.ntotal:
+                short.append(i)
+        pending = short
+        fetch_k = min(index.ntotal, fetch_k * 2)
+    return [_rows_to_results(db, query_hits[:k]) for query_hits in hits]
+
+
+def _filtered_vector_search(
+    db: "EmailVectorDB", query: str, num_results: int, filters: Optional[Dict[str, Any]]
+) -> Optional[List[Dict[str, Any]]]:
+    """Vector hits for one query that are live and match ``filters``.
+
+    Returns None when :func:`_vector_search_batch` can't serve the query.
+    """
+    if getattr(db.active_db, "index", None) is None:
+        return None
+    import numpy as np  # type: ignore
+
+    query_vector = np.asarray([db.embeddings.embed_query(query)], dtype="float32")
+    results = _vector_search_batch(db, query_vector, num_results, filters)
+    return None if results is None else results[0]
+
+
+def _postfiltered_search(
+    db: "EmailVectorDB", query: str, num_results: int, filters: Dict[str, Any]
 ) -> List[Dict[str, Any]]:
-    """Search the vector database if available, otherwise fall back to keywords."""
+    """Over-fetch through the vector store and drop deleted or non-matching hits.
+
+    Used when the FAISS index can't be searched by row id (it isn't aligned
+    with the :class:`ChunkStore`, or the filter has no candidate list).
+    """
+    # Widen until enough hits match or the whole index was ranked
+    total = getattr(db.active_db, "ntotal", None) or len(db.chunk_store)
+    fetch_k = max(num_results, num_results * 4)
+    while True:
+        results = []
+        deleted = db.chunk_store.deleted
+        for doc, score in db.active_db.similarity_search_with_score(query, k=fetch_k):
+            if getattr(doc, "row_id", None) in deleted:
+                continue
+            if db._matches_filters(doc.metadata, filters):
+                results.append(
+                    {
+                        "content": doc.page_content,
+                        "metadata": doc.metadata,
+                        "similarity": 1.0 - min(1.0, score),
+                        "row_id": getattr(doc, "row_id", None),
+                        "search_type": "vector",
+                    }
+                )
+        if len(results) >= num_results or fetch_k >= total:
+            return results[:num_results]
+        fetch_k = min(total, fetch_k * 2)
+
+
+def _dense_search(
+    db: "EmailVectorDB", query: str, num_results: int, filters: Optional[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Vector search only; returns [] when it is unavailable or fails."""
+    if db.embeddings is None or db.active_db is None:
+        return []
     results: List[Dict[str, Any]] = []
-    if db.embeddings is not None and db.active_db is not None:
-        try:
-            logger.info("Performing vector search for query: %s", query)
+    try:
+        logger.info("Performing vector search for query: %s", query)
+        if filters or db.chunk_store.deleted:
+            # Deleted rows stay in FAISS until compaction, so skip them here
+            filtered = _filtered_vector_search(db, query, num_results, filters)
+            results = filtered if filtered is not None else _postfiltered_search(
+                db, query, num_results, filters or {}
+            )
+        else:
             vector_results = db.active_db.similarity_search_with_score(query, k=num_results)
             for doc, score in vector_results:
-                similarity = 1.0 - min(1.0, score)
-                content = doc.page_content
-                metadata = doc.metadata
-                if filters and not db._matches_filters(metadata, filters):
-                    continue
                 results.append(
                     {
-                        "content": content,
-                        "metadata": metadata,
-                        "similarity": similarity,
+                        "content": doc.page_content,
+                        "metadata": doc.metadata,
+                        "similarity": 1.0 - min(1.0, score),
+                        "row_id": getattr(doc, "row_id", None),
                         "search_type": "vector",
                     }
                 )
-            if results:
-                logger.info("Found %d results via vector search", len(results))
-                return results
-            logger.info("No vector search results, falling back to keyword search")
-        except Exception as exc:  # pragma: no cover - FAISS errors
-            logger.error("Error in vector search: %s", exc)
-            traceback.print_exc()
+    except Exception as exc:  # pragma: no cover - FAISS errors
+        logger.error("Error in vector search: %s", exc)
+        traceback.print_exc()
+        return []
+    return results
+
+
+def _dense_search_many(
+    db: "EmailVectorDB", queries: List[str], num_results: int, filters: Optional[Dict[str, Any]]
+) -> List[List[Dict[str, Any]]]:
+    """Vector search for several queries with one embedding call and one FAISS search."""
+    if db.embeddings is None or db.active_db is None or not queries:
+        return [[] for _ in queries]
+    try:
+        import numpy as np  # type: ignore
 
+        logger.info("Performing batched vector search for %d queries", len(queries))
+        query_vectors = np.asarray(_embed_queries(db.embeddings, list(queries)), dtype="float32")
+        results = _vector_search_batch(db, query_vectors, num_results, filters)
+    except Exception as exc:  # pragma: no cover - FAISS errors
+        logger.error("Error in batched vector search: %s", exc)
+        traceback.print_exc()
+        return [[] for _ in queries]
+    if results is None:
+        # Index not aligned with the chunk store; search one query at a time
+        return [_dense_search(db, query, num_results, filters) for query in queries]
+    return results
+
+
+def search(
+    db: "EmailVectorDB", query: str, num_results: int = 5, filters: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Search the vector database if available, otherwise fall back to keywords."""
+    results = _dense_search(db, query, num_results, filters)
+    if results:
+        logger.info("Found %d results via vector search", len(results))
+        return results
+    if db.embeddings is not None and db.active_db is not None:
+        logger.info("No vector search results, falling back to keyword search")
     return keyword_search(db, query, num_results, filters)
+
+
+def _result_key(result: Dict[str, Any]) -> Hashable:
+    """Identify the chunk behind a result so both retrievers' hits line up."""
+    if result.get("row_id") is not None:
+        return result["row_id"]
+    metadata = result.get("metadata", {})
+    return (metadata.get("email_id"), metadata.get("chunk_index"), result.get("content"))
+
+
+def fuse_results(
+    dense: List[Dict[str, Any]],
+    sparse: List[Dict[str, Any]],
+    num_results: int,
+    method: str = "rrf",
+    dense_weight: float = 0.5,
+    rrf_k: int = RRF_K,
+) -> List[Dict[str, Any]]:
+    """Merge dense and BM25 rankings into one list.
+
+    Args:
+        dense: Vector results, best first
+        sparse: Keyword results, best first
+        num_results: Number of fused results to return
+        method: ``rrf`` sums ``weight / (rrf_k + rank)`` per retriever;
+            ``weighted`` sums the weighted dense similarity and BM25 score
+            scaled by the best BM25 score
+        dense_weight: Weight of the dense retriever, the sparse one gets
+            ``1 - dense_weight``
+        rrf_k: Rank offset for reciprocal rank fusion
+
+    Returns:
+        Results ordered by ``fused_score``, each carrying the rank and score
+        of both components (None where a retriever missed the chunk).
+        ``similarity`` is the better of the dense similarity and the BM25
+        query-term coverage, so exact-term hits keep a high relevance.
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method {method!r}, expected one of {FUSION_METHODS}")
+
+    fused: Dict[Hashable, Dict[str, Any]] = {}
+
+    def entry(result: Dict[str, Any]) -> Dict[str, Any]:
+        return fused.setdefault(
+            _result_key(result),
+            {
+                "content": result["content"],
+                "metadata": result["metadata"],
+                "row_id": result.get("row_id"),
+                "dense_rank": None,
+                "dense_similarity": None,
+                "sparse_rank": None,
+                "sparse_score": None,
+                "sparse_coverage": None,
+                "search_type": "hybrid",
+            },
+        )
+
+    for rank, result in enumerate(dense, 1):
+        item = entry(result)
+        item["dense_rank"] = rank
+        item["dense_similarity"] = result["similarity"]
+    for rank, result in enumerate(sparse, 1):
+        item = entry(result)
+        item["sparse_rank"] = rank
+        item["sparse_score"] = result.get("bm25_score", result["similarity"])
+        item["sparse_coverage"] = result["similarity"]
+
+    sparse_weight = 1.0 - dense_weight
+    best_sparse = max((item["sparse_score"] or 0.0 for item in fused.values()), default=0.0)
+    for item in fused.values():
+        if method == "rrf":
+            score = 0.0
+            if item["dense_rank"] is not None:
+                score += dense_weight / (rrf_k + item["dense_rank"])
+            if item["sparse_rank"] is not None:
+                score += sparse_weight / (rrf_k + item["sparse_rank"])
+        else:
+            score = dense_weight * (item["dense_similarity"] or 0.0)
+            if best_sparse:
+                score += sparse_weight * (item["sparse_score"] or 0.0) / best_sparse
+        item["fused_score"] = round(score, 6)
+        item["similarity"] = max(item["dense_similarity"] or 0.0, item["sparse_coverage"] or 0.0)
+
+    ranked = sorted(fused.values(), key=lambda item: item["fused_score"], reverse=True)
+    return ranked[:num_results]
+
+
+def _hybrid_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hybrid-search")
+        return _executor
+
+
+def hybrid_search(
+    db: "EmailVectorDB",
+    query: str,
+    num_results: int = 5,
+    filters: Optional[Dict[str, Any]] = None,
+    method: str = "rrf",
+    dense_weight: float = 0.5,
+) -> List[Dict[str, Any]]:
+    """Run BM25 and vector retrieval concurrently and fuse their rankings.
+
+    The dense retriever (query embedding plus FAISS, which release the GIL)
+    runs on a worker thread while BM25 scores in the calling thread. Without
+    a vector index the result is the BM25 ranking alone.
+    """
+    k = num_results * HYBRID_CANDIDATE_FACTOR
+    dense_future = None
+    if db.embeddings is not None and db.active_db is not None:
+        dense_future = _hybrid_executor().submit(_dense_search, db, query, k, filters)
+    sparse = keyword_search(db, query, k, filters)
+    dense = dense_future.result() if dense_future is not None else []
+    results = fuse_results(dense, sparse, num_results, method, dense_weight)
+    logger.info(
+        "Hybrid search fused %d dense and %d keyword hits into %d results",
+        len(dense),
+        len(sparse),
+        len(results),
+    )
+    return results
+
+
+def search_many(
+    db: "EmailVectorDB",
+    queries: List[str],
+    num_results: int = 5,
+    filters: Optional[Dict[str, Any]] = None,
+) -> List[List[Dict[str, Any]]]:
+    """Run :func:`search` for each query, batching the vector search.
+
+    Queries without vector hits fall back to keyword search individually.
+    """
+    dense = _dense_search_many(db, queries, num_results, filters)
+    return [
+        results or keyword_search(db, query, num_results, filters)
+        for query, results in zip(queries, dense)
+    ]
+
+
+def hybrid_search_many(
+    db: "EmailVectorDB",
+    queries: List[str],
+    num_results: int = 5,
+    filters: Optional[Dict[str, Any]] = None,
+    method: str = "rrf",
+    dense_weight: float = 0.5,
+) -> List[List[Dict[str, Any]]]:
+    """Run :func:`hybrid_search` for each query, batching the vector search.
+
+    The batched dense search runs on a worker thread while every query is
+    scored with BM25 in the calling thread.
+    """
+    k = num_results * HYBRID_CANDIDATE_FACTOR
+    dense_future = None
+    if db.embeddings is not None and db.active_db is not None:
+        dense_future = _hybrid_executor().submit(_dense_search_many, db, queries, k, filters)
+    sparse = [keyword_search(db, query, k, filters) for query in queries]
+    dense = dense_future.result() if dense_future is not None else [[] for _ in queries]
+    return [
+        fuse_results(query_dense, query_sparse, num_results, method, dense_weight)
+        for query_dense, query_sparse in zip(dense, sparse)
+    ]
+
+
+def group_by_email(
+    results: List[Dict[str, Any]], scoring: str = "max", top_n: int = EMAIL_SCORE_TOP_N
+) -> List[Dict[str, Any]]:
+    """Collapse chunk results into one result per ``email_id``.
+
+    Args:
+        results: Chunk results, best first
+        scoring: ``max`` ranks an email by its best chunk; ``sum_top`` by the
+            sum of its ``top_n`` best chunks, favouring emails that match in
+            several places
+        top_n: Chunks summed per email with ``sum_top``
+
+    Returns:
+        Email results ordered by ``score``. Each carries the best chunk's
+        ``similarity``, its content as ``snippet`` and its ``metadata``, plus
+        the number of ``matched_chunks``.
+    """
+    if scoring not in EMAIL_SCORING:
+        raise ValueError(f"Unknown email scoring {scoring!r}, expected one of {EMAIL_SCORING}")
+
+    groups: Dict[Any, Dict[str, Any]] = {}
+    for result in results:
+        email_id = result["metadata"].get("email_id")
+        # Fused results rank by fused_score, whose scale differs from similarity
+        rank_score = result.get("fused_score", result["similarity"])
+        group = groups.get(email_id)
+        if group is None:
+            groups[email_id] = {
+                "email_id": email_id,
+                "similarity": result["similarity"],
+                "snippet": result["content"],
+                "metadata": result["metadata"],
+                "search_type": result.get("search_type", "vector"),
+                "matched_chunks": 1,
+                "_scores": [rank_score],
+            }
+        else:
+            group["matched_chunks"] += 1
+            group["_scores"].append(rank_score)
+            group["similarity"] = max(group["similarity"], result["similarity"])
+
+    for group in groups.values():
+        scores = sorted(group.pop("_scores"), reverse=True)
+        group["score"] = round(scores[0] if scoring == "max" else sum(scores[:top_n]), 6)
+    return sorted(groups.values(), key=lambda group: group["score"], reverse=True)
+
+
+def search_emails_many(
+    db: "EmailVectorDB",
+    queries: List[str],
+    limit: int = 5,
+    filters: Optional[Dict[str, Any]] = None,
+    mode: str = "vector",
+    scoring: str = "max",
+    min_similarity: float = 0.0,
+) -> List[List[Dict[str, Any]]]:
+    """Return up to ``limit`` distinct emails per query.
+
+    Chunks are fetched ``EMAIL_OVERFETCH_FACTOR`` per wanted email and
+    grouped by email. Emails whose best chunk is below ``min_similarity``
+    are dropped before the ``limit`` is applied. Queries still short of
+    ``limit`` emails are searched again with more chunks, scaled by how many
+    distinct emails the last round yielded, until the store is exhausted
+    (or vector hits, which come best first, fall below ``min_similarity``).
+    """
+    if scoring not in EMAIL_SCORING:
+        raise ValueError(f"Unknown email scoring {scoring!r}, expected one of {EMAIL_SCORING}")
+    live = db.chunk_store.live_count()
+    grouped: List[List[Dict[str, Any]]] = [[] for _ in queries]
+    fetch_k = [min(live, limit * EMAIL_OVERFETCH_FACTOR)] * len(queries)
+    pending = [i for i in range(len(queries)) if fetch_k[i] > 0]
+    while pending:
+        # Queries needing the same number of chunks are batched together
+        rounds: Dict[int, List[int]] = {}
+        for i in pending:
+            rounds.setdefault(fetch_k[i], []).append(i)
+        short = []
+        for k, members in rounds.items():
+            batches = db.search_many([queries[i] for i in members], k, filters, mode)
+            for i, results in zip(members, batches):
+                grouped[i] = [
+                    email
+                    for email in group_by_email(results, scoring)
+                    if email["similarity"] >= min_similarity
+                ]
+                found = len(grouped[i])
+                # Vector hits come best first, so past the threshold nothing more qualifies
+                exhausted = (
+                    bool(results)
+                    and results[-1].get("search_type") == "vector"
+                    and results[-1]["similarity"] < min_similarity
+                )
+                if found < limit and len(results) >= k and k < live and not exhausted:
+                    fetch_k[i] = min(live, max(2 * k, math.ceil(k * limit / max(found, 1))))
+                    short.append(i)
+        pending = short
+    return [emails[:limit] for emails in grouped]
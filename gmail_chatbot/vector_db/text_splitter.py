@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""Token-aware text splitting for :mod:`gmail_chatbot`.
+
+Text is cut into sentence, line and paragraph segments with one regex pass,
+and segments are packed into chunks measured in embedding-model tokens, so
+no chunk runs past the model's input window and is silently truncated.
+Segments keep their trailing whitespace, so the chunks of a text (minus
+their overlap) put back together give the text again.
+
+Token counts come from the embedding model's own tokenizer when one is
+bound (:meth:`TokenCounter.bind`); until then, or for models without an
+accessible tokenizer, they are estimated on the high side.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Segment boundaries: blank lines, line breaks and sentence ends
+_BOUNDARY_RE = re.compile(r"\n\s*\n\s*|\n\s*|(?<=[.!?])\s+")
+# Pieces an oversized segment is broken into
+_WORD_RE = re.compile(r"\S+\s*")
+# Estimated tokens: up to 5 letters, up to 3 digits, or one symbol each
+_ESTIMATE_RE = re.compile(r"[^\W\d_]{1,5}|\d{1,3}|[^\w\s]|_")
+# Longest text whose token count is memoized
+_CACHED_TEXT_CHARS = 64
+
+
+def estimate_tokens(text: str) -> int:
+    """Upper-bound guess of a WordPiece/BPE token count without a tokenizer.
+
+    Letter runs count one token per 5 characters and digit runs one per 3,
+    which over-counts ordinary English so estimated chunks stay in the
+    window.
+    """
+    return len(_ESTIMATE_RE.findall(text))
+
+
+def _batch_counter(tokenizer: Any) -> Optional[Callable[[List[str]], List[int]]]:
+    """Batch token counter for a ``tokenizers`` or ``transformers`` tokenizer."""
+    if hasattr(tokenizer, "encode_batch") and hasattr(tokenizer, "to_str"):
+        # tokenizers.Tokenizer: count on a copy without the model's truncation
+        from tokenizers import Tokenizer
+
+        untruncated = Tokenizer.from_str(tokenizer.to_str())
+        untruncated.no_truncation()
+        untruncated.no_padding()
+        return lambda texts: [
+            len(encoding.ids)
+            for encoding in untruncated.encode_batch(texts, add_special_tokens=False)
+        ]
+    if callable(tokenizer):
+        # transformers tokenizers only truncate when asked to
+        return lambda texts: [
+            len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]
+        ]
+    return None
+
+
+def embedding_tokenizer(embeddings: Any) -> Optional[Any]:
+    """The tokenizer behind an embeddings object, if it exposes one.
+
+    That is ``tokenizer`` on the ONNX backend and ``client.tokenizer`` on
+    LangChain's ``HuggingFaceEmbeddings``; :class:`CachedEmbeddings`
+    delegates both.
+    """
+    tokenizer = getattr(embeddings, "tokenizer", None)
+    if tokenizer is None:
+        tokenizer = getattr(getattr(embeddings, "client", None), "tokenizer", None)
+    return tokenizer
+
+
+class TokenCounter:
+    """Counts tokens in batches with a cached model tokenizer.
+
+    Falls back to :func:`estimate_tokens` until a tokenizer is bound.
+    Counts of short texts (the words of oversized segments, mostly) are
+    memoized, up to ``max_cached`` of them.
+    """
+
+    def __init__(self, max_cached: int = 100_000) -> None:
+        self._count_batch: Optional[Callable[[List[str]], List[int]]] = None
+        self._bound_to: Any = None
+        self._lock = threading.Lock()
+        self._cache: Dict[str, int] = {}
+        self.max_cached = max_cached
+
+    @property
+    def exact(self) -> bool:
+        return self._count_batch is not None
+
+    def bind(self, embeddings: Any) -> bool:
+        """Count with the tokenizer of ``embeddings``; True if it has one.
+
+        The counter is built once per embeddings object and reused.
+        """
+        with self._lock:
+            if embeddings is None or embeddings is self._bound_to:
+                return self.exact
+            self._bound_to = embeddings
+            self._cache = {}
+            tokenizer = embedding_tokenizer(embeddings)
+            try:
+                self._count_batch = _batch_counter(tokenizer) if tokenizer is not None else None
+            except Exception as exc:
+                logger.warning("Could not use the embedding tokenizer, estimating tokens: %s", exc)
+                self._count_batch = None
+            return self.exact
+
+    def count_many(self, texts: Sequence[str]) -> List[int]:
+        cache = self._cache
+        counts = [cache.get(text) for text in texts]
+        missing = [text for text, count in zip(texts, counts) if count is None]
+        if not missing:
+            return counts  # type: ignore[return-value]
+        fresh = iter(self._count(missing))
+        for i, count in enumerate(counts):
+            if count is None:
+                counts[i] = count = next(fresh)
+                if len(texts[i]) <= _CACHED_TEXT_CHARS:
+                    if len(cache) >= self.max_cached:
+                        cache.clear()
+                    cache[texts[i]] = count
+        return counts  # type: ignore[return-value]
+
+    def _count(self, texts: List[str]) -> List[int]:
+        count_batch = self._count_batch
+        if count_batch is not None:
+            try:
+                return count_batch(texts)
+            except Exception as exc:
+                logger.warning("Tokenizer failed, estimating tokens: %s", exc)
+        return [estimate_tokens(text) for text in texts]
+
+    def __call__(self, text: str) -> int:
+        return self.count_many([text])[0]
+
+
+class TokenTextSplitter:
+    """Pack sentence and paragraph segments into chunks of at most ``chunk_size`` tokens.
+
+    Segments are never cut unless one alone exceeds ``chunk_size``; it is
+    then split between words (and a single overlong word by characters).
+    Each chunk after the first starts with the last whole segments of the
+    previous chunk that fit in ``chunk_overlap`` tokens.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 240,
+        chunk_overlap: int = 40,
+        counter: Optional[TokenCounter] = None,
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = max(0, min(chunk_overlap, chunk_size // 2))
+        self.counter = counter or TokenCounter()
+
+    def split_text(self, text: str) -> List[str]:
+        """Split one text into chunks."""
+        return self.split_many([text])[0]
+
+    def split_many(self, texts: Sequence[str]) -> List[List[str]]:
+        """Split several texts, counting all their segments in one tokenizer call."""
+        segmented = [self._segments(text) if text else [] for text in texts]
+        counts = self.counter.count_many([s for segments in segmented for s in segments])
+        chunks: List[List[str]] = []
+        offset = 0
+        for segments in segmented:
+            sized = self._fit(list(zip(segments, counts[offset : offset + len(segments)])))
+            offset += len(segments)
+            chunks.append(self._pack(sized))
+        return chunks
+
+    @staticmethod
+    def _segments(text: str) -> List[str]:
+        segments = []
+        start = 0
+        for match in _BOUNDARY_RE.finditer(text):
+            if match.end() > start:
+                segments.append(text[start : match.end()])
+                start = match.end()
+        if start < len(text):
+            segments.append(text[start:])
+        return segments
+
+    def _fit(self, sized: List[tuple]) -> List[tuple]:
+        """Break segments longer than ``chunk_size`` into pieces that fit."""
+        if all(count <= self.chunk_size for _, count in sized):
+            return sized
+        fitted = []
+        for segment, count in sized:
+            if count <= self.chunk_size:
+                fitted.append((segment, count))
+                continue
+            words = _WORD_RE.findall(segment)
+            leading = segment[: len(segment) - len("".join(words))]
+            if leading:
+                words[0:0] = [leading]
+            for word, word_count in zip(words, self.counter.count_many(words)):
+                if word_count <= self.chunk_size:
+                    fitted.append((word, word_count))
+                else:
+                    fitted.extend(self._split_chars(word))
+        return fitted
+
+    def _split_chars(self, word: str) -> List[tuple]:
+        """Halve an overlong word until every part fits."""
+        if len(word) <= 1:
+            return [(word, self.counter(word))]
+        middle = len(word) // 2
+        parts = []
+        for part in (word[:middle], word[middle:]):
+            count = self.counter(part)
+            parts.extend(self._split_chars(part) if count > self.chunk_size else [(part, count)])
+        return parts
+
+    def _pack(self, sized: List[tuple]) -> List[str]:
+        chunks: List[str] = []
+        current: List[tuple] = []
+        total = 0
+        fresh = 0  # Segments in ``current`` not already emitted as overlap
+        for segment, count in sized:
+            if current and total + count > self.chunk_size:
+                chunks.append("".join(s for s, _ in current))
+                overlap: List[tuple] = []
+                kept = 0
+                for prior in reversed(current):
+                    if kept + prior[1] > self.chunk_overlap or kept + prior[1] + count > self.chunk_size:
+                        break
+                    overlap.insert(0, prior)
+                    kept += prior[1]
+                current, total, fresh = overlap, kept, 0
+            current.append((segment, count))
+            total += count
+            fresh += 1
+        if fresh:
+            chunks.append("".join(s for s, _ in current))
+        return [chunk.strip() for chunk in chunks if chunk.strip()]
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the embedding backends (torch, onnx, onnx-int8) on email-like text.
+
+Each backend runs in its own subprocess so load time and peak RSS are
+measured in isolation. Reported per backend: document throughput, single
+query latency, and agreement with the first backend listed (mean cosine of
+the two vectors for the same text, and top-k overlap of the documents
+retrieved for each query). Models are downloaded on first use:
+
+    python scripts/benchmark_embedding_backends.py --backends torch onnx onnx-int8
+"""
+
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Add project root directory to path to allow imports
+script_dir = Path(__file__).resolve().parent
+project_root = script_dir.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+WORDS = (
+    "invoice payment contract meeting budget review schedule project deadline "
+    "report client proposal travel expense approval shipment order renewal "
+    "lunch quarterly forecast hiring onboarding security audit release"
+).split()
+
+
+def make_texts(count: int, words: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=words)) for _ in range(count)]
+
+
+def run_backend(args: argparse.Namespace, backend: str, out_path: str) -> dict:
+    """Embed the corpus and queries with one backend (runs in the subprocess)."""
+    import numpy as np
+
+    # Registers the torch backend alongside the ONNX ones
+    from gmail_chatbot.email_vector_db import DEFAULT_CACHE_DIR
+    from gmail_chatbot.vector_db.embedding_backends import create_embeddings
+
+    documents = make_texts(args.documents, args.words, seed=0)
+    queries = make_texts(args.queries, 4, seed=1)
+
+    started = time.perf_counter()
+    embeddings = create_embeddings(backend, args.model, args.cache_dir or f"{DEFAULT_CACHE_DIR}/models")
+    embeddings.embed_query("warm up")
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    doc_vectors = []
+    for start in range(0, len(documents), args.batch_size):
+        doc_vectors.extend(embeddings.embed_documents(documents[start : start + args.batch_size]))
+    embed_seconds = time.perf_counter() - started
+
+    timings = []
+    query_vectors = []
+    for query in queries:
+        start = time.perf_counter()
+        query_vectors.append(embeddings.embed_query(query))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+
+    np.savez(out_path, documents=np.asarray(doc_vectors, dtype=np.float32),
+             queries=np.asarray(query_vectors, dtype=np.float32))
+    return {
+        "load_seconds": round(load_seconds, 2),
+        "documents_per_second": round(len(documents) / embed_seconds, 1),
+        "query_p50_ms": round(statistics.median(timings), 3),
+        "query_p95_ms": round(timings[int(0.95 * (len(timings) - 1))], 3),
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            / (1024 * 1024 if sys.platform == "darwin" else 1024),
+            1,
+        ) if resource else None,
+    }
+
+
+def agreement(reference: str, candidate: str, k: int) -> dict:
+    """Compare a backend's vectors and rankings with the reference backend."""
+    import numpy as np
+
+    ref, other = np.load(reference), np.load(candidate)
+
+    def unit(vectors):
+        return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+    cosine = (unit(ref["documents"]) * unit(other["documents"])).sum(axis=1)
+    ref_top = np.argsort(-unit(ref["queries"]) @ unit(ref["documents"]).T, axis=1)[:, :k]
+    other_top = np.argsort(-unit(other["queries"]) @ unit(other["documents"]).T, axis=1)[:, :k]
+    overlap = [len(set(a) & set(b)) / k for a, b in zip(ref_top.tolist(), other_top.tolist())]
+    return {
+        "mean_cosine": round(float(cosine.mean()), 5),
+        "min_cosine": round(float(cosine.min()), 5),
+        f"top{k}_overlap": round(statistics.fmean(overlap), 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"],
+                        help="Backends to compare; the first is the reference")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2", help="Embedding model")
+    parser.add_argument("--documents", type=int, default=2000, help="Synthetic chunks to embed")
+    parser.add_argument("--words", type=int, default=80, help="Words per chunk")
+    parser.add_argument("--queries", type=int, default=200, help="Single queries to time")
+    parser.add_argument("--batch-size", type=int, default=64, help="Chunks per embed_documents call")
+    parser.add_argument("--k", type=int, default=10, help="Top-k for retrieval agreement")
+    parser.add_argument("--cache-dir", help="Model download directory")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_backend(args, args.worker, args.out)))
+        return
+
+    forwarded = [
+        "--model", args.model, "--documents", str(args.documents), "--words", str(args.words),
+        "--queries", str(args.queries), "--batch-size", str(args.batch_size),
+    ] + (["--cache-dir", args.cache_dir] if args.cache_dir else [])
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = {}
+        for backend in args.backends:
+            outputs[backend] = str(Path(tmp) / f"{backend}.npz")
+            proc = subprocess.run(
+                [sys.executable, __file__, "--worker", backend, "--out", outputs[backend]] + forwarded,
+                capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                results[backend] = {"error": proc.stderr.strip().splitlines()[-1:]}
+                continue
+            results[backend] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+        reference = args.backends[0]
+        for backend in args.backends[1:]:
+            if "error" not in results[backend] and "error" not in results[reference]:
+                results[backend]["agreement_with_" + reference] = agreement(
+                    outputs[reference], outputs[backend], args.k
+                )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
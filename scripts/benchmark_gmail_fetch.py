@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark sequential vs concurrent message fetching in GmailAPIClient.search_emails.
+
+Uses an in-process fake Gmail service that sleeps to simulate network
+round trips, so no credentials or network access are needed:
+
+    python scripts/benchmark_gmail_fetch.py --messages 50 --latency 0.08
+"""
+
+import argparse
+import base64
+import json
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root directory to path to allow imports
+script_dir = Path(__file__).resolve().parent
+project_root = script_dir.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from gmail_chatbot import email_gmail_api
+from gmail_chatbot.email_gmail_api import GmailAPIClient
+
+
+class _Request:
+    """Mimics a googleapiclient HttpRequest: work happens on execute()."""
+
+    def __init__(self, latency: float, result: dict) -> None:
+        self.latency = latency
+        self.result = result
+
+    def execute(self) -> dict:
+        time.sleep(self.latency)
+        return self.result
+
+
+class FakeGmailService:
+    """Thread-safe stand-in for the ``users().messages()`` resource chain."""
+
+    def __init__(self, message_count: int, latency: float) -> None:
+        self.latency = latency
+        self.messages_by_id = {
+            f"msg{i:05d}": self._make_message(f"msg{i:05d}", i)
+            for i in range(message_count)
+        }
+
+    @staticmethod
+    def _make_message(msg_id: str, i: int) -> dict:
+        body = base64.urlsafe_b64encode(f"Body of message {i}".encode()).decode()
+        return {
+            'id': msg_id,
+            'threadId': f"thread{i}",
+            'snippet': f"Snippet {i}",
+            'payload': {
+                'headers': [
+                    {'name': 'Subject', 'value': f"Subject {i}"},
+                    {'name': 'From', 'value': 'sender@example.com'},
+                    {'name': 'To', 'value': 'me@example.com'},
+                    {'name': 'Date', 'value': 'Mon, 1 Jan 2024 09:00:00 +0000'},
+                ],
+                'body': {'data': body},
+            },
+        }
+
+    def users(self) -> "FakeGmailService":
+        return self
+
+    def messages(self) -> "FakeGmailService":
+        return self
+
+    def list(self, userId: str, q: str, maxResults: int) -> _Request:
+        ids = list(self.messages_by_id)[:maxResults]
+        return _Request(self.latency, {'messages': [{'id': i} for i in ids]})
+
+    def get(self, userId: str, id: str, **kwargs) -> _Request:
+        return _Request(self.latency, self.messages_by_id[id])
+
+
+def run(message_count: int, latency: float, workers: int, repeats: int) -> dict:
+    """Time search_emails for the given worker count.
+
+    Returns:
+        Dict with the best wall time over ``repeats`` runs
+    """
+    service = FakeGmailService(message_count, latency)
+    with patch.object(GmailAPIClient, '_authenticate', return_value=service), \
+            patch.object(email_gmail_api, 'MAX_EMAILS_PER_SEARCH', message_count), \
+            patch.object(email_gmail_api, 'log_gmail_request', return_value=None), \
+            patch.object(email_gmail_api, 'log_gmail_response', return_value=None):
+        client = GmailAPIClient(claude_client=None, system_message="")
+        client.fetch_workers = workers
+        client.message_cache = None  # Measure cold fetches only
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            emails, _ = client.search_emails("`in:inbox`")
+            timings.append(time.perf_counter() - start)
+            assert [e['id'] for e in emails] == list(service.messages_by_id)
+
+    return {
+        'workers': workers,
+        'messages': message_count,
+        'latency_s': latency,
+        'best_s': round(min(timings), 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=25, help='Messages returned by the search')
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated round-trip time in seconds')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8, 16], help='Worker counts to compare')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs per worker count (best is reported)')
+    args = parser.parse_args()
+
+    results = [run(args.messages, args.latency, w, args.repeats) for w in args.workers]
+    baseline = results[0]['best_s']
+    for result in results:
+        result['speedup'] = round(baseline / result['best_s'], 2) if result['best_s'] else None
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark hybrid (BM25 + vector) search against the two-step vector-then-keyword path.
+
+Indexes synthetic emails with a deterministic hashing embedder that sleeps
+to simulate model inference, so no model download is needed (FAISS and
+NumPy are):
+
+    python scripts/benchmark_hybrid_search.py --emails 2000 --embed-latency 0.01
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root directory to path to allow imports
+script_dir = Path(__file__).resolve().parent
+project_root = script_dir.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from gmail_chatbot.email_vector_db import EmailVectorDB
+from gmail_chatbot.vector_db.search import _dense_search, keyword_search
+
+WORDS = (
+    "invoice payment contract meeting budget review schedule project deadline "
+    "report client proposal travel expense approval shipment order renewal "
+    "lunch quarterly forecast hiring onboarding security audit release"
+).split()
+
+
+class HashingEmbeddings:
+    """Bag-of-words hashing embedder; ``latency`` seconds per call."""
+
+    def __init__(self, dim: int, latency: float) -> None:
+        self.dim = dim
+        self.latency = latency
+        self.model_name = "hashing-benchmark"
+
+    def _embed(self, text: str) -> list:
+        vector = [0.0] * self.dim
+        for token in text.lower().split():
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            vector[int.from_bytes(digest[:4], "little") % self.dim] += 1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: list) -> list:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list:
+        time.sleep(self.latency)
+        return self._embed(text)
+
+
+def build_db(cache_dir: str, email_count: int, dim: int, latency: float) -> EmailVectorDB:
+    rng = random.Random(0)
+    db = EmailVectorDB(cache_dir=cache_dir, lazy=True)
+    db.embeddings = HashingEmbeddings(dim, latency)
+    db._index_load_attempted = True
+    db.vector_search_available = True
+    db.readiness = "ready"
+    db.add_emails(
+        [
+            {
+                "email_id": f"msg{i:06d}",
+                "subject": " ".join(rng.choices(WORDS, k=4)),
+                "sender": f"user{i % 50}@example.com",
+                "recipient": "me@example.com",
+                "body": " ".join(rng.choices(WORDS, k=60)) + f" ref INV-{i:06d}",
+                "date": "2024-01-01T09:00:00",
+            }
+            for i in range(email_count)
+        ]
+    )
+    return db
+
+
+def two_step(db: EmailVectorDB, query: str, k: int) -> list:
+    """Vector search, then keyword search: today's path when both are needed."""
+    dense = _dense_search(db, query, k, None)
+    sparse = keyword_search(db, query, k, None)
+    return dense + sparse
+
+
+def time_queries(func, queries: list) -> dict:
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(0.95 * (len(timings) - 1))], 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--emails", type=int, default=2000, help="Synthetic emails to index")
+    parser.add_argument("--queries", type=int, default=100, help="Queries per path")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--embed-latency", type=float, default=0.01, help="Simulated query embedding time in seconds")
+    parser.add_argument("--k", type=int, default=5, help="Results per query")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    queries = [
+        f"{' '.join(rng.choices(WORDS, k=3))} INV-{rng.randrange(args.emails):06d}"
+        for _ in range(args.queries)
+    ]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        db = build_db(cache_dir, args.emails, args.dim, args.embed_latency)
+        db.search(queries[0], args.k, mode="hybrid")  # Warm the BM25 index and thread pool
+        results = {
+            "emails": args.emails,
+            "chunks": len(db.chunk_store),
+            "embed_latency_s": args.embed_latency,
+            "vector": time_queries(lambda q: db.search(q, args.k, mode="vector"), queries),
+            "two_step": time_queries(lambda q: two_step(db, q, args.k), queries),
+            "hybrid": time_queries(lambda q: db.search(q, args.k, mode="hybrid"), queries),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark EmailVectorDB ingest, search latency and ANN recall on a synthetic mailbox.
+
+Emails are generated from a fixed seed and embedded by a deterministic
+hashing model, so two runs over the same tree index identical data and no
+model download is needed (FAISS and NumPy are). Reported as JSON:
+
+- ingest: emails/s and chunks/s through ``add_emails``, bytes on disk and
+  bytes passed to ``write`` per email (the latter on Linux only)
+- p50/p95/p99 search latency without filters and with sender, date range,
+  tag and combined filters, for vector search and the keyword fallback
+- recall@k of the vector results against exact search over the same rows
+
+The query cache is disabled so every search is measured. Save a run with
+``--output`` and pass it to a later run with ``--compare``:
+
+    python scripts/benchmark_vector_store.py --emails 5000 --output base.json
+    python scripts/benchmark_vector_store.py --emails 5000 --compare base.json
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root directory to path to allow imports
+script_dir = Path(__file__).resolve().parent
+project_root = script_dir.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from gmail_chatbot.email_vector_db import EmailVectorDB
+from gmail_chatbot.vector_db import keyword_search
+
+SYLLABLES = "ka lo mi ra te su vo ne pa li du go be fi ho ja".split()
+TAGS = "work finance travel family receipts newsletters legal hiring support urgent".split()
+START_DATE = datetime(2023, 1, 1, 8, 0, 0)
+
+
+class HashingEmbeddings:
+    """Deterministic bag-of-words hashing embedder with unit-length vectors."""
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+        self.model_name = "hashing-benchmark"
+
+    def _embed(self, text: str) -> list:
+        vector = [0.0] * self.dim
+        for token in text.lower().split():
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[int.from_bytes(digest[:4], "little") % self.dim] += sign
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: list) -> list:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list:
+        return self._embed(text)
+
+
+def make_vocabulary(size: int, seed: int) -> list:
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return sorted(words)
+
+
+def make_mailbox(count: int, months: int, senders: int, seed: int = 0) -> tuple:
+    """Synthetic emails spread over ``months`` months, plus the Zipf-weighted vocabulary."""
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(3000, seed)
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    span_seconds = months * 30 * 24 * 3600
+    emails = []
+    for i in range(count):
+        body_words = rng.choices(vocabulary, weights=weights, k=rng.randint(30, 250))
+        emails.append(
+            {
+                "email_id": f"msg{i:07d}",
+                "subject": " ".join(rng.choices(vocabulary, weights=weights, k=5)),
+                "sender": f"sender{rng.randrange(senders):04d}@example.com",
+                "recipient": "me@example.com",
+                "body": " ".join(body_words),
+                "date": (START_DATE + timedelta(seconds=rng.randrange(span_seconds))).isoformat(),
+                "tags": rng.sample(TAGS, k=rng.randint(0, 2)),
+            }
+        )
+    return emails, vocabulary, weights
+
+
+def make_queries(count: int, vocabulary: list, weights: list, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(vocabulary, weights=weights, k=rng.randint(2, 5))) for _ in range(count)]
+
+
+def make_filters(emails: list) -> dict:
+    """One filter of each kind, chosen to match a few percent of the mailbox."""
+    month_start = START_DATE + timedelta(days=90)
+    return {
+        "sender": {"sender": emails[0]["sender"]},
+        "date_range": {
+            "date_range": [month_start.isoformat(), (month_start + timedelta(days=30)).isoformat()]
+        },
+        "tags": {"tags": ["legal"]},
+        "combined": {"sender": "sender00", "tags": ["work", "finance"]},
+    }
+
+
+def directory_bytes(path: str) -> int:
+    return sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file())
+
+
+def written_bytes() -> int:
+    """Bytes this process has passed to write calls, or -1 off Linux."""
+    try:
+        with open("/proc/self/io") as handle:
+            for line in handle:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return -1
+
+
+def percentiles(timings: list) -> dict:
+    timings = sorted(timings)
+
+    def pick(q: float) -> float:
+        return round(timings[min(len(timings) - 1, int(q * len(timings)))], 3)
+
+    return {
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+    }
+
+
+def open_db(cache_dir: str, dim: int, index_type: str) -> EmailVectorDB:
+    db = EmailVectorDB(
+        cache_dir=cache_dir, lazy=True, index_type=index_type, query_cache_size=0,
+        embedding_cache_size=0,
+    )
+    db.embeddings = HashingEmbeddings(dim)
+    db._index_load_attempted = True
+    db.vector_search_available = True
+    db.readiness = "ready"
+    return db
+
+
+def ingest(db: EmailVectorDB, emails: list, batch_size: int) -> dict:
+    disk_before = directory_bytes(db.cache_dir)
+    written_before = written_bytes()
+    started = time.perf_counter()
+    for start in range(0, len(emails), batch_size):
+        db.add_emails(emails[start : start + batch_size])
+    seconds = time.perf_counter() - started
+    written = written_bytes()
+    return {
+        "seconds": round(seconds, 3),
+        "emails_per_second": round(len(emails) / seconds, 1),
+        "chunks_per_second": round(len(db.chunk_store) / seconds, 1),
+        "disk_bytes_per_email": round((directory_bytes(db.cache_dir) - disk_before) / len(emails), 1),
+        "written_bytes_per_email": (
+            round((written - written_before) / len(emails), 1) if written >= 0 else None
+        ),
+    }
+
+
+def time_searches(search, queries: list) -> dict:
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        search(query)
+        timings.append((time.perf_counter() - started) * 1000)
+    return percentiles(timings)
+
+
+class ExactSearch:
+    """Brute-force L2 search over every live chunk, for recall@k."""
+
+    def __init__(self, db: EmailVectorDB) -> None:
+        import numpy as np
+
+        self.np = np
+        self.db = db
+        rows = list(db.chunk_store.iter_rows())
+        self.metadata = [metadata for _, _, metadata in rows]
+        self.vectors = np.asarray(
+            db.embeddings.embed_documents([text for _, text, _ in rows]), dtype="float32"
+        )
+        deleted = db.chunk_store.deleted
+        self.live = np.asarray([row not in deleted for row, _, _ in rows], dtype=bool)
+
+    def recall(self, query: str, results: list, k: int, filters: dict = None) -> float:
+        """Share of the exact top-k distance band the results reach."""
+        np = self.np
+        eligible = self.live.copy()
+        if filters:
+            eligible &= np.asarray(
+                [self.db._matches_filters(meta, filters) for meta in self.metadata], dtype=bool
+            )
+        wanted = min(k, int(eligible.sum()))
+        if wanted == 0:
+            return 1.0
+        query_vector = np.asarray(self.db.embeddings.embed_query(query), dtype="float32")
+        distances = ((self.vectors - query_vector) ** 2).sum(axis=1)
+        distances[~eligible] = np.inf
+        # Ties at the k-th distance count as hits, whichever row was returned
+        kth = np.partition(distances, wanted - 1)[wanted - 1]
+        rows = {r["row_id"] for r in results if r.get("row_id") is not None}
+        hits = sum(1 for row in rows if eligible[row] and distances[row] <= kth + 1e-5)
+        return min(1.0, hits / wanted)
+
+
+def measure(db: EmailVectorDB, queries: list, filters: dict, k: int, recall_queries: int) -> dict:
+    exact = ExactSearch(db)
+    report = {}
+    for name, query_filters in [("unfiltered", None)] + list(filters.items()):
+        # Warm the filter index and BM25 index outside the timed loop
+        db.search(queries[0], k, query_filters)
+        keyword_search(db, queries[0], k, query_filters)
+        vector = time_searches(lambda q: db.search(q, k, query_filters), queries)
+        keyword = time_searches(lambda q: keyword_search(db, q, k, query_filters), queries)
+        recalls = [
+            exact.recall(q, db.search(q, k, query_filters), k, query_filters)
+            for q in queries[:recall_queries]
+        ]
+        report[name] = {
+            "filters": query_filters,
+            "candidates": (
+                len(db.filter_index.candidates(query_filters)) if query_filters else db.chunk_store.live_count()
+            ),
+            "vector": vector,
+            "keyword_fallback": keyword,
+            f"recall_at_{k}": round(sum(recalls) / len(recalls), 4),
+        }
+    return report
+
+
+def compare(baseline: dict, current: dict, path: str = "") -> dict:
+    """Relative change of every numeric field present in both runs."""
+    changes = {}
+    for key, value in current.items():
+        old = baseline.get(key) if isinstance(baseline, dict) else None
+        where = f"{path}.{key}" if path else key
+        if isinstance(value, dict) and isinstance(old, dict):
+            changes.update(compare(old, value, where))
+        elif (
+            isinstance(value, (int, float)) and isinstance(old, (int, float))
+            and not isinstance(value, bool) and old != value
+        ):
+            changes[where] = {
+                "baseline": old,
+                "current": value,
+                "change_pct": round((value - old) / old * 100, 1) if old else None,
+            }
+    return changes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--emails", type=int, default=2000, help="Synthetic emails to index")
+    parser.add_argument("--batch-size", type=int, default=200, help="Emails per add_emails call")
+    parser.add_argument("--months", type=int, default=24, help="Months the mailbox spans")
+    parser.add_argument("--senders", type=int, default=200, help="Distinct senders")
+    parser.add_argument("--queries", type=int, default=200, help="Queries timed per search path")
+    parser.add_argument("--recall-queries", type=int, default=50, help="Queries checked against exact search")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--k", type=int, default=10, help="Results per query")
+    parser.add_argument("--index-type", default="auto", help="flat, hnsw, ivfpq or auto")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--compare", help="Earlier JSON report to diff this run against")
+    parser.add_argument("--verbose", action="store_true", help="Keep INFO logging from the vector DB")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Per-batch INFO logs would be timed (and counted as bytes written)
+        logging.disable(logging.INFO)
+
+    emails, vocabulary, weights = make_mailbox(args.emails, args.months, args.senders)
+    queries = make_queries(args.queries, vocabulary, weights)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        db = open_db(cache_dir, args.dim, args.index_type)
+        report = {
+            "config": {
+                key: getattr(args, key)
+                for key in ("emails", "batch_size", "months", "senders", "queries", "dim", "k", "index_type")
+            },
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+            },
+            "ingest": ingest(db, emails, args.batch_size),
+        }
+        status = db.get_status()
+        report["index"] = {
+            "chunks": status["total_chunks"],
+            "type": status["ann_index"]["type"],
+            "params": status["ann_index"]["params"],
+        }
+        report["search"] = measure(db, queries, make_filters(emails), args.k, args.recall_queries)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            report["compared_to"] = {"file": args.compare, "changes": compare(json.load(handle), report)}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
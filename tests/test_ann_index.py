@@ -0,0 +1,132 @@
+import importlib.util
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from gmail_chatbot.email_vector_db import EmailVectorDB
+from gmail_chatbot.vector_db import ann
+from gmail_chatbot.vector_db.search import _search_subset
+from gmail_chatbot.vector_db.ann import (
+    choose_index_type,
+    index_type_of,
+    is_promotion,
+    ivfpq_params,
+    ivfpq_trainable,
+)
+
+try:
+    import numpy as np
+
+    # conftest puts a stub in place of numpy when it isn't installed
+    NUMPY_AVAILABLE = hasattr(np, "ndarray")
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class TestIndexPolicy(unittest.TestCase):
+    """Index type selection and IVF-PQ sizing."""
+
+    def test_auto_promotes_by_chunk_count(self):
+        kwargs = {"hnsw_min_chunks": 1000, "ivfpq_min_chunks": 100000}
+        self.assertEqual(choose_index_type(999, "auto", **kwargs), "flat")
+        self.assertEqual(choose_index_type(1000, "auto", **kwargs), "hnsw")
+        self.assertEqual(choose_index_type(250000, "auto", **kwargs), "ivfpq")
+        # A disabled threshold never promotes
+        self.assertEqual(choose_index_type(10**7, "auto"), "flat")
+
+    def test_configured_type_wins(self):
+        self.assertEqual(choose_index_type(10, "ivfpq", 1, 1), "ivfpq")
+        self.assertEqual(choose_index_type(10**6, "flat", 1, 1), "flat")
+        self.assertEqual(choose_index_type(5, "bogus", hnsw_min_chunks=1), "hnsw")
+
+    def test_promotion_order(self):
+        self.assertTrue(is_promotion("flat", "hnsw"))
+        self.assertTrue(is_promotion("hnsw", "ivfpq"))
+        self.assertFalse(is_promotion("ivfpq", "flat"))
+
+    def test_ivfpq_params(self):
+        nlist, m = ivfpq_params(1_000_000, 384)
+        self.assertEqual(nlist, 4000)
+        self.assertEqual(m, 16)
+        # Few vectors cap the number of centroids
+        self.assertEqual(ivfpq_params(3900, 384)[0], 100)
+        self.assertEqual(ivfpq_params(5000, 30)[1], 15)
+        self.assertFalse(ivfpq_trainable(1000, 384))
+        self.assertTrue(ivfpq_trainable(100_000, 384))
+
+    def test_index_type_of(self):
+        for name, expected in [
+            ("IndexFlatL2", "flat"),
+            ("IndexHNSWFlat", "hnsw"),
+            ("IndexIVFPQ", "ivfpq"),
+        ]:
+            self.assertEqual(index_type_of(type(name, (), {})()), expected)
+
+
+class IndexFlatL2:
+    """Stands in for a FAISS flat index of ``ntotal`` vectors."""
+
+    d = 4
+
+    def __init__(self, ntotal):
+        self.ntotal = ntotal
+
+
+class IndexHNSWFlat(IndexFlatL2):
+    pass
+
+
+class TestPromotionRecallGate(unittest.TestCase):
+    """Auto promotion only switches to an index with enough recall."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = EmailVectorDB(cache_dir=self.temp_dir.name)
+        self.db.hnsw_min_chunks = 100
+        self.db.active_db = SimpleNamespace(index=IndexFlatL2(100), read_only=False)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _promote(self, recall, size=100):
+        self.db.active_db.index.ntotal = size
+        stats = {"type": "hnsw", "k": 10, "recall_at_k": recall, "latency_ms": 0.1}
+        with patch.object(ann, "build_index", return_value=IndexHNSWFlat(size)) as build, \
+                patch.object(ann, "evaluate_index", return_value=stats):
+            promoted = self.db._maybe_promote_index(vectors=[[0.0] * 4] * size)
+        return promoted, build.call_count
+
+    def test_low_recall_keeps_flat_index(self):
+        self.assertEqual(self._promote(recall=0.6), (False, 1))
+        self.assertEqual(index_type_of(self.db.active_db.index), "flat")
+        # Not rebuilt again until the index has grown by half
+        self.assertEqual(self._promote(recall=0.99, size=120), (False, 0))
+        self.assertEqual(self._promote(recall=0.99, size=150), (True, 1))
+        self.assertEqual(index_type_of(self.db.active_db.index), "hnsw")
+        self.assertEqual(self.db.index_stats["recall_at_k"], 0.99)
+
+
+@unittest.skipUnless(
+    NUMPY_AVAILABLE and importlib.util.find_spec("faiss"), "numpy and faiss are not installed"
+)
+class TestFilteredHNSWSearch(unittest.TestCase):
+    """Selective filters on an HNSW index return the exact nearest candidates."""
+
+    def test_subset_search_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((5000, 32)).astype("float32")
+        index = ann.build_index(vectors, "hnsw", hnsw_ef_search=16)
+        candidates = list(range(0, 5000, 20))
+        queries = rng.standard_normal((5, 32)).astype("float32")
+
+        hits = _search_subset(index, queries, 10, candidates)
+
+        subset = vectors[candidates]
+        for query, query_hits in zip(queries, hits):
+            exact = np.asarray(candidates)[np.argsort(((subset - query) ** 2).sum(axis=1))[:10]]
+            self.assertEqual([row for row, _ in query_hits], exact.tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -345,6 +345,7 @@ def test_triage_no_duplicate_gmail_prompt(
     mock_vec_mem.find_relevant_preferences.return_value = []
     mock_vec_mem.vector_search_available = True
     mock_vec_mem.find_related_emails.return_value = []
+    mock_vec_mem.find_related_emails_many.return_value = [[], []]
 
     mock_claude_client_instance.evaluate_vector_match.return_value = ""
 
@@ -356,6 +357,7 @@ def test_triage_no_duplicate_gmail_prompt(
     assert "Should I check your inbox" in first
 
     mock_vec_mem.find_related_emails.reset_mock()
+    mock_vec_mem.find_related_emails_many.reset_mock()
     second = app.process_message("Triage")
     assert "Should I check your inbox" not in second
 
@@ -392,6 +394,9 @@ def test_triage_repeat_after_results(
     mock_vec_mem.find_related_emails.return_value = [
         {"id": "1", "subject": "A"}
     ]
+    mock_vec_mem.find_related_emails_many.return_value = [
+        [], [{"id": "1", "subject": "A"}]
+    ]
     mock_claude_client_instance.evaluate_vector_match.return_value = (
         "Here are items that might need your attention:"
     )
@@ -404,6 +409,7 @@ def test_triage_repeat_after_results(
     assert "items that might need your attention" in first.lower()
 
     mock_vec_mem.find_related_emails.return_value = []
+    mock_vec_mem.find_related_emails_many.return_value = [[], []]
     second = app.process_message("Triage")
     assert "Should I check your inbox" not in second
 
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from gmail_chatbot import email_memory
+from gmail_chatbot.enhanced_memory import EnhancedMemoryStore
+from gmail_chatbot.vector_db.bm25 import BM25Index, ChunkBM25Index
+from gmail_chatbot.vector_db.chunk_store import ChunkStore
+
+
+class TestBM25Index(unittest.TestCase):
+    """Tests for the shared BM25 inverted index."""
+
+    def test_ranks_rare_terms_and_reports_coverage(self):
+        index = BM25Index()
+        index.add("a", "invoice 1234 from acme")
+        index.add("b", "lunch with the acme team")
+        index.add("c", "quarterly invoice reminder")
+
+        hits = index.search("acme invoice", k=3)
+        self.assertEqual(hits[0][0], "a")
+        self.assertAlmostEqual(hits[0][2], 1.0)
+        self.assertEqual({doc_id for doc_id, _, _ in hits}, {"a", "b", "c"})
+        self.assertEqual(index.search("1234", k=5)[0][0], "a")
+        self.assertEqual(index.search("nothing here"), [])
+
+    def test_replace_remove_and_allowed(self):
+        index = BM25Index()
+        index.add(1, "budget review")
+        index.add(2, "budget approval")
+        index.add(1, "holiday plans")
+
+        self.assertEqual([d for d, _, _ in index.search("budget")], [2])
+        self.assertEqual([d for d, _, _ in index.search("budget", allowed={1})], [])
+        index.remove(2)
+        self.assertEqual(index.search("budget"), [])
+        self.assertEqual(len(index), 1)
+
+    def test_field_weights(self):
+        index = BM25Index(field_weights={"subject": 3, "summary": 1})
+        index.add("body_hit", {"subject": "weekly notes", "summary": "contract attached"})
+        index.add("subject_hit", {"subject": "contract", "summary": "weekly notes"})
+        self.assertEqual(index.search("contract")[0][0], "subject_hit")
+
+    def test_chunk_index_tracks_store(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = ChunkStore(os.path.join(temp_dir, "chunks"))
+            store.append(["alpha report"], [{}])
+            index = ChunkBM25Index(store)
+            self.assertEqual([d for d, _, _ in index.search("report")], [0])
+
+            store.append(["beta report"], [{}])
+            self.assertEqual(sorted(d for d, _, _ in index.search("report")), [0, 1])
+
+            store.clear()
+            store.append(["gamma"], [{}])
+            self.assertEqual(index.search("report"), [])
+            self.assertEqual([d for d, _, _ in index.search("gamma")], [0])
+
+
+class TestKeywordSearchPaths(unittest.TestCase):
+    """The memory stores search through the BM25 index."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_email_memory_store_updates_index_on_add(self):
+        with patch.object(email_memory, "DATA_DIR", Path(self.temp_dir.name)):
+            store = email_memory.EmailMemoryStore()
+        store.add_email_memory("e1", "Acme contract", "a@acme.com", "me", "2024-01-01", "Signed copy")
+        self.assertEqual([r["email_id"] for r in store.find_related_emails("contract")], ["e1"])
+
+        store.add_email_memory("e2", "Lunch", "b@x.com", "me", "2024-01-02", "Contract questions",
+                               tags=["legal"])
+        store.add_email_memory("e1", "Acme contract", "a@acme.com", "me", "2024-01-01", "Countersigned")
+        results = store.find_related_emails("contract")
+        self.assertEqual([r["email_id"] for r in results], ["e1", "e2"])
+        self.assertGreater(results[0]["relevance_score"], results[1]["relevance_score"])
+        self.assertEqual([r["email_id"] for r in store.find_related_emails("countersigned")], ["e1"])
+
+    def test_enhanced_memory_indexes_new_entries(self):
+        store = EnhancedMemoryStore(memory_path=Path(self.temp_dir.name))
+        store.remember_user_preference("Send summaries every morning", label="digest")
+        self.assertEqual(len(store._keyword_search("summaries")), 1)
+
+        store.remember_user_preference("Weekly summaries on Friday", label="weekly")
+        results = store._keyword_search("weekly summaries", kind="preference")
+        self.assertEqual([r["meta"]["label"] for r in results], ["weekly", "digest"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import json
+import os
+import tempfile
+import unittest
+
+from gmail_chatbot.email_vector_db import EmailVectorDB
+from gmail_chatbot.vector_db.chunk_store import ChunkStore
+
+
+class TestChunkStore(unittest.TestCase):
+    """Tests for the segmented append-only chunk store."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store_dir = os.path.join(self.temp_dir.name, "chunks")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_append_and_read_back(self):
+        store = ChunkStore(self.store_dir)
+        ids = store.append(["alpha", "beta"], [{"n": 1}, {"n": 2}])
+        more = store.append(["gamma"], [{"n": 3}])
+
+        self.assertEqual(ids, [0, 1])
+        self.assertEqual(more, [2])
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.get(1), ("beta", {"n": 2}))
+        self.assertEqual(
+            [text for text, _ in store.get_many([2, 0])], ["gamma", "alpha"]
+        )
+
+        reopened = ChunkStore(self.store_dir)
+        self.assertEqual(len(reopened), 3)
+        self.assertEqual(reopened.load_all()[0], ["alpha", "beta", "gamma"])
+
+    def test_appends_do_not_rewrite_existing_data(self):
+        store = ChunkStore(self.store_dir, segment_bytes=64)
+        store.append(["x" * 100], [{}])
+        first_segment = os.path.join(self.store_dir, "seg-000001.jsonl")
+        size_before = os.path.getsize(first_segment)
+
+        store.append(["y" * 10], [{}])
+
+        # The full first segment is left untouched and a new one is started
+        self.assertEqual(os.path.getsize(first_segment), size_before)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.store_dir, "seg-000002.jsonl"))
+        )
+        self.assertEqual(store.get(1)[0], "y" * 10)
+
+    def test_truncated_offset_record_is_repaired(self):
+        store = ChunkStore(self.store_dir)
+        store.append(["alpha"], [{}])
+        with open(os.path.join(self.store_dir, "offsets.bin"), "ab") as f:
+            f.write(b"\x00\x01\x02")
+
+        reopened = ChunkStore(self.store_dir)
+        self.assertEqual(len(reopened), 1)
+        self.assertEqual(reopened.get(0)[0], "alpha")
+
+    def test_deleted_rows_are_skipped_and_persisted(self):
+        store = ChunkStore(self.store_dir)
+        store.append(["alpha", "beta", "gamma"], [{}, {}, {}])
+
+        self.assertEqual(store.delete([1, 1, 7]), [1])
+        self.assertEqual(store.delete([1]), [])
+
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.live_count(), 2)
+        self.assertEqual([row for row, _, _ in store.iter_rows()], [0, 2])
+        self.assertEqual(store.load_all()[0], ["alpha", "gamma"])
+
+        reopened = ChunkStore(self.store_dir)
+        self.assertTrue(reopened.is_deleted(1))
+        self.assertEqual(reopened.deleted_rows, [1])
+
+        reopened.clear()
+        self.assertEqual(reopened.deleted, set())
+
+    def test_refresh_sees_other_writers(self):
+        reader = ChunkStore(self.store_dir)
+        writer = ChunkStore(self.store_dir)
+        writer.append(["alpha"], [{}])
+        self.assertEqual(len(reader), 1)
+
+        writer.append(["beta"], [{}])
+        writer.delete([0])
+        self.assertFalse(reader.refresh())
+        self.assertEqual(reader.load_all()[0], ["beta"])
+        self.assertEqual(reader.epoch, 0)
+
+        writer.clear()
+        writer.append(["gamma"], [{}])
+        self.assertTrue(reader.refresh())
+        self.assertEqual(reader.load_all()[0], ["gamma"])
+        self.assertEqual(reader.epoch, 1)
+
+    def test_legacy_chunks_file_is_migrated(self):
+        legacy_path = os.path.join(self.temp_dir.name, "email_index.chunks.json")
+        with open(legacy_path, "w", encoding="utf-8") as f:
+            json.dump({"chunks": ["old"], "metadata": [{"email_id": "1"}]}, f)
+
+        store = ChunkStore(self.store_dir, legacy_path=legacy_path)
+
+        self.assertEqual(store.get(0), ("old", {"email_id": "1"}))
+        self.assertFalse(os.path.exists(legacy_path))
+
+
+class TestEmailVectorDBChunkPersistence(unittest.TestCase):
+    """EmailVectorDB persistence without rewriting whole files."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _add(self, db, email_id, body):
+        return db.add_email(
+            email_id=email_id,
+            subject=f"Subject {email_id}",
+            sender="alice@example.com",
+            recipient="bob@example.com",
+            body=body,
+            date="2024-01-01T00:00:00",
+        )
+
+    def test_add_email_appends_chunks_and_metadata(self):
+        db = EmailVectorDB(cache_dir=self.temp_dir.name)
+        self.assertTrue(self._add(db, "e1", "Invoice 42 is overdue"))
+        self.assertTrue(self._add(db, "e2", "Lunch on Friday?"))
+
+        status = db.get_status()
+        self.assertEqual(status["indexed_emails"], 2)
+        self.assertGreaterEqual(status["total_chunks"], 2)
+
+        reopened = EmailVectorDB(cache_dir=self.temp_dir.name)
+        self.assertEqual(sorted(reopened.get_all_email_ids()), ["e1", "e2"])
+        # Status is answered without materializing any chunk text
+        self.assertEqual(reopened.get_status()["total_chunks"], status["total_chunks"])
+        self.assertFalse(reopened.chunks_loaded)
+
+        results = reopened.search("invoice")
+        self.assertEqual(results[0]["metadata"]["email_id"], "e1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -160,5 +160,137 @@ class TestDiskStore(unittest.TestCase):
             list_store.update("key", "value")
 
 
+class TestJournaledDiskStore(unittest.TestCase):
+    """Test cases for the write-ahead log (journal) mode of DiskStore."""
+    
+    def setUp(self):
+        """Set up temporary directory for test files."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_file = Path(self.temp_dir.name) / "test_store.json"
+        self.test_file_list = Path(self.temp_dir.name) / "interaction_store.json"
+    
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+    
+    def test_append_writes_log_not_snapshot(self):
+        """Appends go to the log and are replayed on load."""
+        store = DiskStore(self.test_file_list, journal=True)
+        store.save([{"id": "0"}])
+        snapshot_size = self.test_file_list.stat().st_size
+        
+        store.append({"id": "1"})
+        store.append({"id": "2"})
+        
+        self.assertEqual(self.test_file_list.stat().st_size, snapshot_size)
+        self.assertTrue(store.log_path.exists())
+        
+        # A fresh instance replays snapshot plus log
+        data = DiskStore(self.test_file_list, journal=True).load()
+        self.assertEqual([item["id"] for item in data], ["0", "1", "2"])
+    
+    def test_incremental_load_sees_other_writers(self):
+        """Records appended by another instance show up on the next load."""
+        reader = DiskStore(self.test_file_list, journal=True)
+        writer = DiskStore(self.test_file_list, journal=True)
+        writer.append({"id": "1"})
+        self.assertEqual(len(reader.load()), 1)
+        writer.append({"id": "2"})
+        self.assertEqual(len(reader.load()), 2)
+    
+    def test_update_and_compaction(self):
+        """Dict updates are journaled and folded into the snapshot."""
+        store = DiskStore(self.test_file, journal=True, compact_threshold=200)
+        for i in range(20):
+            store.update(f"key{i}", {"value": i})
+        
+        # The log was compacted at least once and stays below the threshold
+        self.assertLess(store.log_path.stat().st_size if store.log_path.exists() else 0, 200)
+        with open(self.test_file, 'r') as f:
+            snapshot = json.load(f)
+        self.assertIn("key0", snapshot)
+        
+        data = DiskStore(self.test_file, journal=True).load()
+        self.assertEqual(data["key19"]["value"], 19)
+        
+        store.compact()
+        self.assertFalse(store.log_path.exists())
+        self.assertEqual(DiskStore(self.test_file).load()["key19"]["value"], 19)
+    
+    def test_update_many_is_one_record(self):
+        """A batch of updates is written as a single log record."""
+        store = DiskStore(self.test_file, journal=True)
+        store.update_many({"a": 1, "b": 2})
+        store.update("c", 3)
+        
+        with open(store.log_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 2)
+        data = DiskStore(self.test_file, journal=True).load()
+        self.assertEqual((data["a"], data["b"], data["c"]), (1, 2, 3))
+        
+        plain = DiskStore(Path(self.temp_dir.name) / "plain.json")
+        plain.update_many({"x": 1})
+        plain.update_many({"y": 2})
+        self.assertEqual(plain.load()["x"], 1)
+        self.assertEqual(plain.load()["y"], 2)
+    
+    def test_delete_many_removes_keys(self):
+        """Deleted keys stay gone after replay and in plain mode."""
+        store = DiskStore(self.test_file, journal=True)
+        store.update_many({"a": 1, "b": 2, "c": 3})
+        store.delete_many(["a", "c", "missing"])
+        
+        self.assertEqual(DiskStore(self.test_file, journal=True).load(), {"b": 2})
+        store.compact()
+        data = DiskStore(self.test_file).load()
+        self.assertEqual((data.get("a"), data["b"], data.get("c")), (None, 2, None))
+        
+        plain = DiskStore(Path(self.temp_dir.name) / "plain.json")
+        plain.update_many({"x": 1, "y": 2})
+        plain.delete_many(["x"])
+        self.assertNotIn("x", plain.load())
+        self.assertEqual(plain.load()["y"], 2)
+    
+    def test_torn_tail_is_ignored(self):
+        """A partially written final record doesn't break loading."""
+        store = DiskStore(self.test_file_list, journal=True)
+        store.append({"id": "1"})
+        with open(store.log_path, 'a', encoding='utf-8') as f:
+            f.write('{"op": "append", "entry": {"id"')
+        
+        data = DiskStore(self.test_file_list, journal=True).load()
+        self.assertEqual(data, [{"id": "1"}])
+    
+    def test_journal_type_errors(self):
+        """Journal mode keeps the list/dict type checks."""
+        dict_store = DiskStore(self.test_file, journal=True)
+        dict_store.save({"key": "value"})
+        list_store = DiskStore(self.test_file_list, journal=True)
+        list_store.save([{"id": "1"}])
+        
+        with self.assertRaises(DiskStoreError):
+            dict_store.append({"id": "2"})
+        with self.assertRaises(DiskStoreError):
+            list_store.update("key", "value")
+    
+    def test_concurrent_journal_appends(self):
+        """Concurrent appends from several instances are all preserved."""
+        def append_items(thread_id):
+            thread_store = DiskStore(self.test_file_list, journal=True,
+                                     compact_threshold=512)
+            for i in range(10):
+                thread_store.append({"id": f"thread{thread_id}_item{i}"})
+        
+        threads = [threading.Thread(target=append_items, args=(i,)) for i in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        data = DiskStore(self.test_file_list, journal=True).load()
+        self.assertEqual(len(data), 50)
+        self.assertEqual(len({item["id"] for item in data}), 50)
+
+
 if __name__ == "__main__":
     unittest.main()
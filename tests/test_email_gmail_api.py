@@ -5,6 +5,7 @@ import sys  # Restore sys
 import ssl  # For ssl.SSLError
 import logging  # For disabling/enabling logger in tests
 import json  # For creating mock client_secret file
+import time
 from pathlib import Path  # For type checking in mocks
 import types
 
@@ -81,7 +82,7 @@ project_root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 if project_root_dir not in sys.path:
     sys.path.insert(0, project_root_dir)
 
-from gmail_chatbot.email_gmail_api import GmailAPIClient
+from gmail_chatbot.email_gmail_api import GmailAPIClient, MessageCache
 
 # Define mock paths for constants used by GmailAPIClient constructor
 # These will be created and removed in setUp/tearDown
@@ -398,5 +399,238 @@ class TestLastGmailErrorFlag(unittest.TestCase):
         self.assertEqual(result, error_msg)
 
 
+class _FakeGmailService:
+    """Minimal users().messages() chain with per-call latency."""
+
+    def __init__(self, ids, failing=(), latency=0.0):
+        self.ids = list(ids)
+        self.failing = set(failing)
+        self.latency = latency
+        self.get_calls = 0
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def list(self, **kwargs):
+        return MagicMock(execute=MagicMock(return_value={'messages': [{'id': i} for i in self.ids]}))
+
+    def get(self, userId, id, **kwargs):
+        self.get_calls += 1
+
+        def execute():
+            import time
+            time.sleep(self.latency)
+            if id in self.failing:
+                raise ssl.SSLError(f"SSL error for {id}")
+            return {
+                'id': id,
+                'threadId': f"t-{id}",
+                'historyId': "100",
+                'snippet': f"snippet {id}",
+                'payload': {'headers': [{'name': 'Subject', 'value': f"Subject {id}"}]},
+            }
+        return MagicMock(execute=execute)
+
+
+class TestParallelMessageFetch(unittest.TestCase):
+    """search_emails fetches message details concurrently."""
+
+    def _client(self, service, workers):
+        with patch.object(GmailAPIClient, '_authenticate', return_value=service):
+            client = GmailAPIClient(claude_client=MagicMock(), system_message="",
+                                    message_cache_dir=None)
+        client.fetch_workers = workers
+        return client
+
+    @patch('gmail_chatbot.email_gmail_api.log_gmail_response')
+    @patch('gmail_chatbot.email_gmail_api.log_gmail_request', return_value=None)
+    def test_order_kept_and_failures_skipped(self, _req, _resp):
+        ids = [f"m{i}" for i in range(8)]
+        service = _FakeGmailService(ids, failing={"m3"}, latency=0.01)
+        client = self._client(service, workers=4)
+
+        emails, _ = client.search_emails("`in:inbox`")
+
+        self.assertEqual([e['id'] for e in emails], [i for i in ids if i != "m3"])
+        self.assertEqual(emails[0]['subject'], "Subject m0")
+
+    @patch('gmail_chatbot.email_gmail_api.log_gmail_response')
+    @patch('gmail_chatbot.email_gmail_api.log_gmail_request', return_value=None)
+    def test_fetches_overlap(self, _req, _resp):
+        import time
+        ids = [f"m{i}" for i in range(8)]
+        client = self._client(_FakeGmailService(ids, latency=0.05), workers=8)
+
+        start = time.perf_counter()
+        emails, _ = client.search_emails("`in:inbox`")
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(emails), 8)
+        # Sequential fetching would take at least 8 * 50ms
+        self.assertLess(elapsed, 0.3)
+
+    @patch('gmail_chatbot.email_gmail_api.log_gmail_response')
+    @patch('gmail_chatbot.email_gmail_api.log_gmail_request', return_value=None)
+    def test_repeat_search_served_from_cache(self, _req, _resp):
+        service = _FakeGmailService(["m1", "m2"])
+        client = self._client(service, workers=2)
+
+        first, _ = client.search_emails("`in:inbox`")
+        second, _ = client.search_emails("`in:inbox`")
+        email, _ = client.get_email_by_id("m1", user_query="summarize")
+
+        self.assertEqual(first, second)
+        self.assertEqual(email['subject'], "Subject m1")
+        self.assertEqual(service.get_calls, 2)
+        self.assertEqual(client.message_cache.stats()['hits'], 3)
+
+    @patch('gmail_chatbot.email_gmail_api.build')
+    def test_sequential_fetch_reuses_main_service(self, mock_build):
+        service = _FakeGmailService(["m1"])
+        client = self._client(service, workers=4)
+        client._credentials = MagicMock()
+
+        self.assertEqual(client._fetch_messages(["m1"])[0]['id'], "m1")
+        self.assertEqual(service.get_calls, 1)
+        mock_build.assert_not_called()
+
+    def test_close_shuts_down_pool(self):
+        client = self._client(_FakeGmailService(["m1", "m2"]), workers=2)
+        client._fetch_messages(["m1", "m2"])
+        pool = client._fetch_pool
+
+        client.close()
+
+        self.assertIsNone(client._fetch_pool)
+        with self.assertRaises(RuntimeError):
+            pool.submit(lambda: None)
+        client.close()  # Closing twice is harmless
+
+    @patch('gmail_chatbot.email_gmail_api.log_gmail_response')
+    @patch('gmail_chatbot.email_gmail_api.log_gmail_request', return_value=None)
+    def test_history_response_refreshes_stale_cache_entry(self, _req, _resp):
+        service = MagicMock()
+        service.users().history().list().execute.return_value = {
+            'history': [{'id': '150', 'messagesAdded': [{'message': {'id': 'm1'}}]}],
+            'historyId': '150',
+        }
+        service.users().messages().get().execute.return_value = {
+            'id': 'm1', 'threadId': 't1', 'historyId': '150', 'snippet': '',
+            'payload': {'headers': [{'name': 'Subject', 'value': 'Fresh'}]},
+        }
+        client = self._client(service, workers=1)
+        client.message_cache.put({'id': 'm1', 'historyId': '100', 'headers': {'subject': 'Old'}, 'body': ''})
+
+        added, _ = client.list_history("120")
+        emails = client.get_emails_by_ids(added)
+
+        self.assertEqual(emails[0]['subject'], "Fresh")
+        status = client.get_status()['message_cache']
+        self.assertEqual((status['hits'], status['misses']), (0, 1))
+
+        # The fresh copy is served without a historyId afterwards
+        email, _ = client.get_email_by_id("m1")
+        self.assertEqual(email['subject'], "Fresh")
+        self.assertEqual(client.get_status()['message_cache']['hits'], 1)
+
+    def test_list_history_pages_and_invalidates(self):
+        pages = [
+            {'history': [
+                {'messagesAdded': [{'message': {'id': 'n1', 'labelIds': ['INBOX']}}]},
+                {'messagesAdded': [{'message': {'id': 'd1', 'labelIds': ['DRAFT']}}]},
+                {'labelsAdded': [{'message': {'id': 'm1'}}]},
+            ], 'nextPageToken': 'p2', 'historyId': '11'},
+            {'history': [
+                {'messagesAdded': [{'message': {'id': 'n2'}}, {'message': {'id': 'n1'}}]},
+                {'messagesDeleted': [{'message': {'id': 'n2'}}]},
+            ], 'historyId': '12'},
+        ]
+        service = MagicMock()
+        service.users().history().list().execute.side_effect = pages
+        client = self._client(service, workers=1)
+        client.message_cache.put({'id': 'm1', 'headers': {}, 'body': ''})
+
+        added, history_id = client.list_history("10")
+
+        self.assertEqual(added, ['n1'])
+        self.assertEqual(history_id, '12')
+        self.assertIsNone(client.message_cache.get('m1'))
+
+
+class TestMessageCache(unittest.TestCase):
+    """LRU, TTL, historyId and on-disk behaviour of MessageCache."""
+
+    def setUp(self):
+        import tempfile
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _entry(self, msg_id, history_id="1"):
+        return {'id': msg_id, 'historyId': history_id, 'headers': {}, 'body': msg_id}
+
+    def test_lru_eviction_falls_back_to_disk(self):
+        cache = MessageCache(Path(self.temp_dir.name), max_entries=2)
+        for msg_id in ("a", "b", "c"):
+            cache.put(self._entry(msg_id))
+
+        self.assertEqual(cache.stats()['entries'], 2)
+        self.assertEqual(cache.get("a")['body'], "a")  # reloaded from disk
+        self.assertEqual(MessageCache(Path(self.temp_dir.name)).get("c")['body'], "c")
+
+    def test_history_id_and_ttl_invalidate(self):
+        cache = MessageCache(max_entries=10, ttl_seconds=60)
+        cache.put(self._entry("a", history_id="5"))
+
+        self.assertIsNotNone(cache.get("a", history_id="5"))
+        self.assertIsNone(cache.get("a", history_id="6"))
+
+        cache.put(self._entry("b"))
+        cache.ttl_seconds = -1
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()['misses'], 2)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_newer_history_id_evicts_disk_entry(self):
+        cache = MessageCache(Path(self.temp_dir.name))
+        cache.put(self._entry("a", history_id="5"))
+
+        self.assertIsNotNone(cache.get("a", history_id="4"))  # Older ids don't evict
+        self.assertIsNone(cache.get("a", history_id="7"))
+        self.assertIsNone(MessageCache(Path(self.temp_dir.name)).get("a"))
+
+    def test_disk_layer_is_pruned_by_age_and_count(self):
+        directory = Path(self.temp_dir.name) / "messages"
+        cache = MessageCache(directory, ttl_seconds=1800, max_files=3, prune_every=3)
+        self.assertFalse(directory.exists())  # Created on the first write
+
+        for msg_id in ("a", "b", "c"):
+            cache.put(self._entry(msg_id))
+        old = time.time() - 3600
+        os.utime(directory / "a.json", (old, old))
+        cache.put(self._entry("d"))
+        cache.put(self._entry("e"))
+        self.assertEqual(len(list(directory.glob("*.json"))), 5)  # Not due yet
+
+        # "a" has expired; "b" and "c" are the oldest beyond max_files
+        cache.put(self._entry("f"))
+        self.assertEqual(sorted(p.stem for p in directory.glob("*.json")), ["d", "e", "f"])
+
+        stale = time.time() - 7200
+        os.utime(directory / "d.json", (stale, stale))
+        MessageCache(directory, ttl_seconds=3600)  # Prunes on construction
+        self.assertEqual(sorted(p.stem for p in directory.glob("*.json")), ["e", "f"])
+
+    def test_invalidate_removes_disk_entry(self):
+        cache = MessageCache(Path(self.temp_dir.name))
+        cache.put(self._entry("a"))
+        cache.invalidate("a")
+        self.assertIsNone(MessageCache(Path(self.temp_dir.name)).get("a"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,90 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gmail_chatbot.email_vector_db import EmailVectorDB
+from gmail_chatbot.vector_db.search import group_by_email
+
+
+def _chunk(email_id, similarity, content="text"):
+    return {"content": content, "metadata": {"email_id": email_id}, "similarity": similarity}
+
+
+class TestGroupByEmail(unittest.TestCase):
+    """Chunk hits collapse into one result per email."""
+
+    def test_max_and_sum_top_scoring(self):
+        chunks = [
+            _chunk("long", 0.9, "best long chunk"),
+            _chunk("short", 0.85),
+            _chunk("long", 0.2),
+            _chunk("other", 0.6),
+            _chunk("other", 0.55),
+            _chunk("other", 0.5),
+            _chunk("other", 0.4),
+        ]
+
+        by_max = group_by_email(chunks)
+        self.assertEqual([g["email_id"] for g in by_max], ["long", "short", "other"])
+        self.assertEqual(by_max[0]["snippet"], "best long chunk")
+        self.assertEqual(by_max[0]["matched_chunks"], 2)
+
+        by_sum = group_by_email(chunks, scoring="sum_top")
+        self.assertEqual([g["email_id"] for g in by_sum], ["other", "long", "short"])
+        self.assertAlmostEqual(by_sum[0]["score"], 1.65)
+        self.assertEqual(by_sum[0]["similarity"], 0.6)
+
+        with self.assertRaises(ValueError):
+            group_by_email(chunks, scoring="mean")
+
+
+class TestEmailGroupedSearch(unittest.TestCase):
+    """search_emails keeps fetching until enough distinct emails are found."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = EmailVectorDB(cache_dir=self.temp_dir.name, chunk_size=10, chunk_overlap=0)
+        self._add("long", "\n\n".join(["budget budget budget numbers"] * 20))
+        for i in range(3):
+            self._add(f"short{i}", f"see the budget attached, item {i} for review this week")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _add(self, email_id, body):
+        self.db.add_email(email_id, f"Note {email_id}", "a@example.com",
+                          "b@example.com", body, "2024-01-01T00:00:00")
+
+    def test_long_email_does_not_crowd_out_others(self):
+        self.assertGreater(len(self.db.chunk_store), 10)
+        chunk_ids = {r["metadata"]["email_id"] for r in self.db.search("budget", num_results=6)}
+        self.assertEqual(chunk_ids, {"long"})
+
+        with patch.object(self.db, "search_many", wraps=self.db.search_many) as spy:
+            emails = self.db.search_emails("budget", limit=3)
+
+        self.assertEqual(len(emails), 3)
+        self.assertEqual(emails[0]["email_id"], "long")
+        self.assertGreater(emails[0]["matched_chunks"], 1)
+        self.assertIn("budget", emails[0]["snippet"])
+        self.assertGreater(spy.call_count, 1)
+
+    def test_stops_when_store_is_exhausted(self):
+        emails = self.db.search_emails("review", limit=5)
+        self.assertEqual(sorted(e["email_id"] for e in emails), ["short0", "short1", "short2"])
+        self.assertEqual(self.db.search_emails_many(["review", "nothing"], limit=2)[1], [])
+
+    def test_min_similarity_applies_before_limit(self):
+        # The long email ranks first on summed chunk scores but matches fewer terms
+        query = "budget numbers review"
+        top = self.db.search_emails(query, limit=4, scoring="sum_top")
+        self.assertEqual(top[0]["email_id"], "long")
+        self.assertLess(top[0]["similarity"], 0.5)
+
+        emails = self.db.search_emails(query, limit=2, scoring="sum_top", min_similarity=0.5)
+        self.assertEqual(len(emails), 2)
+        self.assertTrue(all(e["email_id"].startswith("short") for e in emails))
+
+
+if __name__ == "__main__":
+    unittest.main()
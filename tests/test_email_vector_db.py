@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import patch
 import os
 import sys
+import tempfile
 
 # Adjust sys.path to include the project root ('showup-tools')
 # __file__ is .../showup-tools/gmail_chatbot/tests/test_email_vector_db.py
@@ -92,5 +93,217 @@ class TestEmailVectorDBErrorHandling(unittest.TestCase):
         self.assertFalse(memory_store.vector_search_available)
         self.assertIsNotNone(memory_store.get_vector_search_error_message())
 
+
+class _CountingEmbeddings:
+    """Fake embedding model that records every embed_documents call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class TestEmailVectorDBBulkAdd(unittest.TestCase):
+    """Bulk indexing through EmailVectorDB.add_emails."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = EmailVectorDB(cache_dir=self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _email(self, email_id, body):
+        return {
+            "email_id": email_id,
+            "subject": f"Subject {email_id}",
+            "sender": "alice@example.com",
+            "recipient": "bob@example.com",
+            "body": body,
+            "date": "2024-01-01T00:00:00",
+        }
+
+    def test_add_emails_writes_once_and_skips_unchanged(self):
+        emails = [self._email(f"e{i}", f"Body number {i}") for i in range(3)]
+        results = self.db.add_emails(emails + [self._email("e0", "Body number 0")])
+
+        self.assertEqual(results, {"e0": True, "e1": True, "e2": True})
+        self.assertEqual(len(self.db.chunk_store), 3)
+        # All metadata went into a single journal record
+        with open(self.db._metadata_store.log_path, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+        # Re-adding unchanged emails doesn't add chunks
+        self.assertEqual(self.db.add_emails(emails), results)
+        self.assertEqual(len(self.db.chunk_store), 3)
+
+        reopened = EmailVectorDB(cache_dir=self.temp_dir.name)
+        self.assertEqual(sorted(reopened.get_all_email_ids()), ["e0", "e1", "e2"])
+
+    def test_embed_chunks_batches_and_dedupes(self):
+        self.db.embeddings = _CountingEmbeddings()
+        chunks = ["a", "b", "a", "c", "d", "b"]
+
+        vectors = self.db._embed_chunks(chunks, batch_size=2)
+
+        self.assertEqual(len(vectors), len(chunks))
+        self.assertEqual(vectors[0], vectors[2])
+        self.assertEqual([len(call) for call in self.db.embeddings.calls], [2, 2])
+        self.assertEqual(sorted(sum(self.db.embeddings.calls, [])), ["a", "b", "c", "d"])
+
+
+class TestEmailVectorDBUpsert(unittest.TestCase):
+    """Re-indexing and removing emails replaces their chunks."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = EmailVectorDB(cache_dir=self.temp_dir.name, compact_dead_fraction=0)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _upsert(self, email_id, body, db=None):
+        return (db or self.db).upsert_email(
+            email_id=email_id,
+            subject=f"Subject {email_id}",
+            sender="alice@example.com",
+            recipient="bob@example.com",
+            body=body,
+            date="2024-01-01T00:00:00",
+        )
+
+    def test_changed_email_replaces_old_chunks(self):
+        self._upsert("e1", "Invoice 42 is overdue")
+        self._upsert("e2", "Lunch on Friday?")
+        self.assertTrue(self._upsert("e1", "Invoice 42 has been paid"))
+
+        status = self.db.get_status()
+        self.assertEqual(status["total_chunks"], 2)
+        self.assertEqual(status["deleted_chunks"], 1)
+        contents = [r["content"] for r in self.db.search("invoice", num_results=5)]
+        self.assertEqual(len(contents), 1)
+        self.assertIn("paid", contents[0])
+
+        # Unchanged content is not re-indexed
+        self._upsert("e1", "Invoice 42 has been paid")
+        self.assertEqual(self.db.get_status()["deleted_chunks"], 1)
+
+    def test_remove_email_drops_chunks_and_metadata(self):
+        self._upsert("e1", "Invoice 42 is overdue")
+        self._upsert("e2", "Lunch on Friday?")
+
+        self.assertTrue(self.db.remove_email("e1"))
+        self.assertFalse(self.db.remove_email("e1"))
+
+        self.assertEqual(self.db.search("invoice"), [])
+        reopened = EmailVectorDB(cache_dir=self.temp_dir.name)
+        self.assertEqual(reopened.get_all_email_ids(), ["e2"])
+        self.assertEqual(reopened.get_status()["total_chunks"], 1)
+
+    def test_compaction_keeps_only_live_chunks(self):
+        db = EmailVectorDB(cache_dir=self.temp_dir.name, compact_dead_fraction=0.5)
+        for i in range(4):
+            self._upsert(f"e{i}", f"Status report number {i}", db=db)
+        db.remove_email("e0")
+        self.assertEqual(len(db.chunk_store), 4)
+
+        db.remove_email("e1")
+
+        self.assertEqual(len(db.chunk_store), 2)
+        self.assertEqual(db.get_status()["deleted_chunks"], 0)
+        ids = sorted(r["metadata"]["email_id"] for r in db.search("report"))
+        self.assertEqual(ids, ["e2", "e3"])
+        self.assertTrue(db.remove_email("e3"))
+        self.assertEqual(db.search("report")[0]["metadata"]["email_id"], "e2")
+
+
+class _FakeIndex:
+    """Stands in for FaissChunkIndex when publishing generations."""
+
+    ntotal = 0
+    read_only = False
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(b"index")
+
+
+class TestIndexGenerations(unittest.TestCase):
+    """Index writes are published as numbered generations."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = EmailVectorDB(cache_dir=self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_generations_replace_older_files(self):
+        legacy = os.path.join(self.temp_dir.name, "email_index.faiss")
+        open(legacy, "wb").close()
+        self.assertEqual(self.db._get_index_path(), legacy)
+
+        self.db.active_db = _FakeIndex()
+        for _ in range(3):
+            self.db._save_index()
+
+        self.assertEqual(self.db._index_generation, 3)
+        self.assertTrue(self.db._get_index_path().endswith("email_index.g000003.faiss"))
+        files = sorted(f for f in os.listdir(self.temp_dir.name) if f.endswith(".faiss"))
+        # The previous generation is kept for readers that are switching
+        self.assertEqual(files, ["email_index.g000002.faiss", "email_index.g000003.faiss"])
+
+        reader = EmailVectorDB(cache_dir=self.temp_dir.name)
+        self.assertEqual(reader._get_index_path(), self.db._get_index_path())
+
+
+@patch('gmail_chatbot.email_vector_db.VECTOR_LIBS_AVAILABLE', True)
+@patch('gmail_chatbot.email_vector_db.HuggingFaceEmbeddings', create=True)
+class TestEmailVectorDBLazyInit(unittest.TestCase):
+    """Lazy embedding model loading and background warm-up."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_model_loads_on_first_search(self, mock_embeddings):
+        db = EmailVectorDB(cache_dir=self.temp_dir.name, lazy=True)
+
+        mock_embeddings.assert_not_called()
+        self.assertEqual(db.get_status()["readiness"], "pending")
+        self.assertTrue(db.vector_search_available)
+
+        db.search("anything")
+        db.search("anything else")
+
+        mock_embeddings.assert_called_once()
+        self.assertEqual(db.readiness, "ready")
+
+    def test_warm_up_runs_once_in_background(self, mock_embeddings):
+        db = EmailVectorDB(cache_dir=self.temp_dir.name, lazy=True)
+
+        thread = db.warm_up()
+        thread.join(timeout=5)
+
+        self.assertEqual(db.readiness, "ready")
+        self.assertIsNone(db.warm_up())
+        self.assertTrue(db.ensure_ready())
+        mock_embeddings.assert_called_once()
+
+    def test_lazy_load_failure_is_reported(self, mock_embeddings):
+        mock_embeddings.side_effect = OSError("Cannot allocate memory")
+        db = EmailVectorDB(cache_dir=self.temp_dir.name, lazy=True)
+
+        self.assertFalse(db.ensure_ready())
+        status = db.get_status()
+        self.assertEqual(status["readiness"], "failed")
+        self.assertFalse(status["vector_search_available"])
+        self.assertIn("Cannot allocate memory", status["initialization_error"])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,149 @@
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from gmail_chatbot.email_vector_db import EmailVectorDB
+from gmail_chatbot.vector_db import embedding_backends
+from gmail_chatbot.vector_db.embedding_backends import (
+    OnnxEmbeddings,
+    available_backends,
+    cache_model_key,
+    create_embeddings,
+    register_backend,
+)
+
+try:
+    import numpy as np
+
+    # conftest puts a stub in place of numpy when it isn't installed
+    NUMPY_AVAILABLE = hasattr(np, "ndarray")
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class _FakeEmbeddings:
+    def __init__(self, model_name, cache_folder):
+        self.model_name = model_name
+        self.cache_folder = cache_folder
+
+    def embed_documents(self, texts):
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0]
+
+
+class TestEmbeddingBackends(unittest.TestCase):
+    """Embedding backends are looked up by name."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        register_backend("fake", _FakeEmbeddings)
+
+    def tearDown(self):
+        embedding_backends._BACKENDS.pop("fake", None)
+        self.temp_dir.cleanup()
+
+    def test_registry(self):
+        self.assertTrue({"torch", "onnx", "onnx-int8", "fake"} <= set(available_backends()))
+        embeddings = create_embeddings("fake", "mini", "/models")
+        self.assertEqual((embeddings.model_name, embeddings.cache_folder), ("mini", "/models"))
+        with self.assertRaises(ValueError):
+            create_embeddings("tensorflow", "mini", "/models")
+
+        self.assertEqual(cache_model_key("torch", "mini"), "mini")
+        self.assertEqual(cache_model_key("onnx-int8", "mini"), "mini@onnx-int8")
+
+    @patch("gmail_chatbot.email_vector_db.VECTOR_LIBS_AVAILABLE", True)
+    def test_vector_db_uses_configured_backend(self):
+        db = EmailVectorDB(cache_dir=self.temp_dir.name, embedding_model="mini",
+                           embedding_backend="fake")
+
+        self.assertEqual(db.readiness, "ready")
+        self.assertIsInstance(db.embeddings.embeddings, _FakeEmbeddings)
+        self.assertEqual(db.embedding_cache.model_name, "mini@fake")
+        self.assertEqual(db.embeddings.embed_query("abc"), [3.0, 1.0])
+        self.assertEqual(db.get_status()["embedding_backend"], "fake")
+
+    @patch("gmail_chatbot.email_vector_db.VECTOR_LIBS_AVAILABLE", True)
+    def test_unknown_backend_disables_vector_search(self):
+        db = EmailVectorDB(cache_dir=self.temp_dir.name, embedding_backend="tensorflow")
+        self.assertEqual(db.readiness, "failed")
+        self.assertIn("Unknown embedding backend", db.initialization_error_message)
+
+
+class _WordTokenizer:
+    """tokenizers-style stand-in: one id per word, right-padded with id 0."""
+
+    VOCAB = {"a": 1, "b": 2, "c": 3}
+
+    def encode_batch(self, texts):
+        ids = [[self.VOCAB[word] for word in text.split()] for text in texts]
+        width = max(len(row) for row in ids)
+        return [
+            SimpleNamespace(
+                ids=row + [0] * (width - len(row)),
+                attention_mask=[1] * len(row) + [0] * (width - len(row)),
+                type_ids=[0] * width,
+            )
+            for row in ids
+        ]
+
+
+class _TableSession:
+    """ONNX session stand-in that looks each token id up in a fixed table."""
+
+    def __init__(self):
+        # The padding row is large so pooling over padded positions shows up
+        self.table = np.array(
+            [[100.0, 100.0], [3.0, 0.0], [0.0, 4.0], [1.0, 1.0]], dtype=np.float32
+        )
+        self.feeds = []
+
+    def run(self, output_names, feed):
+        self.feeds.append(feed)
+        return [self.table[feed["input_ids"]]]
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy is not installed")
+class TestOnnxEmbeddings(unittest.TestCase):
+    """Mean pooling over the attention mask and normalization."""
+
+    def _embeddings(self, normalize=True):
+        embeddings = OnnxEmbeddings.__new__(OnnxEmbeddings)
+        embeddings._np = np
+        embeddings.batch_size = 8
+        embeddings.normalize = normalize
+        embeddings.tokenizer = _WordTokenizer()
+        embeddings.session = _TableSession()
+        embeddings._input_names = {"input_ids", "attention_mask"}
+        return embeddings
+
+    def assertVectorsAlmostEqual(self, actual, expected):
+        self.assertEqual(len(actual), len(expected))
+        for row, expected_row in zip(actual, expected):
+            for value, expected_value in zip(row, expected_row):
+                self.assertAlmostEqual(value, expected_value, places=5)
+
+    def test_pools_over_the_mask_and_normalizes(self):
+        embeddings = self._embeddings()
+        vectors = embeddings.embed_documents(["a b", "a", "c c a"])
+
+        # mean([3, 0], [0, 4]) = [1.5, 2] -> [0.6, 0.8]; padding is ignored
+        # mean([1, 1], [1, 1], [3, 0]) = [5/3, 2/3] -> [5, 2] / sqrt(29)
+        self.assertVectorsAlmostEqual(
+            vectors, [[0.6, 0.8], [1.0, 0.0], [5 / 29 ** 0.5, 2 / 29 ** 0.5]]
+        )
+        self.assertEqual(set(embeddings.session.feeds[0]), {"input_ids", "attention_mask"})
+        self.assertVectorsAlmostEqual([embeddings.embed_query("a b")], [[0.6, 0.8]])
+
+    def test_skips_normalization_without_a_normalize_module(self):
+        embeddings = self._embeddings(normalize=False)
+        self.assertVectorsAlmostEqual(
+            embeddings.embed_documents(["a b", "a"]), [[1.5, 2.0], [3.0, 0.0]]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
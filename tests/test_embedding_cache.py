@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+from gmail_chatbot.vector_db.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class _CountingEmbeddings:
+    """Fake embedding model that records the texts it embeds."""
+
+    def __init__(self):
+        self.documents = []
+        self.queries = []
+
+    def embed_documents(self, texts):
+        self.documents.extend(texts)
+        return [[float(len(text)), 0.5, -1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return [float(len(text)), 1.5, 2.0]
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Tests for the mmap-backed embedding cache."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "embedding_cache")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_documents_are_embedded_once_and_persist(self):
+        base = _CountingEmbeddings()
+        cache = EmbeddingCache(self.cache_dir, "model-a")
+        embeddings = CachedEmbeddings(base, cache)
+
+        first = embeddings.embed_documents(["alpha", "beta", "alpha"])
+        second = embeddings.embed_documents(["beta  ", "gamma"])
+
+        self.assertEqual(base.documents, ["alpha", "beta", "gamma"])
+        self.assertEqual(first[0], first[2])
+        self.assertEqual(second[0], first[1])
+        cache.close()
+
+        reopened = CachedEmbeddings(base, EmbeddingCache(self.cache_dir, "model-a"))
+        self.assertEqual(reopened.embed_documents(["gamma"]), [[5.0, 0.5, -1.0]])
+        self.assertEqual(base.documents, ["alpha", "beta", "gamma"])
+        self.assertEqual(reopened.cache.stats()["hits"], 1)
+
+        other_model = CachedEmbeddings(base, EmbeddingCache(self.cache_dir, "model-b"))
+        other_model.embed_documents(["gamma"])
+        self.assertEqual(base.documents[-1], "gamma")
+        self.assertEqual(len(base.documents), 4)
+
+    def test_queries_are_cached_separately(self):
+        base = _CountingEmbeddings()
+        embeddings = CachedEmbeddings(base, EmbeddingCache(self.cache_dir, "model-a"))
+        embeddings.embed_documents(["invoice"])
+
+        self.assertEqual(embeddings.embed_query("invoice"), [7.0, 1.5, 2.0])
+        self.assertEqual(embeddings.embed_query("invoice"), [7.0, 1.5, 2.0])
+        self.assertEqual(base.queries, ["invoice"])
+
+    def test_query_batches_use_one_model_call(self):
+        base = _CountingEmbeddings()
+        embeddings = CachedEmbeddings(base, EmbeddingCache(self.cache_dir, "model-a"))
+        embeddings.embed_query("urgent")
+
+        vectors = embeddings.embed_queries(["urgent", "invoice", "invoice"])
+
+        self.assertEqual(vectors[0], [6.0, 1.5, 2.0])
+        self.assertEqual(vectors[1], vectors[2])
+        self.assertEqual(base.documents, ["invoice"])
+        self.assertEqual(embeddings.embed_query("invoice"), vectors[1])
+        self.assertEqual(base.queries, ["urgent"])
+
+    def test_eviction_bounds_size(self):
+        cache = EmbeddingCache(self.cache_dir, "model-a", max_entries=2)
+        cache.put("one", [1.0, 1.0])
+        cache.put("two", [2.0, 2.0])
+        self.assertIsNotNone(cache.get("one"))  # "two" is now least recently used
+        cache.put("three", [3.0, 3.0])
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("two"))
+        self.assertEqual(cache.get("one"), [1.0, 1.0])
+        self.assertEqual(cache.get("three"), [3.0, 3.0])
+        self.assertLessEqual(cache.stats()["bytes"], 2 * (16 + 4 * 2))
+        cache.close()
+
+        reopened = EmbeddingCache(self.cache_dir, "model-a", max_entries=2)
+        self.assertIsNone(reopened.get("two"))
+        self.assertEqual(reopened.get("three"), [3.0, 3.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -233,6 +233,28 @@ class TestEnhancedMemoryStore(unittest.TestCase):
         self.assertEqual(interaction_memory[0]["meta"]["query"], "What emails do I have from Excel High School?")
         self.assertEqual(interaction_memory[0]["meta"]["client"], "Excel High School")
 
+    def test_journaled_interaction_store(self):
+        """Test opting the interaction store in to the write-ahead log."""
+        store = EnhancedMemoryStore(memory_path=self.test_memory_path,
+                                    journal_stores=["interaction"])
+        self.assertTrue(store.interaction_store.journal)
+        self.assertFalse(store.preferences_store.journal)
+        
+        store.add_interaction_memory(content="First interaction")
+        store.add_interaction_memory(content="Second interaction")
+        
+        self.assertTrue(store.interaction_store.log_path.exists())
+        self.assertEqual(len(store.interaction_memory), 2)
+        
+        reloaded = EnhancedMemoryStore(memory_path=self.test_memory_path,
+                                       journal_stores=["interaction"])
+        contents = [i["content"] for i in reloaded.interaction_memory]
+        self.assertEqual(contents, ["First interaction", "Second interaction"])
+        
+        with self.assertRaises(ValueError):
+            EnhancedMemoryStore(memory_path=self.test_memory_path,
+                                journal_stores=["unknown"])
+
     def test_note_creation_and_listing(self):
         """Test creating a note and listing it via MemoryActionsHandler."""
         note_text = "Remember to review the contract"
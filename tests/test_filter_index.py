@@ -0,0 +1,212 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from gmail_chatbot.email_vector_db import EmailVectorDB
+from gmail_chatbot.vector_db.chunk_store import ChunkStore
+from gmail_chatbot.vector_db.faiss_store import ChunkDocument
+from gmail_chatbot.vector_db.filters import MetadataColumns, MetadataFilterIndex, TimeShards
+
+
+def _meta(sender, date, tags):
+    return {"sender": sender, "recipient": "me@example.com", "date": date, "tags": tags}
+
+
+class TestMetadataFilterIndex(unittest.TestCase):
+    """Tests for the metadata posting lists used by filtered search."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = ChunkStore(os.path.join(self.temp_dir.name, "chunks"))
+        self.store.append(
+            ["a", "b", "c", "d"],
+            [
+                _meta("Alice@Example.com", "2024-01-05T00:00:00", ["work"]),
+                _meta("bob@example.com", "2024-02-10T00:00:00", ["home", "bills"]),
+                _meta("alice@example.com", "2024-03-15T00:00:00", []),
+                _meta("carol@example.com", "not a date", ["work"]),
+            ],
+        )
+        self.index = MetadataFilterIndex(self.store)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_candidates_match_filter_semantics(self):
+        self.assertEqual(self.index.candidates({"sender": "alice"}), [0, 2])
+        self.assertEqual(self.index.candidates({"tags": ["bills", "work"]}), [0, 1, 3])
+        self.assertEqual(
+            self.index.candidates({"date_range": ["2024-02-01T00:00:00", "2024-12-31T00:00:00"]}),
+            [1, 2, 3],
+        )
+        self.assertEqual(self.index.candidates({"sender": "alice", "tags": ["work"]}), [0])
+        self.assertEqual(self.index.candidates({"recipient": "me@example.com", "date": "missing"}), [])
+        self.assertEqual(self.index.candidates({"unknown": 1}), [])
+
+    def test_candidates_agree_with_matches_filters(self):
+        db = EmailVectorDB(cache_dir=self.temp_dir.name)
+        rows = list(self.store.iter_rows())
+        for filters in (
+            {"sender": "ALICE"},
+            {"tags": ["home"]},
+            {"date_range": ["2024-01-01T00:00:00", "2024-01-31T00:00:00"]},
+        ):
+            expected = [i for i, _, meta in rows if db._matches_filters(meta, filters)]
+            self.assertEqual(self.index.candidates(filters), expected, filters)
+
+    def test_tracks_appends_and_clear(self):
+        self.assertEqual(self.index.candidates({"sender": "dave"}), [])
+        self.store.append(["e"], [_meta("dave@example.com", "2024-04-01T00:00:00", [])])
+        self.assertEqual(self.index.candidates({"sender": "dave"}), [4])
+
+        self.store.clear()
+        self.store.append(["f"], [_meta("dave@example.com", "2024-05-01T00:00:00", [])])
+        self.assertEqual(self.index.candidates({"sender": "dave"}), [0])
+        self.assertEqual(len(self.index), 1)
+
+
+class TestMetadataColumns(unittest.TestCase):
+    """Tests for the columnar sender, recipient and tag filters."""
+
+    def setUp(self):
+        self.columns = MetadataColumns()
+        for i in range(100):
+            # Tags beyond the first 64 spill into a second bitset word
+            self.columns.add(_meta(f"User{i % 3}@Example.com", "2024-01-01", [f"t{i}"]))
+        self.columns.add({"recipient": "me@example.com", "tags": "not a list"})
+
+    def test_select_matches_filter_semantics(self):
+        self.assertEqual(self.columns.select({"sender": "user1"}), list(range(1, 100, 3)))
+        self.assertEqual(self.columns.select({"tags": ["t3", "t70", "t99"]}), [3, 70, 99])
+        self.assertEqual(
+            self.columns.select({"sender": "USER0", "tags": ["t3", "t4"]}, rows=[4, 3, 0]), [3]
+        )
+        self.assertEqual(self.columns.select({"recipient": "ME@"}), list(range(101)))
+        self.assertEqual(self.columns.select({"tags": ["missing"]}), [])
+        self.assertEqual(self.columns.select({"sender": "nobody"}), [])
+
+    def test_stats(self):
+        stats = self.columns.stats()
+        self.assertEqual((stats["rows"], stats["senders"], stats["tags"]), (101, 3, 100))
+
+
+class TestTimeShards(unittest.TestCase):
+    """Tests for the date partitions behind ``date_range`` filters."""
+
+    def test_range_touches_only_overlapping_shards(self):
+        shards = TimeShards("quarter")
+        for row, date in enumerate(
+            ["2024-01-05T00:00:00", "2024-05-10T00:00:00", "2024-04-01T00:00:00+02:00", "bad"]
+        ):
+            shards.add(row, date)
+
+        stats = shards.stats()
+        self.assertEqual(stats["rows_per_shard"], {"2024-Q1": 2, "2024-Q2": 1})
+        self.assertEqual(stats["undated_rows"], 1)
+        # 2024-04-01T00:00+02:00 is still March 31st in UTC
+        self.assertEqual(
+            sorted(
+                shards.rows_between(
+                    datetime(2024, 3, 31, 21, tzinfo=timezone.utc),
+                    datetime(2024, 12, 31, tzinfo=timezone.utc),
+                )
+            ),
+            [1, 2, 3],
+        )
+
+    def test_rejects_unknown_granularity(self):
+        with self.assertRaises(ValueError):
+            TimeShards("week")
+
+    def test_index_shards_by_month(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = ChunkStore(os.path.join(temp_dir, "chunks"))
+            store.append(
+                ["a", "b", "c"],
+                [
+                    _meta("a@example.com", "2024-01-31T23:00:00", []),
+                    _meta("b@example.com", "2024-02-01T01:00:00", []),
+                    _meta("c@example.com", "2024-02-20T00:00:00", []),
+                ],
+            )
+            index = MetadataFilterIndex(store, shard_by="month")
+            self.assertEqual(
+                index.candidates({"date_range": ["2024-02-01", "2024-02-10"]}), [1]
+            )
+            self.assertEqual(
+                index.shard_stats()["rows_per_shard"], {"2024-01": 1, "2024-02": 2}
+            )
+
+
+class TestFilteredKeywordSearch(unittest.TestCase):
+    """Keyword search only scores rows the filter index selects."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = EmailVectorDB(cache_dir=self.temp_dir.name)
+        self.db.embeddings = None
+        self.db.vector_db = None
+        emails = [
+            {
+                "email_id": f"e{i}",
+                "subject": "Quarterly invoice",
+                "sender": "alice@example.com" if i % 10 == 0 else "bob@example.com",
+                "recipient": "me@example.com",
+                "body": f"Invoice number {i}",
+                "date": "2024-01-01T00:00:00",
+            }
+            for i in range(30)
+        ]
+        self.db.add_emails(emails)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_filtered_results_are_not_starved(self):
+        results = self.db.search("invoice", num_results=5, filters={"sender": "alice"})
+        self.assertEqual(
+            sorted(r["metadata"]["email_id"] for r in results), ["e0", "e10", "e20"]
+        )
+
+
+class _RowOrderIndex:
+    """Ranks every row by row id, standing in for an unaligned vector store."""
+
+    def __init__(self, chunk_store):
+        self.chunk_store = chunk_store
+        self.ntotal = len(chunk_store)
+
+    def similarity_search_with_score(self, query, k=4):
+        rows = list(range(min(k, self.ntotal)))
+        return [
+            (ChunkDocument(text, metadata, row), 0.01 * row)
+            for (text, metadata), row in zip(self.chunk_store.get_many(rows), rows)
+        ]
+
+
+class TestFilteredVectorFallback(TestFilteredKeywordSearch):
+    """Post-filtered vector search returns every match up to num_results."""
+
+    def setUp(self):
+        super().setUp()
+        self.db.embeddings = object()
+        self.db.active_db = _RowOrderIndex(self.db.chunk_store)
+
+    def test_filtered_results_are_not_starved(self):
+        results = self.db.search("invoice", num_results=3, filters={"sender": "alice"})
+        self.assertEqual([r["metadata"]["email_id"] for r in results], ["e0", "e10", "e20"])
+        self.assertEqual({r["search_type"] for r in results}, {"vector"})
+
+    def test_removed_emails_are_skipped(self):
+        self.db.remove_email("e0")
+
+        filtered = self.db.search("invoice", num_results=3, filters={"sender": "alice"})
+        self.assertEqual([r["metadata"]["email_id"] for r in filtered], ["e10", "e20"])
+        unfiltered = self.db.search("invoice", num_results=3)
+        self.assertEqual([r["metadata"]["email_id"] for r in unfiltered], ["e1", "e2", "e3"])
+        self.assertEqual({r["search_type"] for r in filtered + unfiltered}, {"vector"})
+
+
+if __name__ == "__main__":
+    unittest.main()
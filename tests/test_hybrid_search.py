@@ -0,0 +1,120 @@
+import tempfile
+import unittest
+
+from gmail_chatbot.email_vector_db import EmailVectorDB
+from gmail_chatbot.vector_db.faiss_store import ChunkDocument
+from gmail_chatbot.vector_db.search import fuse_results
+
+
+def _hit(row_id, similarity, **extra):
+    return {"content": f"chunk {row_id}", "metadata": {}, "row_id": row_id,
+            "similarity": similarity, **extra}
+
+
+class TestFuseResults(unittest.TestCase):
+    """Dense and BM25 rankings are merged by row id."""
+
+    def test_rrf_prefers_chunks_found_by_both(self):
+        dense = [_hit(1, 0.9), _hit(2, 0.8)]
+        sparse = [_hit(3, 1.0, bm25_score=7.0), _hit(2, 0.5, bm25_score=2.0)]
+
+        fused = fuse_results(dense, sparse, num_results=3)
+
+        self.assertEqual([r["row_id"] for r in fused], [2, 1, 3])
+        top = fused[0]
+        self.assertEqual((top["dense_rank"], top["sparse_rank"]), (2, 2))
+        self.assertEqual(top["sparse_score"], 2.0)
+        self.assertEqual(top["similarity"], 0.8)
+        self.assertEqual(top["search_type"], "hybrid")
+        self.assertIsNone(fused[2]["dense_similarity"])
+        # An exact-term hit keeps its keyword coverage as similarity
+        self.assertEqual(fused[2]["similarity"], 1.0)
+
+    def test_weighted_fusion_and_dense_weight(self):
+        dense = [_hit(1, 0.9)]
+        sparse = [_hit(2, 1.0, bm25_score=4.0)]
+
+        fused = fuse_results(dense, sparse, 2, method="weighted", dense_weight=0.8)
+        self.assertEqual([r["row_id"] for r in fused], [1, 2])
+        self.assertAlmostEqual(fused[0]["fused_score"], 0.72)
+        self.assertAlmostEqual(fused[1]["fused_score"], 0.2)
+
+        fused = fuse_results(dense, sparse, 2, method="weighted", dense_weight=0.1)
+        self.assertEqual([r["row_id"] for r in fused], [2, 1])
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            fuse_results([], [], 5, method="max")
+
+
+class _StubIndex:
+    """Returns fixed dense hits in place of a FAISS index."""
+
+    def __init__(self, chunk_store, rows):
+        self.chunk_store = chunk_store
+        self.rows = rows
+        self.ntotal = len(chunk_store)
+
+    def similarity_search_with_score(self, query, k=4):
+        records = self.chunk_store.get_many(self.rows)
+        return [
+            (ChunkDocument(text, metadata, row), 0.1 * rank)
+            for rank, ((text, metadata), row) in enumerate(zip(records, self.rows))
+        ][:k]
+
+
+class TestHybridSearch(unittest.TestCase):
+    """EmailVectorDB.search(mode="hybrid") returns one fused ranking."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = EmailVectorDB(cache_dir=self.temp_dir.name)
+        for email_id, body in [
+            ("e1", "Invoice INV-2291 from Acme is overdue"),
+            ("e2", "Payment reminder for last month's bill"),
+            ("e3", "Team lunch on Friday"),
+        ]:
+            self.db.add_email(email_id, f"Subject {email_id}", "a@example.com",
+                              "b@example.com", body, "2024-01-01T00:00:00")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_keyword_only_without_vector_index(self):
+        results = self.db.search("INV-2291", mode="hybrid")
+        self.assertEqual([r["metadata"]["email_id"] for r in results], ["e1"])
+        self.assertEqual(results[0]["search_type"], "hybrid")
+        self.assertEqual(results[0]["sparse_rank"], 1)
+        self.assertIsNone(results[0]["dense_rank"])
+
+    def test_combines_semantic_and_exact_term_hits(self):
+        rows = {self.db.chunk_store.get(row)[1]["email_id"]: row
+                for row in range(len(self.db.chunk_store))}
+        self.db.embeddings = object()
+        self.db.active_db = _StubIndex(self.db.chunk_store, [rows["e2"], rows["e3"]])
+
+        results = self.db.search("overdue invoice INV-2291", num_results=3, mode="hybrid")
+
+        ids = [r["metadata"]["email_id"] for r in results]
+        self.assertEqual(set(ids[:2]), {"e1", "e2"})
+        by_id = {r["metadata"]["email_id"]: r for r in results}
+        self.assertEqual(by_id["e2"]["dense_rank"], 1)
+        self.assertEqual(by_id["e1"]["sparse_rank"], 1)
+        self.assertEqual(self.db.search("overdue invoice", mode="vector")[0]["metadata"]["email_id"], "e2")
+
+    def test_search_many_keeps_query_order(self):
+        batches = self.db.search_many(["lunch", "INV-2291", "nothing matches"], num_results=2)
+        self.assertEqual([[r["metadata"]["email_id"] for r in b] for b in batches],
+                         [["e3"], ["e1"], []])
+
+        hybrid = self.db.search_many(["lunch", "INV-2291"], mode="hybrid")
+        self.assertEqual([b[0]["metadata"]["email_id"] for b in hybrid], ["e3", "e1"])
+        self.assertEqual(hybrid[0][0]["search_type"], "hybrid")
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            self.db.search("invoice", mode="fuzzy")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the history-based incremental inbox sync.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gmail_chatbot.inbox_sync import InboxSync, HistoryExpiredError, route_emails_to_clients
+from gmail_chatbot.memory_handler import MemoryActionsHandler
+
+# conftest replaces this method with a no-op for app tests; keep the real one
+_perform_enrichment = MemoryActionsHandler.perform_autonomous_memory_enrichment
+
+
+def _email(msg_id, subject, sender="someone@example.com"):
+    return {"id": msg_id, "subject": subject, "from": sender, "to": "me@example.com",
+            "snippet": "", "body": ""}
+
+
+class TestInboxSync(unittest.TestCase):
+    """Test cases for InboxSync."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.state_path = Path(self.temp_dir.name) / "inbox_sync_state.json"
+        self.gmail = MagicMock()
+        self.gmail.get_emails_by_ids.side_effect = lambda ids, request_id=None: [
+            _email(i, f"Subject {i}") for i in ids
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_bootstrap_then_history_delta(self):
+        sync = InboxSync(self.gmail, state_path=self.state_path)
+        self.gmail.get_current_history_id.return_value = "100"
+        self.gmail.list_message_ids.return_value = ["a", "b"]
+
+        emails, history_id = sync.fetch_new_emails()
+        self.assertEqual([e["id"] for e in emails], ["a", "b"])
+        self.gmail.list_history.assert_not_called()
+
+        # Nothing is recorded until the caller commits
+        self.assertIsNone(sync.history_id)
+        sync.commit(history_id)
+
+        self.gmail.list_history.return_value = (["c"], "105")
+        emails, history_id = InboxSync(self.gmail, state_path=self.state_path).fetch_new_emails()
+        self.gmail.list_history.assert_called_once_with("100")
+        self.assertEqual([e["id"] for e in emails], ["c"])
+        self.assertEqual(history_id, "105")
+        self.assertEqual(self.gmail.list_message_ids.call_count, 1)
+
+    def test_expired_history_falls_back_to_bootstrap(self):
+        sync = InboxSync(self.gmail, state_path=self.state_path)
+        sync.commit("1")
+        self.gmail.list_history.side_effect = HistoryExpiredError("too old")
+        self.gmail.get_current_history_id.return_value = "200"
+        self.gmail.list_message_ids.return_value = ["x"]
+
+        emails, history_id = sync.fetch_new_emails()
+
+        self.assertEqual([e["id"] for e in emails], ["x"])
+        self.assertEqual(history_id, "200")
+
+    def test_route_emails_to_clients(self):
+        emails = [
+            _email("1", "Acme renewal"),
+            _email("2", "Lunch", sender="bob@globex.com"),
+            _email("3", "Newsletter"),
+        ]
+        buckets = route_emails_to_clients(emails, ["ACME", "Globex"])
+        self.assertEqual([e["id"] for e in buckets["ACME"]], ["1"])
+        self.assertEqual([e["id"] for e in buckets["Globex"]], ["2"])
+        self.assertEqual(len(buckets), 2)
+
+
+class TestAutonomousEnrichmentSync(unittest.TestCase):
+    """perform_autonomous_memory_enrichment uses the sync engine."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.memory_store = MagicMock()
+        self.memory_store.get_client_names.return_value = ["Acme", "Globex"]
+        self.gmail = MagicMock()
+        self.handler = MemoryActionsHandler(
+            self.memory_store, self.gmail, MagicMock(), "sys", MagicMock()
+        )
+        self.handler.inbox_sync = InboxSync(
+            self.gmail, state_path=Path(self.temp_dir.name) / "state.json"
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_only_new_messages_are_stored_and_history_advances(self):
+        self.handler.inbox_sync.commit("10")
+        self.gmail.list_history.return_value = (["1", "2"], "12")
+        self.gmail.get_emails_by_ids.return_value = [
+            _email("1", "Acme invoice"), _email("2", "Unrelated")
+        ]
+
+        _perform_enrichment(self.handler, "req")
+
+        self.gmail.search_emails.assert_not_called()
+        stored = self.memory_store.add_email_memories.call_args[0][0]
+        self.assertEqual([e["email_id"] for e in stored], ["1"])
+        self.assertEqual(stored[0]["client"], "Acme")
+        self.assertEqual(self.handler.inbox_sync.history_id, "12")
+
+    def test_history_not_advanced_when_storing_fails(self):
+        self.handler.inbox_sync.commit("10")
+        self.gmail.list_history.return_value = (["1"], "12")
+        self.gmail.get_emails_by_ids.return_value = [_email("1", "Acme invoice")]
+        self.handler.store_emails_in_memory = MagicMock(side_effect=RuntimeError("disk full"))
+
+        _perform_enrichment(self.handler, "req")
+
+        self.assertEqual(self.handler.inbox_sync.history_id, "10")
+
+    def test_history_not_advanced_when_storage_write_fails(self):
+        self.handler.inbox_sync.commit("10")
+        self.gmail.list_history.return_value = (["1", "2"], "12")
+        self.gmail.get_emails_by_ids.return_value = [
+            _email("1", "Acme invoice"), _email("2", "Globex order")
+        ]
+        # The Acme write succeeds, the Globex write fails to index
+        self.memory_store.add_email_memories.side_effect = lambda records: {
+            r["email_id"]: r["email_id"] == "1" for r in records
+        }
+
+        _perform_enrichment(self.handler, "req")
+
+        self.assertEqual(self.memory_store.add_email_memories.call_count, 2)
+        self.assertEqual(self.handler.inbox_sync.history_id, "10")
+
+        # Once storage recovers the same delta is stored and committed
+        self.memory_store.add_email_memories.side_effect = None
+        self.memory_store.add_email_memories.return_value = {}
+        _perform_enrichment(self.handler, "req")
+        self.assertEqual(self.handler.inbox_sync.history_id, "12")
+
+
+class TestStoreEmailsInMemory(unittest.TestCase):
+    """store_emails_in_memory reports per-email results."""
+
+    def setUp(self):
+        self.memory_store = MagicMock()
+        self.handler = MemoryActionsHandler(
+            self.memory_store, MagicMock(), MagicMock(), "sys", MagicMock()
+        )
+
+    def test_malformed_entries_are_skipped(self):
+        self.memory_store.add_email_memories.side_effect = lambda records: {
+            r["email_id"]: r["email_id"] != "2" for r in records
+        }
+        emails = [dict(_email("1", "One"), tags=None), None, {"subject": "no id"}, _email("2", "Two")]
+
+        results = self.handler.store_emails_in_memory(emails, "q", "req")
+
+        self.assertEqual(results, {"1": True, "2": False})
+        stored = self.memory_store.add_email_memories.call_args[0][0]
+        self.assertEqual(stored[0]["tags"], ["query:q"])
+
+    def test_failed_batch_is_retried_per_email(self):
+        def add(records):
+            if len(records) > 1 or records[0]["email_id"] == "bad":
+                raise ValueError("bad record")
+            return {records[0]["email_id"]: True}
+        self.memory_store.add_email_memories.side_effect = add
+
+        results = self.handler.store_emails_in_memory(
+            [_email("1", "One"), _email("bad", "Bad"), _email("3", "Three")], "q", "req"
+        )
+
+        self.assertEqual(results, {"1": True, "bad": False, "3": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from gmail_chatbot.vector_db.index_queue import IndexingQueue
+
+
+class _RecordingIndexer:
+    """index_fn stand-in that records each batch it is given."""
+
+    def __init__(self, fail_ids=(), error=None, fail_times=None):
+        self.batches = []
+        self.fail_ids = set(fail_ids)
+        # email id -> how many more calls report it as not indexed
+        self.fail_times = dict(fail_times or {})
+        self.error = error
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, records):
+        self.started.set()
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        self.batches.append([(r["email_id"], r["body"]) for r in records])
+        results = {}
+        for r in records:
+            email_id = r["email_id"]
+            failing = self.fail_times.get(email_id, 0)
+            self.fail_times[email_id] = max(0, failing - 1)
+            # Same shape as add_emails: False for an email that wasn't stored
+            results[email_id] = email_id not in self.fail_ids and not failing
+        return results
+
+
+def _email(email_id, body="text"):
+    return {"email_id": email_id, "body": body}
+
+
+class TestIndexingQueue(unittest.TestCase):
+    """Background indexing queue."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "queue.json")
+        self.queues = []
+
+    def tearDown(self):
+        for queue in self.queues:
+            queue.close(timeout=5)
+        self.temp_dir.cleanup()
+
+    def _queue(self, indexer, **kwargs):
+        kwargs.setdefault("batch_delay", 30)
+        queue = IndexingQueue(self.path, indexer, **kwargs)
+        self.queues.append(queue)
+        return queue
+
+    def test_coalesces_pending_emails_into_one_batch(self):
+        indexer = _RecordingIndexer(fail_ids={"e3"})
+        queue = self._queue(indexer, max_attempts=1)
+
+        queue.enqueue([_email("e1", "old"), _email("e2")])
+        queue.enqueue([_email("e1", "new"), _email("e3"), {"body": "no id"}])
+        self.assertEqual(queue.stats()["depth"], 3)
+        self.assertTrue(queue.flush(timeout=5))
+
+        self.assertEqual(indexer.batches, [[("e1", "new"), ("e2", "text"), ("e3", "text")]])
+        stats = queue.stats()
+        self.assertEqual((stats["depth"], stats["lag_seconds"]), (0, 0.0))
+        self.assertEqual((stats["indexed"], stats["failed"], stats["batches"]), (2, 1, 1))
+        self.assertEqual(stats["parked"], 1)
+
+    def test_emails_that_fail_to_index_are_retried(self):
+        indexer = _RecordingIndexer(fail_times={"e2": 2})
+        queue = self._queue(indexer, batch_delay=0, retry_delay=0.01)
+        queue.enqueue([_email("e1"), _email("e2")])
+        self.assertTrue(queue.flush(timeout=5))
+
+        self.assertEqual(
+            indexer.batches,
+            [[("e1", "text"), ("e2", "text")], [("e2", "text")], [("e2", "text")]],
+        )
+        stats = queue.stats()
+        self.assertEqual((stats["indexed"], stats["failed"], stats["parked"]), (2, 0, 0))
+        self.assertEqual(len(self._queue(indexer)), 0)
+
+    def test_emails_that_keep_failing_stay_in_the_journal(self):
+        indexer = _RecordingIndexer(fail_ids={"e1"})
+        queue = self._queue(indexer, batch_delay=0, retry_delay=0.01, max_attempts=3)
+        queue.enqueue([_email("e1")])
+        self.assertTrue(queue.flush(timeout=5))
+        self.assertEqual(len(indexer.batches), 3)
+        stats = queue.stats()
+        self.assertEqual((stats["depth"], stats["failed"], stats["parked"]), (0, 1, 1))
+        queue.close(timeout=5)
+
+        recovered = _RecordingIndexer()
+        restarted = self._queue(recovered)
+        self.assertEqual(len(restarted), 1)
+        self.assertTrue(restarted.flush(timeout=5))
+        self.assertEqual(recovered.batches, [[("e1", "text")]])
+        self.assertEqual(len(self._queue(recovered)), 0)
+
+    def test_full_batches_do_not_wait_for_the_delay(self):
+        indexer = _RecordingIndexer()
+        queue = self._queue(indexer, batch_size=2)
+        queue.enqueue([_email(f"e{i}") for i in range(4)])
+        self.assertTrue(queue.flush(timeout=5))
+        self.assertEqual([len(batch) for batch in indexer.batches], [2, 2])
+
+    def test_pending_emails_survive_a_restart(self):
+        failing = _RecordingIndexer(error=RuntimeError("model not loaded"))
+        queue = self._queue(failing, retry_delay=30)
+        queue.enqueue([_email("e1"), _email("e2")])
+        self.assertFalse(queue.flush(timeout=0.2))
+        queue.close(timeout=5)
+
+        indexer = _RecordingIndexer()
+        restarted = self._queue(indexer)
+        self.assertEqual(len(restarted), 2)
+        self.assertTrue(restarted.flush(timeout=5))
+        self.assertEqual(indexer.batches, [[("e1", "text"), ("e2", "text")]])
+
+        self.assertEqual(len(self._queue(indexer)), 0)
+
+    def test_email_updated_while_indexing_is_indexed_again(self):
+        indexer = _RecordingIndexer()
+        indexer.release.clear()
+        queue = self._queue(indexer, batch_delay=0)
+        queue.enqueue([_email("e1", "v1")])
+        self.assertTrue(indexer.started.wait(5))
+        queue.enqueue([_email("e1", "v2")])
+        indexer.release.set()
+        self.assertTrue(queue.flush(timeout=5))
+        self.assertEqual(indexer.batches, [[("e1", "v1")], [("e1", "v2")]])
+
+
+if __name__ == "__main__":
+    unittest.main()
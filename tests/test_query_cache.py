@@ -0,0 +1,102 @@
+import importlib
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gmail_chatbot.email_vector_db import EmailVectorDB
+from gmail_chatbot.vector_db.search import QueryCache
+
+# The package re-exports a ``search`` function under the module's name
+search_module = importlib.import_module("gmail_chatbot.vector_db.search")
+
+
+class TestQueryCache(unittest.TestCase):
+    """LRU result cache scoped to one index generation."""
+
+    def test_lru_eviction_and_generation_invalidation(self):
+        cache = QueryCache(max_entries=2)
+        a = QueryCache.key("budget  review", 5, None, "vector")
+        self.assertEqual(a, QueryCache.key(" budget review ", 5, {}, "vector"))
+        self.assertNotEqual(a, QueryCache.key("budget review", 5, {"sender": "x"}, "vector"))
+
+        self.assertIsNone(cache.get(a, 1))
+        cache.put(a, 1, [{"content": "x"}])
+        cached = cache.get(a, 1)
+        cached[0]["content"] = "changed"
+        self.assertEqual(cache.get(a, 1), [{"content": "x"}])
+
+        for query in ("b", "c"):
+            cache.put(QueryCache.key(query, 5, None, "vector"), 1, [])
+        self.assertIsNone(cache.get(a, 1))
+
+        cache.put(a, 1, [])
+        self.assertIsNone(cache.get(a, 2))
+        # Results computed before the generation changed are not stored
+        cache.put(a, 1, [])
+        self.assertEqual(len(cache), 0)
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["invalidations"]), (2, 3, 1))
+
+    def test_metadata_is_not_shared(self):
+        cache = QueryCache()
+        key = QueryCache.key("invoice", 5, None, "vector")
+        results = [{"content": "x", "metadata": {"email_id": "e1", "tags": ["a"]}}]
+        self.assertIsNone(cache.get(key, 1))
+        cache.put(key, 1, results)
+        results[0]["metadata"]["tags"].append("from caller")
+
+        returned = cache.get(key, 1)
+        returned[0]["metadata"]["email_id"] = "changed"
+        returned[0]["metadata"]["tags"].append("b")
+
+        self.assertEqual(cache.get(key, 1)[0]["metadata"], {"email_id": "e1", "tags": ["a"]})
+
+
+class TestSearchResultCache(unittest.TestCase):
+    """EmailVectorDB serves repeated searches from the cache until the index changes."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = EmailVectorDB(cache_dir=self.temp_dir.name)
+        self._add("e1", "Urgent: contract needs signing ASAP")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _add(self, email_id, body):
+        self.db.add_email(email_id, f"Subject {email_id}", "a@example.com",
+                          "b@example.com", body, "2024-01-01T00:00:00")
+
+    def test_repeated_search_hits_cache_until_add_or_delete(self):
+        with patch.object(search_module, "keyword_search", wraps=search_module.keyword_search) as spy:
+            first = self.db.search("urgent OR ASAP")
+            self.assertEqual(self.db.search("urgent  OR ASAP"), first)
+            self.assertEqual(spy.call_count, 1)
+
+            self._add("e2", "Another urgent request")
+            self.assertEqual(len(self.db.search("urgent OR ASAP")), 2)
+            self.db.remove_email("e2")
+            self.assertEqual(len(self.db.search("urgent OR ASAP")), 1)
+            self.assertEqual(spy.call_count, 3)
+
+        stats = self.db.get_status()["query_cache"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 3))
+        self.assertEqual(stats["hit_rate"], 0.25)
+
+    def test_search_many_only_runs_uncached_queries(self):
+        self.db.search("contract")
+        with patch("gmail_chatbot.email_vector_db.vector_search_many",
+                   wraps=search_module.search_many) as spy:
+            batches = self.db.search_many(["contract", "signing", "ASAP"])
+        self.assertEqual([len(results) for results in batches], [1, 1, 1])
+        self.assertEqual(spy.call_args.args[1], ["signing", "ASAP"])
+
+    def test_disabled_cache(self):
+        db = EmailVectorDB(cache_dir=self.temp_dir.name, query_cache_size=0)
+        self.assertEqual(len(db.search("contract")), 1)
+        self.assertIsNone(db.get_status()["query_cache"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gmail_chatbot.email_vector_db import EmailVectorDB
+from gmail_chatbot.vector_db.reindex import CHECKPOINT_NAME, Reindexer
+
+
+class _Memory:
+    """Stands in for the email memory store."""
+
+    def __init__(self, count):
+        self.ids = [f"m{i}" for i in range(count)]
+        self.loaded = []
+        self.fail_after = None
+
+    def list_ids(self):
+        return list(self.ids)
+
+    def records(self, email_ids):
+        if self.fail_after is not None and len(self.loaded) >= self.fail_after:
+            raise KeyboardInterrupt
+        self.loaded.append(list(email_ids))
+        return [
+            {"email_id": email_id, "subject": f"Report {email_id}", "sender": "a@example.com",
+             "recipient": "b@example.com", "body": f"quarterly figures {email_id}",
+             "date": "2024-01-01T00:00:00"}
+            for email_id in email_ids
+        ]
+
+
+class TestReindexer(unittest.TestCase):
+    """Full reindex into a shadow directory with checkpoints."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "vector_cache")
+        self.db = EmailVectorDB(cache_dir=self.cache_dir)
+        self.db.add_email("stale", "Old", "a@example.com", "b@example.com",
+                          "stale quarterly figures", "2023-01-01T00:00:00")
+        os.makedirs(os.path.join(self.cache_dir, "models"))
+        self.memory = _Memory(5)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _run(self, **kwargs):
+        return Reindexer(self.db, batch_size=2).run(
+            self.memory.list_ids, self.memory.records, **kwargs
+        )
+
+    def test_builds_new_index_and_swaps_it_in(self):
+        reports = []
+        report = self._run(progress=reports.append)
+
+        self.assertEqual(sorted(self.db.email_metadata), self.memory.ids)
+        self.assertEqual(len(self.db.search("quarterly figures", num_results=10)), 5)
+        self.assertEqual([r["indexed"] for r in reports], [2, 4, 5])
+        self.assertEqual(reports[-1]["eta_seconds"], 0.0)
+        self.assertEqual((report["total"], report["indexed"], report["failed"]), (5, 5, 0))
+        # Files that are not part of the index stay; the shadow and checkpoint go
+        self.assertTrue(os.path.isdir(os.path.join(self.cache_dir, "models")))
+        self.assertFalse(os.path.exists(self.cache_dir + ".reindex"))
+        self.assertFalse(os.path.exists(self.cache_dir + ".old"))
+        self.assertFalse(any(name.startswith(CHECKPOINT_NAME) for name in os.listdir(self.cache_dir)))
+
+        # Another instance sees the swapped-in index too
+        self.assertEqual(sorted(EmailVectorDB(cache_dir=self.cache_dir).email_metadata), self.memory.ids)
+
+    def test_resume_skips_checkpointed_emails(self):
+        self.memory.fail_after = 2
+        with self.assertRaises(KeyboardInterrupt):
+            self._run()
+        # The live index is untouched until the swap
+        self.assertEqual(list(self.db.email_metadata), ["stale"])
+
+        self.memory.fail_after = None
+        self.memory.loaded = []
+        report = self._run(resume=True)
+
+        self.assertEqual(self.memory.loaded, [["m4"]])
+        self.assertEqual(report["indexed"], 5)
+        self.assertEqual(sorted(self.db.email_metadata), self.memory.ids)
+
+    def test_interrupted_swap_is_finished_on_next_run(self):
+        with patch.object(Reindexer, "recover"):
+            self._run()
+        self.assertEqual(list(self.db.email_metadata), ["stale"])
+
+        self.assertTrue(Reindexer(self.db).recover())
+        self.assertEqual(sorted(self.db.email_metadata), self.memory.ids)
+        self.assertFalse(Reindexer(self.db).recover())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import re
+import unittest
+from types import SimpleNamespace
+
+from gmail_chatbot.vector_db.text_splitter import (
+    TokenCounter,
+    TokenTextSplitter,
+    embedding_tokenizer,
+    estimate_tokens,
+)
+
+
+def whitespace_tokenizer(texts, add_special_tokens=True):
+    """transformers-style tokenizer with one token per word."""
+    return {"input_ids": [text.split() for text in texts]}
+
+
+def words(text):
+    return re.findall(r"\S+", text)
+
+
+class TestTokenTextSplitter(unittest.TestCase):
+    """Tests for sentence packing, overlap and lossless splitting."""
+
+    def setUp(self):
+        self.counter = TokenCounter()
+        self.counter.bind(SimpleNamespace(client=SimpleNamespace(tokenizer=whitespace_tokenizer)))
+        self.splitter = TokenTextSplitter(chunk_size=8, chunk_overlap=3, counter=self.counter)
+
+    def test_packs_sentences_within_budget(self):
+        text = "One two three. Four five.\n\nSix seven eight nine. Ten."
+        chunks = self.splitter.split_text(text)
+        self.assertEqual(chunks, ["One two three. Four five.", "Four five.\n\nSix seven eight nine. Ten."])
+        self.assertTrue(all(len(c.split()) <= 8 for c in chunks))
+
+    def test_long_segments_are_split_without_losing_text(self):
+        text = "  " + " ".join(f"w{i}" for i in range(30)) + ". Tail."
+        chunks = TokenTextSplitter(chunk_size=8, chunk_overlap=0, counter=self.counter).split_text(text)
+        self.assertTrue(all(len(c.split()) <= 8 for c in chunks))
+        self.assertEqual(sum((words(c) for c in chunks), []), words(text))
+
+    def test_split_many_matches_split_text(self):
+        texts = ["", "Short one.", "A b c d e. F g h i j. K l m n o."]
+        self.assertEqual(
+            self.splitter.split_many(texts), [self.splitter.split_text(t) for t in texts]
+        )
+
+    def test_estimate_keeps_overlong_words_in_budget(self):
+        splitter = TokenTextSplitter(chunk_size=20, chunk_overlap=0)
+        text = "Reference " + "x" * 400 + " and 1234567890123 more."
+        chunks = splitter.split_text(text)
+        self.assertTrue(all(estimate_tokens(c) <= 20 for c in chunks))
+        self.assertEqual("".join(chunks).replace(" ", ""), text.replace(" ", ""))
+
+
+class TestTokenCounter(unittest.TestCase):
+    def test_falls_back_to_estimate(self):
+        counter = TokenCounter()
+        self.assertFalse(counter.bind(SimpleNamespace()))
+        self.assertEqual(counter.count_many(["hello world", "2024-01-15"]), [2, 6])
+
+    def test_finds_tokenizer_through_wrappers(self):
+        onnx_like = SimpleNamespace(tokenizer="onnx")
+        self.assertEqual(embedding_tokenizer(onnx_like), "onnx")
+        hf_like = SimpleNamespace(client=SimpleNamespace(tokenizer="hf"))
+        self.assertEqual(embedding_tokenizer(hf_like), "hf")
+        self.assertIsNone(embedding_tokenizer(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -62,3 +62,45 @@ def test_handle_triage_with_claude_summary():
         expected_urgent,
         request_id="id123",
     )
+
+
+def test_handle_triage_searches_message_only_without_urgent_items():
+    app = _setup_app()
+    handle_triage_query(app, "budget status", "req", {"triage": 0.6})
+    # Urgent emails were found, so the message itself is not searched
+    app.memory_actions_handler.find_related_emails.assert_called_once_with(
+        "urgent OR ASAP", limit=5, request_id="req_urgent"
+    )
+
+    app.memory_actions_handler.find_related_emails_many.assert_not_called()
+
+
+def test_handle_triage_batches_searches_without_action_items():
+    app = _setup_app(urgent_count=0)
+    app.memory_actions_handler.get_action_items_structured.return_value = []
+    related = [{"subject": "Budget", "summary": "Q3 numbers", "date": "2024-05-04"}]
+    app.memory_actions_handler.find_related_emails_many.return_value = [[], related]
+    app.claude_client.evaluate_vector_match.return_value = "Budget email"
+
+    response = handle_triage_query(app, "budget status", "req", {"triage": 0.6})
+
+    assert response == "Budget email"
+    app.memory_actions_handler.find_related_emails_many.assert_called_once_with(
+        ["urgent OR ASAP", "budget status"], limit=5, request_id="req"
+    )
+    app.memory_actions_handler.find_related_emails.assert_not_called()
+    assert app.claude_client.evaluate_vector_match.call_args.kwargs["vector_results"] == related
+
+
+def test_handle_triage_prefers_urgent_results_from_the_batch():
+    app = _setup_app(summary_return="Urgent summary")
+    app.memory_actions_handler.get_action_items_structured.return_value = []
+    urgent = app.memory_actions_handler.find_related_emails.return_value
+    related = [{"subject": "Budget", "summary": "Q3 numbers", "date": "2024-05-04"}]
+    app.memory_actions_handler.find_related_emails_many.return_value = [urgent, related]
+
+    response = handle_triage_query(app, "budget status", "req", {"triage": 0.6})
+
+    assert response == "Urgent summary"
+    assert app.claude_client.summarize_triage.call_args.args[1] == urgent
+    app.claude_client.evaluate_vector_match.assert_not_called()